@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+⏱️ GoParts Benchmark
+Mede cada etapa da limpeza (detecção de encoding, decodificação, reparo, parse,
+normalização e gravação) sobre um catálogo sintético sujo em Latin-1 e compara
+com uma baseline gravada. Sai com código 1 se a vazão (linhas/s) ou o pico de
+memória (tracemalloc) de alguma etapa piorar além da tolerância.
+
+Uso:
+    python benchmark.py                          # 1M linhas, compara com a baseline
+    python benchmark.py --linhas 5000000         # Catálogo maior
+    python benchmark.py --salvar-baseline        # Grava a baseline desta máquina
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import tracemalloc
+
+import pandas as pd
+
+# Adiciona o diretório src ao path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+import data_cleaner
+from catalog_generator import gerar_catalogo
+from catalog_io import salvar_catalogo
+from row_repair import MotorReparo, dividir_texto
+from parse_engine import parsear_csv, pyarrow_csv_disponivel
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BENCHMARK_DIR = os.path.join(BASE_DIR, 'data', 'benchmark')
+BASELINE_FILE = os.path.join(BENCHMARK_DIR, 'baseline.json')
+
+# Piora aceita em relação à baseline (0.25 = 25% mais lento ou 25% mais memória)
+TOLERANCIA_PADRAO = 0.25
+# Etapas mais rápidas que isso na baseline são dominadas por ruído: a vazão não é comparada
+TEMPO_MINIMO_COMPARACAO = 0.05
+
+def caminho_sintetico(linhas: int, semente: int) -> str:
+    return os.path.join(BENCHMARK_DIR, f"sintetico_{linhas}_{semente}.csv")
+
+def preparar_entrada(linhas: int, semente: int) -> str:
+    """Gera o catálogo sintético (reaproveitado entre execuções: mesma semente → mesmo arquivo)"""
+    caminho = caminho_sintetico(linhas, semente)
+    if not os.path.exists(caminho):
+        print(f"🏭 Gerando catálogo sintético com {linhas} linhas...")
+        gerar_catalogo(caminho, linhas, semente)
+    return caminho
+
+def medir_etapa(funcao, linhas: int, repeticoes: int, medir_memoria: bool = True):
+    """
+    Executa a etapa `repeticoes` vezes sem tracemalloc (fica o melhor tempo) e uma vez
+    com tracemalloc para o pico de memória, que não entra no tempo.
+    Returns: (métricas, resultado da última execução)
+    """
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+
+    pico = 0
+    if medir_memoria:
+        del resultado
+        tracemalloc.start()
+        resultado = funcao()
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    metricas = {
+        'segundos': round(melhor, 4),
+        'linhas_por_s': round(linhas / melhor) if melhor else 0,
+        'pico_bytes': pico,
+        'pico_bytes_por_linha': round(pico / linhas, 2) if linhas else 0.0,
+    }
+    return metricas, resultado
+
+def executar_benchmark(caminho, linhas: int, repeticoes: int = 3, medir_memoria: bool = True) -> dict:
+    """Mede as etapas em sequência; cada etapa recebe a saída da anterior"""
+    etapas = {}
+
+    def medir(nome, funcao):
+        metricas, resultado = medir_etapa(funcao, linhas, repeticoes, medir_memoria)
+        etapas[nome] = metricas
+        print(f"  • {nome:<15} {metricas['segundos']:8.3f}s  {metricas['linhas_por_s']:>12,} linhas/s  "
+              f"pico {metricas['pico_bytes'] / 1024 / 1024:8.1f} MB")
+        return resultado
+
+    print(f"\n⏱️  Etapas ({linhas} linhas, melhor de {repeticoes}):")
+    medir('detectar', lambda: data_cleaner.detectar_encoding(caminho, verbose=False, usar_cache=False))
+    texto, _ = medir('decodificar', lambda: data_cleaner.ler_texto(caminho))
+
+    fim_cabecalho = texto.find('\n') + 1
+    cabecalho = texto[:fim_cabecalho]
+    reparado = medir('reparar', lambda: ''.join(MotorReparo().reparar_blocos(dividir_texto(texto, fim_cabecalho))))
+    del texto
+
+    df = medir('parsear', lambda: parsear_csv(cabecalho + reparado, parser='c'))
+    if pyarrow_csv_disponivel():
+        # Mesmo texto no leitor multi-thread do Arrow (--parser pyarrow); o ganho cresce com os núcleos
+        medir('parsear_pyarrow', lambda: parsear_csv(cabecalho + reparado, parser='pyarrow'))
+        ganho = etapas['parsear']['segundos'] / etapas['parsear_pyarrow']['segundos']
+        print(f"    ↳ pyarrow: {ganho:.1f}x o parser C com {os.cpu_count()} núcleo(s)")
+    del reparado
+
+    limpo = medir('normalizar', lambda: data_cleaner.limpar_chunk(df.copy()))
+    del df
+
+    with tempfile.TemporaryDirectory(dir=BENCHMARK_DIR) as diretorio:
+        saida = os.path.join(diretorio, 'saida.csv')
+        medir('gravar', lambda: salvar_catalogo(limpo, saida))
+
+    return {
+        'linhas': linhas,
+        'nucleos': os.cpu_count(),
+        'versoes': {'python': platform.python_version(), 'pandas': pd.__version__},
+        'etapas': etapas,
+    }
+
+def comparar_com_baseline(atual: dict, baseline: dict, tolerancia: float) -> list:
+    """Returns: lista de regressões (vazão menor ou memória por linha maior que a tolerância)"""
+    regressoes = []
+    for nome, base in baseline['etapas'].items():
+        medida = atual['etapas'].get(nome)
+        if medida is None:
+            continue
+        if base['segundos'] >= TEMPO_MINIMO_COMPARACAO and \
+                medida['linhas_por_s'] < base['linhas_por_s'] * (1 - tolerancia):
+            regressoes.append(f"{nome}: vazão {medida['linhas_por_s']:,} linhas/s "
+                              f"(baseline {base['linhas_por_s']:,})")
+        if base['pico_bytes_por_linha'] and medida['pico_bytes_por_linha'] and \
+                medida['pico_bytes_por_linha'] > base['pico_bytes_por_linha'] * (1 + tolerancia):
+            regressoes.append(f"{nome}: pico de memória {medida['pico_bytes_por_linha']:.1f} bytes/linha "
+                              f"(baseline {base['pico_bytes_por_linha']:.1f})")
+    return regressoes
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark das etapas de limpeza do GoParts')
+    parser.add_argument('--linhas', '-n', type=int, default=1_000_000, help='Linhas do catálogo sintético')
+    parser.add_argument('--semente', type=int, default=42, help='Semente do gerador')
+    parser.add_argument('--input', '-i', help='Usa um CSV existente em vez do catálogo sintético')
+    parser.add_argument('--repeticoes', type=int, default=3, help='Execuções por etapa (fica o melhor tempo)')
+    parser.add_argument('--tolerancia', type=float, default=TOLERANCIA_PADRAO,
+                        help='Piora aceita em relação à baseline (padrão: 0.25 = 25%%)')
+    parser.add_argument('--baseline', default=BASELINE_FILE, help='Arquivo JSON da baseline')
+    parser.add_argument('--salvar-baseline', action='store_true', help='Grava o resultado como nova baseline')
+    parser.add_argument('--sem-memoria', action='store_true', help='Não mede o pico de memória (mais rápido)')
+    args = parser.parse_args(argv)
+
+    os.makedirs(BENCHMARK_DIR, exist_ok=True)
+    caminho = args.input or preparar_entrada(args.linhas, args.semente)
+    linhas = args.linhas
+    if args.input:
+        with open(caminho, 'rb') as file:
+            linhas = sum(1 for linha in file if linha.strip()) - 1
+
+    print("=" * 60)
+    print("⏱️  GOPARTS BENCHMARK")
+    print("=" * 60)
+    print(f"📁 Entrada: {caminho} ({os.path.getsize(caminho) / 1024 / 1024:.1f} MB)")
+    resultado = executar_benchmark(caminho, linhas, args.repeticoes, not args.sem_memoria)
+
+    if args.salvar_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as file:
+            json.dump(resultado, file, indent=2)
+        print(f"\n💾 Baseline salva em {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\n⚠️  Sem baseline em {args.baseline} - grave uma com --salvar-baseline")
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as file:
+        baseline = json.load(file)
+    regressoes = comparar_com_baseline(resultado, baseline, args.tolerancia)
+    if regressoes:
+        print(f"\n❌ {len(regressoes)} regressão(ões) além de {args.tolerancia:.0%}:")
+        for regressao in regressoes:
+            print(f"  • {regressao}")
+        return 1
+    print(f"\n✅ Nenhuma regressão além de {args.tolerancia:.0%} em relação à baseline")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,53 +4,169 @@
 Script principal para execução do sistema de limpeza de dados
 
 Uso:
-    python run.py              # Executa limpeza padrão
-    python run.py --help       # Mostra ajuda
+    python run.py                                         # Executa limpeza padrão
+    python run.py --input entrada.csv -o saida.csv        # Arquivos customizados
+    python run.py --input 'data/input/*.csv' --workers 8  # Vários arquivos em paralelo
+    python run.py --incremental                           # Só linhas novas/alteradas
+    python run.py -i entrada.csv.gz -o saida.csv.zst      # Entrada/saída comprimidas
+    python run.py --monitorar                             # Limpa cada arquivo novo de data/input
+    python run.py -i enorme.csv --checkpoint              # Retoma do último chunk após uma falha
+    python run.py --help                                  # Mostra ajuda
 """
 
 import sys
 import os
 import argparse
 
-def main():
+# Adiciona o diretório src ao path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+import data_cleaner
+import parallel_cleaner
+import incremental_cleaner
+import ingest_daemon
+from checkpoint_cleaner import limpar_com_checkpoint
+from catalog_io import caminho_com_formato
+from dedup import POLITICAS, deduplicar_arquivo
+from parse_engine import PARSER_PADRAO, PARSERS
+from stage_metrics import MedidorEtapas, caminho_metricas, caminho_perfil, perfilar
+
+def main(argv=None):
     parser = argparse.ArgumentParser(description='GoParts Data Cleaner')
-    parser.add_argument('--input', '-i', help='Arquivo CSV de entrada')
-    parser.add_argument('--output', '-o', help='Arquivo CSV de saída')
+    parser.add_argument('--input', '-i', default=data_cleaner.INPUT_FILE,
+                        help='Arquivo CSV de entrada (aceita padrões glob, ex: "data/input/*.csv")')
+    parser.add_argument('--output', '-o', default=data_cleaner.OUTPUT_FILE,
+                        help='Arquivo CSV de saída (ou diretório, com --por-arquivo)')
     parser.add_argument('--verbose', '-v', action='store_true', help='Modo verboso')
-    
-    args = parser.parse_args()
-    
-    # Adiciona o diretório src ao path
-    sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+    parser.add_argument('--streaming', action='store_true',
+                        help='Processa o arquivo em chunks de tamanho fixo (memória constante)')
+    parser.add_argument('--chunk-size', type=int, default=data_cleaner.CHUNK_SIZE_PADRAO,
+                        help='Linhas por chunk no modo streaming')
+    parser.add_argument('--sem-mmap', action='store_true',
+                        help='No modo streaming, lê a entrada linha a linha em vez de via mmap')
+    parser.add_argument('--checkpoint', action='store_true',
+                        help='Modo streaming retomável: grava um checkpoint a cada chunk e retoma do último após uma falha')
+    parser.add_argument('--workers', '-w', type=int,
+                        help='Número de processos para limpeza paralela (padrão: todos os núcleos)')
+    parser.add_argument('--por-arquivo', action='store_true',
+                        help='No modo paralelo, gera um CSV limpo por arquivo de entrada')
+    parser.add_argument('--parser', choices=PARSERS, default=PARSER_PADRAO,
+                        help='Parser do texto reparado: c (padrão) ou pyarrow (multi-thread, requer pyarrow)')
+    parser.add_argument('--formato', choices=['csv', 'parquet', 'feather'],
+                        help='Formato de saída (padrão: pela extensão de --output)')
+    parser.add_argument('--compactar', action='store_true',
+                        help='Usa dtypes compactos (category/float32/int32) e a coluna regiao (category) em memória '
+                             'e mostra o uso de memória (só na limpeza em memória; o arquivo não muda)')
+    parser.add_argument('--dedup', choices=POLITICAS,
+                        help='Remove codigos repetidos com a política escolhida')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Reprocessa só as linhas novas ou alteradas desde a última execução')
+    parser.add_argument('--amostra', type=int, default=data_cleaner.AMOSTRA_PADRAO,
+                        help='Linhas aleatórias exibidas antes/depois da limpeza no modo verboso')
+    parser.add_argument('--metricas', action='store_true',
+                        help='Mede tempo de parede/CPU e linhas/s por etapa e grava <saida sem extensão>.metrics.json')
+    parser.add_argument('--metricas-memoria', action='store_true',
+                        help='Como --metricas, incluindo o pico de memória por etapa (tracemalloc, bem mais lento)')
+    parser.add_argument('--perfil', action='store_true',
+                        help='Grava um dump do cProfile em <saida sem extensão>.prof')
+    parser.add_argument('--monitorar', action='store_true',
+                        help='Monitora o diretório de --input e limpa cada arquivo novo para o diretório de --output')
+    parser.add_argument('--espera', type=float, default=ingest_daemon.ESPERA_PADRAO,
+                        help='Com --monitorar, segundos sem mudanças para considerar um arquivo completo')
+
+    args = parser.parse_args(argv)
 
     try:
-        import subprocess
-        
         print("🚀 GoParts Data Cleaner v1.0")
         print("=" * 50)
-        
-        # Monta o comando
-        cmd = [sys.executable, os.path.join(os.path.dirname(__file__), 'src', 'data_cleaner.py')]
-        
-        # Executa o script de limpeza
-        result = subprocess.run(cmd, capture_output=False)
-        
-        if result.returncode == 0:
-            print("=" * 50)
-            print("✅ Processamento concluído com sucesso!")
-            print("📁 Arquivo limpo salvo em: data/output/produtos_limpos_utf8.csv")
-            print("🔍 Para visualizar: code data/output/produtos_limpos_utf8.csv")
-        else:
-            print("❌ Erro durante o processamento")
+
+        if args.monitorar:
+            diretorio_entrada = args.input if os.path.isdir(args.input) else os.path.dirname(args.input)
+            diretorio_saida = args.output if os.path.isdir(args.output) else os.path.dirname(args.output)
+            monitor = ingest_daemon.MonitorEntrada(diretorio_entrada, diretorio_saida, espera=args.espera,
+                                                   formato=args.formato, chunk_size=args.chunk_size)
+            monitor.executar()
+            return 0
+
+        entradas = parallel_cleaner.expandir_entradas(args.input)
+        if not entradas:
+            print(f"❌ Nenhum arquivo encontrado para: {args.input}")
             return 1
-            
+
+        if not args.por_arquivo:
+            args.output = caminho_com_formato(args.output, args.formato)
+        if args.incremental and args.dedup:
+            raise ValueError("--dedup não pode ser combinado com --incremental")
+        if args.checkpoint and (args.workers or args.por_arquivo or len(entradas) > 1 or args.incremental):
+            raise ValueError("--checkpoint só se aplica à limpeza de um arquivo em um processo")
+        if args.compactar and (args.workers or args.por_arquivo or len(entradas) > 1 or args.incremental
+                               or args.streaming or args.checkpoint):
+            raise ValueError("--compactar só se aplica à limpeza em memória de um arquivo "
+                             "(sem --workers/--incremental/--streaming/--checkpoint)")
+
+        # Métricas por etapa só nos modos de um arquivo em um processo; nos demais, só os totais
+        args.metricas = args.metricas or args.metricas_memoria
+        medidor = MedidorEtapas(ativo=args.metricas, memoria=args.metricas_memoria)
+        relatorio_base = args.output if not args.por_arquivo else os.path.join(args.output, 'limpeza')
+        medidor.iniciar()
+
+        # Executa a limpeza no mesmo processo (sem subprocess)
+        with perfilar(caminho_perfil(relatorio_base), args.perfil):
+            if args.workers or args.por_arquivo or len(entradas) > 1:
+                modo = 'paralelo'
+                resultado = parallel_cleaner.limpar_em_paralelo(entradas, args.output, args.workers,
+                                                                args.por_arquivo, verbose=args.verbose,
+                                                                formato=args.formato)
+                total = resultado['total']
+                if args.dedup:
+                    with medidor.etapa('deduplicar'):
+                        total = sum(deduplicar_arquivo(arquivo, politica=args.dedup, verbose=args.verbose)
+                                    for arquivo in resultado['arquivos'])
+            elif args.incremental:
+                modo = 'incremental'
+                total = incremental_cleaner.limpar_incremental(entradas[0], args.output, args.verbose).total
+            elif args.streaming or args.checkpoint:
+                modo = 'streaming'
+                if args.checkpoint:
+                    total = limpar_com_checkpoint(entradas[0], args.output, args.chunk_size, args.verbose,
+                                                  medidor, not args.sem_mmap, args.parser)
+                else:
+                    total = data_cleaner.clean_file_streaming(entradas[0], args.output, args.chunk_size,
+                                                              args.verbose, medidor, not args.sem_mmap,
+                                                              args.parser)
+                if args.dedup:
+                    with medidor.etapa('deduplicar'):
+                        total = deduplicar_arquivo(args.output, politica=args.dedup, verbose=args.verbose)
+            else:
+                modo = 'memoria'
+                total = len(data_cleaner.clean_file(entradas[0], args.output, args.verbose,
+                                                    args.compactar, args.dedup, medidor, args.amostra,
+                                                    args.parser))
+        medidor.finalizar()
+
+        print("=" * 50)
+        print(f"✅ Processamento concluído com sucesso! ({total} produtos)")
+        print(f"📁 Arquivo limpo salvo em: {args.output}")
+        print(f"🔍 Para visualizar: code \"{args.output}\"")
+        if args.metricas:
+            if args.verbose:
+                medidor.imprimir()
+            caminho = medidor.salvar(caminho_metricas(relatorio_base), entrada=args.input,
+                                     saida=os.path.abspath(args.output), linhas=total, modo=modo)
+            print(f"📈 Métricas salvas em: {caminho}")
+        if args.perfil:
+            print(f"🔬 Perfil salvo em: {caminho_perfil(relatorio_base)} (python -m pstats)")
+
     except KeyboardInterrupt:
         print("\n⚠️ Operação cancelada pelo usuário")
         return 1
+    except (ValueError, FileNotFoundError, ImportError) as e:
+        print(f"❌ Erro durante o processamento: {e}")
+        return 1
     except Exception as e:
         print(f"❌ Erro inesperado: {e}")
         return 1
-    
+
     return 0
 
 if __name__ == "__main__":
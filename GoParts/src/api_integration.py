@@ -6,15 +6,23 @@ Script para enviar produtos limpos para API REST com retries e backoff exponenci
 
 import pandas as pd
 import requests
-import time
+from requests.adapters import HTTPAdapter
 import logging
 import json
 import sys
 import os
-from typing import Dict, Any, Optional, Tuple
-from dataclasses import dataclass
+import argparse
+import threading
+from contextlib import nullcontext
+from typing import Dict, Any, List, Optional, Tuple
+from dataclasses import dataclass, field
 from datetime import datetime
 
+from catalog_io import carregar_catalogo
+from rate_control import ConfigControle, ControleAdaptativo
+from circuit_breaker import CircuitoAberto, ConfigDisjuntor, Disjuntor
+from retry_scheduler import JITTERS, OrcamentoRetries, Tentativa, executar_com_retries
+
 # Configuração de logging
 def setup_logging():
     """Configura o sistema de logging"""
@@ -38,6 +46,9 @@ def setup_logging():
     
     return logging.getLogger(__name__), log_file
 
+# Máximo de produtos por requisição aceito por POST /produtos/batch (MAX_LOTE em test_api.py)
+MAX_BATCH_SIZE = 1000
+
 @dataclass
 class RetryConfig:
     """Configurações para retry com backoff exponencial"""
@@ -46,29 +57,54 @@ class RetryConfig:
     max_delay: float = 32.0     # segundos
     backoff_factor: float = 2.0
     retry_on_status: list = None
+    # Jitter do backoff: 'full', 'decorrelated' ou 'none'
+    jitter: str = 'full'
+    # Orçamento global: retries <= retry_budget_min + retry_budget x primeiras tentativas
+    retry_budget: float = 0.1
+    retry_budget_min: int = 20
     
     def __post_init__(self):
         if self.retry_on_status is None:
             self.retry_on_status = [500, 502, 503, 504, 408]  # Códigos para retry
+        if self.jitter not in JITTERS:
+            raise ValueError(f"Jitter desconhecido: {self.jitter} (opções: {', '.join(JITTERS)})")
 
 @dataclass
 class APIStats:
-    """Estatísticas de envio para API"""
+    """Estatísticas de envio para API (seguras para atualização de várias threads)"""
     total_products: int = 0
     successful: int = 0
     failed: int = 0
     retries_used: int = 0
+    requests_sent: int = 0
+    retries_denied: int = 0
+    # Estado atual do controle de vazão (atualizado pelo ControleAdaptativo)
+    rate_limit: float = 0.0
+    concurrency_limit: int = 0
+    rate_reductions: int = 0
+    # Estado do circuit breaker (atualizado pelo Disjuntor)
+    circuit_state: str = 'fechado'
+    circuit_opens: int = 0
+    fast_failures: int = 0
     start_time: Optional[datetime] = None
     end_time: Optional[datetime] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
     
-    def add_success(self):
-        self.successful += 1
+    def add_success(self, count: int = 1):
+        with self._lock:
+            self.successful += count
     
-    def add_failure(self):
-        self.failed += 1
+    def add_failure(self, count: int = 1):
+        with self._lock:
+            self.failed += count
     
-    def add_retry(self):
-        self.retries_used += 1
+    def add_retry(self, count: int = 1):
+        with self._lock:
+            self.retries_used += count
+    
+    def add_request(self):
+        with self._lock:
+            self.requests_sent += 1
     
     def success_rate(self) -> float:
         if self.total_products == 0:
@@ -83,20 +119,34 @@ class APIStats:
 class APIClient:
     """Cliente para comunicação com API REST com retry automático"""
     
-    def __init__(self, base_url: str, retry_config: RetryConfig = None):
+    def __init__(self, base_url: str, retry_config: RetryConfig = None, controle: ControleAdaptativo = None,
+                 disjuntor: Disjuntor = None):
         self.base_url = base_url.rstrip('/')
         self.retry_config = retry_config or RetryConfig()
+        # Controle de vazão (token bucket + AIMD); None envia sem limite
+        self.controle = controle
+        # Circuit breaker: com a API fora do ar, os envios falham rápido para a fila de retries
+        self.disjuntor = disjuntor
         self.session = requests.Session()
         self.session.headers.update({
             'Content-Type': 'application/json',
             'User-Agent': 'GoParts-Client/1.0'
         })
         self.logger = logging.getLogger(__name__)
+        # Conexões mantidas por host (o padrão do requests é 10)
+        self.pool_size = 0
+        # Orçamento de retries compartilhado por todos os envios deste cliente
+        self.orcamento = OrcamentoRetries(self.retry_config.retry_budget, self.retry_config.retry_budget_min)
+        self._aviso_orcamento = False
     
-    def _calculate_delay(self, attempt: int) -> float:
-        """Calcula delay para backoff exponencial"""
-        delay = self.retry_config.initial_delay * (self.retry_config.backoff_factor ** (attempt - 1))
-        return min(delay, self.retry_config.max_delay)
+    def _ajustar_pool(self, workers: int):
+        """Monta um HTTPAdapter com uma conexão reaproveitável por worker"""
+        if workers <= self.pool_size:
+            return
+        adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.pool_size = workers
     
     def _should_retry(self, response: requests.Response = None, exception: Exception = None) -> bool:
         """Determina se deve tentar novamente"""
@@ -104,71 +154,221 @@ class APIClient:
             # Retry em timeouts e connection errors
             return isinstance(exception, (requests.Timeout, requests.ConnectionError))
         
-        if response:
+        if response is not None:
             return response.status_code in self.retry_config.retry_on_status
         
         return False
     
-    def send_produto(self, produto: Dict[str, Any]) -> Tuple[bool, Dict[str, Any]]:
+    def _post(self, url: str, payload, stats: APIStats = None) -> requests.Response:
+        """
+        POST passando pelo controle de vazão: aguarda uma vaga e a vez no token bucket,
+        e informa o resultado a ele e ao disjuntor (status de retry/429/timeout contam como falha)
+        """
+        if stats is not None:
+            stats.add_request()
+        with self.controle.vaga() if self.controle else nullcontext():
+            if self.controle:
+                self.controle.aguardar()
+            try:
+                response = self.session.post(url, json=payload, timeout=10)  # 10 segundos de timeout
+            except (requests.Timeout, requests.ConnectionError):
+                if self.controle:
+                    self.controle.registrar_sobrecarga()
+                if self.disjuntor:
+                    self.disjuntor.registrar_falha()
+                raise
+            except Exception:
+                if self.disjuntor:
+                    self.disjuntor.liberar()
+                raise
+        sobrecarga = response.status_code == 429 or self._should_retry(response=response)
+        if self.disjuntor:
+            if sobrecarga:
+                self.disjuntor.registrar_falha()
+            else:
+                self.disjuntor.registrar_sucesso()
+        if self.controle:
+            if response.status_code < 300:
+                self.controle.registrar_sucesso()
+            elif sobrecarga:
+                self.controle.registrar_sobrecarga(imediata=response.status_code == 429)
+        return response
+    
+    def _recusado(self, erro: CircuitoAberto) -> Tentativa:
+        """Requisição barrada pelo disjuntor: volta para a fila sem gastar tentativa (ou falha, se ele desistiu)"""
+        resposta = {'error': 'CircuitOpen', 'message': str(erro)}
+        if erro.desistiu:
+            return Tentativa('falha', resposta)
+        return Tentativa('retry', resposta, atraso=erro.espera, consome_tentativa=False)
+    
+    def _tentar_produto(self, produto: Dict[str, Any], attempt: int, stats: APIStats = None) -> Tentativa:
+        """Uma tentativa de POST /produtos; o retry, se houver, é agendado pelo executar_com_retries"""
+        url = f"{self.base_url}/produtos"
+        try:
+            if self.disjuntor:
+                self.disjuntor.verificar()
+            self.logger.info(f"📤 Enviando produto: {produto['nome_produto']} (tentativa {attempt})")
+            
+            response = self._post(url, produto, stats)
+            
+            # Sucesso
+            if response.status_code in [200, 201]:
+                self.logger.info(f"✅ Produto enviado com sucesso: {produto['codigo']} (HTTP {response.status_code})")
+                return Tentativa('ok', response.json())
+            
+            erro = {'error': f'HTTP {response.status_code}', 'message': response.text}
+            if self._should_retry(response=response):
+                return Tentativa('retry', erro)
+            
+            # Falha definitiva
+            self.logger.error(f"❌ Falha definitiva: HTTP {response.status_code} - {response.text}")
+            return Tentativa('falha', erro)
+            
+        except CircuitoAberto as e:
+            return self._recusado(e)
+        
+        except (requests.Timeout, requests.ConnectionError) as e:
+            return Tentativa('retry', {'error': 'ConnectionError', 'message': str(e)})
+        
+        except Exception as e:
+            self.logger.error(f"❌ Erro inesperado: {str(e)}")
+            return Tentativa('falha', {'error': 'UnexpectedError', 'message': str(e)})
+    
+    def _executar(self, itens: List, tentar, workers: int, stats: APIStats = None, itens_por_retry=None) -> List:
+        """
+        Roda as tentativas pelo executar_com_retries: retries na fila de espera, com jitter
+        e o orçamento global do cliente. itens_por_retry(item): retries contados por item agendado.
+        """
+        def ao_agendar(item, attempt, atraso, resposta):
+            quantidade = itens_por_retry(item) if itens_por_retry else 1
+            self.logger.warning(f"⚠️ {resposta.get('error', 'Erro')} na tentativa {attempt}, "
+                                f"nova tentativa em {atraso:.1f}s (sem bloquear os demais envios)...")
+            if stats is not None:
+                stats.add_retry(quantidade)
+        
+        resultados = executar_com_retries(itens, tentar, self.retry_config, workers,
+                                          self.retry_config.jitter, self.orcamento, ao_agendar)
+        if stats is not None:
+            stats.retries_denied = self.orcamento.negados
+        if self.orcamento.negados and not self._aviso_orcamento:
+            self._aviso_orcamento = True
+            self.logger.warning(f"🪙 Orçamento de retries esgotado ({self.orcamento.retries} retries para "
+                                f"{self.orcamento.primeiras} envios): falhas temporárias viram definitivas")
+        return resultados
+    
+    def send_produto(self, produto: Dict[str, Any], stats: APIStats = None) -> Tuple[bool, Dict[str, Any]]:
         """
         Envia produto para API com retry automático
+        stats: se informado, cada retry é contado em stats.retries_used
         Returns: (sucesso: bool, resposta: dict)
         """
-        url = f"{self.base_url}/produtos"
+        tentar = lambda item, attempt: self._tentar_produto(item, attempt, stats)
+        return self._executar([produto], tentar, 1, stats)[0]
+    
+    def send_many(self, produtos: List[Dict[str, Any]], workers: int = 1,
+                  stats: APIStats = None) -> List[Tuple[bool, Dict[str, Any]]]:
+        """
+        Envia vários produtos: as tentativas rodam em um pool de `workers` threads
+        (1: no próprio thread), compartilhando a sessão (e o pool de conexões,
+        dimensionado para os workers). Um produto aguardando retry não ocupa worker.
+        Returns: [(sucesso, resposta)] na ordem dos produtos
+        """
+        if workers < 1:
+            raise ValueError("workers deve ser >= 1")
+        self._ajustar_pool(workers)
         
-        for attempt in range(1, self.retry_config.max_attempts + 1):
-            try:
-                self.logger.info(f"📤 Enviando produto: {produto['nome_produto']} (tentativa {attempt})")
-                
-                response = self.session.post(
-                    url,
-                    json=produto,
-                    timeout=10  # 10 segundos de timeout
-                )
-                
-                # Sucesso
-                if response.status_code in [200, 201]:
-                    self.logger.info(f"✅ Produto enviado com sucesso: {produto['codigo']} (HTTP {response.status_code})")
-                    return True, response.json()
-                
-                # Verifica se deve tentar novamente
-                if self._should_retry(response=response) and attempt < self.retry_config.max_attempts:
-                    delay = self._calculate_delay(attempt)
-                    self.logger.warning(f"⚠️ Erro HTTP {response.status_code}, tentando novamente em {delay:.1f}s...")
-                    time.sleep(delay)
-                    continue
-                
-                # Falha definitiva
-                self.logger.error(f"❌ Falha definitiva: HTTP {response.status_code} - {response.text}")
-                return False, {
-                    'error': f'HTTP {response.status_code}',
-                    'message': response.text,
-                    'attempts': attempt
-                }
-                
-            except (requests.Timeout, requests.ConnectionError) as e:
-                if attempt < self.retry_config.max_attempts:
-                    delay = self._calculate_delay(attempt)
-                    self.logger.warning(f"⚠️ Erro de conexão: {str(e)}, tentando novamente em {delay:.1f}s...")
-                    time.sleep(delay)
-                    continue
-                
-                self.logger.error(f"❌ Erro de conexão definitivo: {str(e)}")
-                return False, {
-                    'error': 'ConnectionError',
-                    'message': str(e),
-                    'attempts': attempt
-                }
+        tentar = lambda item, attempt: self._tentar_produto(item, attempt, stats)
+        resultados = self._executar(produtos, tentar, workers, stats)
+        if stats is not None:
+            sucessos = sum(1 for success, _ in resultados if success)
+            stats.add_success(sucessos)
+            stats.add_failure(len(resultados) - sucessos)
+        return resultados
+    
+    def _tentar_lote(self, lote: List[Tuple[int, Dict[str, Any]]], attempt: int, resultados: List,
+                     stats: APIStats = None) -> Tentativa:
+        """
+        Uma tentativa de POST /produtos/batch com os itens (índice, produto) do lote.
+        Preenche resultados[índice] dos itens concluídos; os que falharam com status
+        de retry (ou o lote inteiro, em erro da requisição) voltam como o item do retry.
+        """
+        url = f"{self.base_url}/produtos/batch"
+        retry = []
+        try:
+            if self.disjuntor:
+                self.disjuntor.verificar()
+            self.logger.info(f"📤 Enviando lote de {len(lote)} produtos (tentativa {attempt})")
+            
+            response = self._post(url, [produto for _, produto in lote], stats)
+            
+            if response.status_code in [200, 207]:
+                respondidos = set()
+                for item in response.json()['resultados']:
+                    indice, produto = lote[item['indice']]
+                    respondidos.add(indice)
+                    if item['status'] in [200, 201]:
+                        resultados[indice] = (True, item)
+                    elif item['status'] in self.retry_config.retry_on_status:
+                        retry.append((indice, produto))
+                    else:
+                        resultados[indice] = (False, {
+                            'error': f"HTTP {item['status']}",
+                            'message': item.get('error', ''),
+                            'attempts': attempt
+                        })
+                # Itens que a resposta não trouxe são tratados como erro temporário
+                retry.extend((indice, produto) for indice, produto in lote if indice not in respondidos)
+                self.logger.info(f"✅ Lote: {len(lote) - len(retry)}/{len(lote)} itens concluídos (HTTP {response.status_code})")
+                if retry:
+                    return Tentativa('retry', {'error': 'PartialBatch', 'message': f'{len(retry)} itens falharam'},
+                                     item=retry)
+                return Tentativa('ok')
             
-            except Exception as e:
-                self.logger.error(f"❌ Erro inesperado: {str(e)}")
-                return False, {
-                    'error': 'UnexpectedError',
-                    'message': str(e),
-                    'attempts': attempt
-                }
+            erro = {'error': f'HTTP {response.status_code}', 'message': response.text}
+            if self._should_retry(response=response):
+                return Tentativa('retry', erro)
+            self.logger.error(f"❌ Falha definitiva do lote: HTTP {response.status_code} - {response.text}")
+            return Tentativa('falha', erro)
+        
+        except CircuitoAberto as e:
+            return self._recusado(e)
+        
+        except (requests.Timeout, requests.ConnectionError) as e:
+            return Tentativa('retry', {'error': 'ConnectionError', 'message': str(e)})
+        
+        except Exception as e:
+            self.logger.error(f"❌ Erro inesperado: {str(e)}")
+            return Tentativa('falha', {'error': 'UnexpectedError', 'message': str(e)})
+    
+    def send_batch(self, produtos: List[Dict[str, Any]], batch_size: int = 100,
+                   stats: APIStats = None) -> List[Tuple[bool, Dict[str, Any]]]:
+        """
+        Envia os produtos em lotes de até `batch_size` por requisição (POST /produtos/batch),
+        reenviando só os itens que falharam; os lotes aguardando retry não bloqueiam os próximos
+        Returns: [(sucesso, resposta)] na ordem dos produtos
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size deve ser >= 1")
+        if batch_size > MAX_BATCH_SIZE:
+            self.logger.warning(f"⚠️ Lote de {batch_size} produtos acima do máximo da API; usando {MAX_BATCH_SIZE}")
+            batch_size = MAX_BATCH_SIZE
         
-        return False, {'error': 'MaxAttemptsExceeded', 'attempts': self.retry_config.max_attempts}
+        resultados: List[Tuple[bool, Dict[str, Any]]] = [None] * len(produtos)
+        itens = list(enumerate(produtos))
+        lotes = [itens[inicio:inicio + batch_size] for inicio in range(0, len(itens), batch_size)]
+        tentar = lambda lote, attempt: self._tentar_lote(lote, attempt, resultados, stats)
+        finais = self._executar(lotes, tentar, 1, stats, itens_por_retry=len)
+        
+        # Itens sem resultado ficaram no último retry do lote (tentativas ou orçamento esgotados)
+        for indice in range(len(resultados)):
+            if resultados[indice] is None:
+                resultados[indice] = finais[indice // batch_size]
+        
+        if stats is not None:
+            sucessos = sum(1 for success, _ in resultados if success)
+            stats.add_success(sucessos)
+            stats.add_failure(len(resultados) - sucessos)
+        return resultados
     
     def test_connection(self) -> bool:
         """Testa conexão com a API"""
@@ -179,15 +379,54 @@ class APIClient:
             return False
 
 def load_produtos_csv(file_path: str) -> pd.DataFrame:
-    """Carrega produtos do CSV limpo"""
+    """Carrega produtos do CSV limpo (ou da versão Parquet/Feather ao lado dele, se existir)"""
     try:
-        df = pd.read_csv(file_path, encoding='utf-8-sig')
+        df = carregar_catalogo(file_path)
         return df
     except Exception as e:
         raise Exception(f"Erro ao carregar CSV: {e}")
 
-def main():
+def produto_da_linha(row) -> Dict[str, Any]:
+    """Payload de POST /produtos para uma linha do catálogo limpo"""
+    return {
+        'nome_produto': row['nome_produto'],
+        'codigo': row['codigo'],
+        'preco': float(row['preco']),
+        'estoque': int(row['estoque'])
+    }
+
+def main(argv=None):
     """Função principal"""
+    parser = argparse.ArgumentParser(description='Envia os produtos limpos para a API REST')
+    parser.add_argument('--assincrono', action='store_true',
+                        help='Envio assíncrono (asyncio + aiohttp) com concorrência limitada')
+    parser.add_argument('--concorrencia', type=int, default=20,
+                        help='Requisições simultâneas no modo --assincrono (padrão: 20)')
+    parser.add_argument('--workers', type=int, default=0,
+                        help='Envia com N threads (requests, pool de conexões com N conexões)')
+    parser.add_argument('--lote', type=int, default=0,
+                        help='Envia em lotes de N produtos por requisição (POST /produtos/batch)')
+    parser.add_argument('--taxa', type=float, default=10.0,
+                        help='Taxa inicial em requisições/s do controle de vazão (padrão: 10)')
+    parser.add_argument('--taxa-maxima', type=float, default=500.0,
+                        help='Teto da taxa em requisições/s (padrão: 500)')
+    parser.add_argument('--jitter', choices=JITTERS, default='full',
+                        help='Jitter do backoff entre tentativas (padrão: full)')
+    parser.add_argument('--orcamento-retries', type=float, default=0.1,
+                        help='Retries permitidos como fração dos envios, além de 20 fixos (padrão: 0.1)')
+    parser.add_argument('--falhas-disjuntor', type=int, default=10,
+                        help='Falhas seguidas (5xx/timeout) que abrem o circuit breaker (padrão: 10)')
+    parser.add_argument('--cooldown', type=float, default=10.0,
+                        help='Segundos com o circuito aberto antes da requisição de sonda (padrão: 10)')
+    parser.add_argument('--sem-disjuntor', action='store_true', help='Desliga o circuit breaker')
+    parser.add_argument('--sem-controle', action='store_true',
+                        help='Desliga o controle de vazão (sem limite de taxa nem de requisições em voo)')
+    args = parser.parse_args(argv)
+    if args.lote > MAX_BATCH_SIZE:
+        parser.error(f"--lote aceita no máximo {MAX_BATCH_SIZE} produtos por requisição")
+    if sum(map(bool, (args.assincrono, args.workers, args.lote))) > 1:
+        parser.error("--assincrono, --workers e --lote são modos alternativos")
+
     logger, log_file = setup_logging()
     
     print("🔗 GoParts API Integration v1.0")
@@ -203,13 +442,16 @@ def main():
         max_attempts=5,
         initial_delay=1.0,
         backoff_factor=2.0,
-        max_delay=16.0
+        max_delay=16.0,
+        jitter=args.jitter,
+        retry_budget=args.orcamento_retries
     )
     
     logger.info(f"📁 Arquivo CSV: {CSV_FILE}")
     logger.info(f"🌐 API URL: {API_URL}")
     logger.info(f"📝 Log file: {log_file}")
-    logger.info(f"🔄 Retry config: max_attempts={retry_config.max_attempts}, backoff={retry_config.backoff_factor}x")
+    logger.info(f"🔄 Retry config: max_attempts={retry_config.max_attempts}, backoff={retry_config.backoff_factor}x, "
+                f"jitter={retry_config.jitter}, orçamento={retry_config.retry_budget:.0%} + {retry_config.retry_budget_min}")
     
     try:
         # Carrega produtos
@@ -236,37 +478,73 @@ def main():
         stats.total_products = len(df)
         stats.start_time = datetime.now()
         
+        # Controle de vazão: a taxa sobe enquanto a API responde bem e cai pela metade
+        # quando a maioria das respostas recentes é 5xx/timeout
+        controle = None
+        if not args.sem_controle:
+            maximo_em_voo = args.workers or (args.concorrencia if args.assincrono else 1)
+            controle = ControleAdaptativo(ConfigControle(
+                taxa_inicial=args.taxa,
+                taxa_maxima=args.taxa_maxima,
+                limite_inicial=maximo_em_voo,
+                limite_maximo=maximo_em_voo
+            ), stats)
+            client.controle = controle
+            logger.info(f"🎚️ Controle de vazão: {controle.resumo()} (teto {args.taxa_maxima:g} req/s)")
+        
+        # Circuit breaker: com a API fora do ar, os produtos esperam na fila em vez de gastar tentativas
+        # (o envio assíncrono não passa pelo APIClient)
+        if not args.sem_disjuntor and not args.assincrono:
+            client.disjuntor = Disjuntor(ConfigDisjuntor(falhas_consecutivas=args.falhas_disjuntor,
+                                                         cooldown=args.cooldown), stats)
+            logger.info(f"🔌 Circuit breaker: abre após {args.falhas_disjuntor} falhas seguidas, cooldown {args.cooldown:g}s")
+        
         # Processa cada produto
         logger.info(f"🚀 Iniciando envio de {len(df)} produtos...")
         
         failed_products = []
         
-        for index, row in df.iterrows():
-            produto = {
-                'nome_produto': row['nome_produto'],
-                'codigo': row['codigo'],
-                'preco': float(row['preco']),
-                'estoque': int(row['estoque'])
-            }
+        def registrar_falha(produto, response):
+            failed_products.append({
+                'produto': produto,
+                'error': response
+            })
             
-            success, response = client.send_produto(produto)
-            
-            if success:
-                stats.add_success()
-            else:
-                stats.add_failure()
-                failed_products.append({
-                    'produto': produto,
-                    'error': response
-                })
-                
-                # Log do erro
-                error_msg = response.get('message', 'Erro desconhecido')
-                attempts = response.get('attempts', 'N/A')
-                logger.error(f"❌ Falha ao enviar {produto['codigo']}: {error_msg} (tentativas: {attempts})")
+            # Log do erro
+            error_msg = response.get('message', 'Erro desconhecido')
+            attempts = response.get('attempts', 'N/A')
+            logger.error(f"❌ Falha ao enviar {produto['codigo']}: {error_msg} (tentativas: {attempts})")
+        
+        if args.assincrono:
+            from async_sender import enviar_produtos_async
             
-            # Pequena pausa entre envios
-            time.sleep(0.1)
+            logger.info(f"⚡ Modo assíncrono: até {args.concorrencia} requisições simultâneas")
+            produtos = [produto_da_linha(row) for _, row in df.iterrows()]
+            resultados = enviar_produtos_async(API_URL, produtos, retry_config, args.concorrencia, stats, controle)
+            for produto, (success, response) in zip(produtos, resultados):
+                if not success:
+                    registrar_falha(produto, response)
+        elif args.lote:
+            logger.info(f"📦 Modo em lotes: até {args.lote} produtos por requisição")
+            produtos = [produto_da_linha(row) for _, row in df.iterrows()]
+            resultados = client.send_batch(produtos, args.lote, stats)
+            for produto, (success, response) in zip(produtos, resultados):
+                if not success:
+                    registrar_falha(produto, response)
+        elif args.workers:
+            logger.info(f"🧵 Modo paralelo: {args.workers} threads")
+            produtos = [produto_da_linha(row) for _, row in df.iterrows()]
+            resultados = client.send_many(produtos, args.workers, stats)
+            for produto, (success, response) in zip(produtos, resultados):
+                if not success:
+                    registrar_falha(produto, response)
+        else:
+            # Um envio por vez; os retries esperam na fila enquanto os próximos produtos seguem
+            produtos = [produto_da_linha(row) for _, row in df.iterrows()]
+            resultados = client.send_many(produtos, 1, stats)
+            for produto, (success, response) in zip(produtos, resultados):
+                if not success:
+                    registrar_falha(produto, response)
         
         stats.end_time = datetime.now()
         
@@ -280,6 +558,14 @@ def main():
         print(f"❌ Falhas: {stats.failed}")
         print(f"📈 Taxa de sucesso: {stats.success_rate():.1f}%")
         print(f"🔄 Total de retries: {stats.retries_used}")
+        if stats.retries_denied:
+            print(f"🪙 Retries negados pelo orçamento: {stats.retries_denied}")
+        print(f"🌐 Requisições HTTP: {stats.requests_sent}")
+        if client.disjuntor:
+            print(f"🔌 Circuit breaker: {stats.circuit_state} ao final ({stats.circuit_opens} aberturas, "
+                  f"{stats.fast_failures} envios barrados)")
+        if controle:
+            print(f"🎚️  Controle de vazão: {controle.resumo()} ao final ({stats.rate_reductions} reduções)")
         
         logger.info(f"📊 RESUMO: {stats.successful}/{stats.total_products} produtos enviados ({stats.success_rate():.1f}% sucesso)")
         
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+⚡ GoParts Async Sender
+Envio assíncrono de produtos (asyncio + aiohttp) com concorrência limitada.
+Segue a mesma RetryConfig do APIClient (tentativas, backoff exponencial com
+jitter, status para retry, orçamento global de retries), mas o backoff é um
+asyncio.sleep fora do semáforo: enquanto um produto espera para tentar de novo,
+a vaga dele é usada pelos próximos.
+As conexões TCP são reaproveitadas (um ClientSession, pool do tamanho da concorrência).
+Com um ControleAdaptativo, a taxa e o número de requisições em voo seguem o AIMD
+(dentro do teto `concorrencia`).
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+from api_integration import APIStats, RetryConfig
+from rate_control import ControleAdaptativo
+from retry_scheduler import OrcamentoRetries, calcular_backoff
+
+CONCORRENCIA_PADRAO = 20
+# Produtos em andamento (enviando ou aguardando retry) por vaga de concorrência:
+# limita a memória em listas grandes sem deixar as vagas ociosas durante os backoffs
+PENDENTES_POR_VAGA = 10
+TIMEOUT_REQUISICAO = 10  # segundos, como no APIClient
+
+def _importar_aiohttp():
+    try:
+        import aiohttp
+    except ImportError:
+        raise ImportError("Envio assíncrono requer aiohttp: pip install aiohttp")
+    return aiohttp
+
+class _VagasAdaptativas:
+    """Semáforo assíncrono cujo tamanho acompanha o limite do controle (até `maximo`)"""
+
+    def __init__(self, controle: ControleAdaptativo, maximo: int):
+        self.controle = controle
+        self.maximo = maximo
+        self.em_voo = 0
+        self._condicao = asyncio.Condition()
+
+    async def __aenter__(self):
+        # O limite só aumenta em um sucesso, que sempre é seguido de uma saída (notify_all)
+        async with self._condicao:
+            await self._condicao.wait_for(lambda: self.em_voo < min(self.maximo, self.controle.limite))
+            self.em_voo += 1
+        await asyncio.sleep(self.controle.reservar())
+
+    async def __aexit__(self, *exc):
+        async with self._condicao:
+            self.em_voo -= 1
+            self._condicao.notify_all()
+
+class EnviadorAssincrono:
+    """Envia produtos para POST /produtos com até `concorrencia` requisições simultâneas"""
+
+    def __init__(self, base_url: str, retry_config: RetryConfig = None,
+                 concorrencia: int = CONCORRENCIA_PADRAO, controle: ControleAdaptativo = None):
+        if concorrencia < 1:
+            raise ValueError("concorrencia deve ser >= 1")
+        self.aiohttp = _importar_aiohttp()
+        self.base_url = base_url.rstrip('/')
+        self.retry_config = retry_config or RetryConfig()
+        self.concorrencia = concorrencia
+        self.controle = controle
+        self.orcamento = OrcamentoRetries(self.retry_config.retry_budget, self.retry_config.retry_budget_min)
+        self.logger = logging.getLogger(__name__)
+
+    def _agendar_retry(self, attempt: int, anterior: float, stats: APIStats):
+        """Espera do próximo retry (com jitter), ou None se o orçamento de retries acabou"""
+        if not self.orcamento.consumir():
+            stats.retries_denied = self.orcamento.negados
+            return None
+        stats.add_retry()
+        return calcular_backoff(self.retry_config, attempt, anterior, self.retry_config.jitter)
+
+    def _registrar(self, status: int = None):
+        """Informa o resultado ao controle AIMD (status None: timeout/erro de conexão)"""
+        if self.controle is None:
+            return
+        if status is not None and status < 300:
+            self.controle.registrar_sucesso()
+        elif status is None or status == 429 or status in self.retry_config.retry_on_status:
+            self.controle.registrar_sobrecarga(imediata=status == 429)
+
+    async def enviar_produto(self, session, vagas, produto: Dict[str, Any],
+                             stats: APIStats) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Envia um produto com retry automático (semântica de APIClient.send_produto)
+        Returns: (sucesso: bool, resposta: dict)
+        """
+        url = f"{self.base_url}/produtos"
+        erros_conexao = (self.aiohttp.ClientConnectionError, asyncio.TimeoutError)
+        self.orcamento.registrar_primeira()
+        delay = None
+
+        for attempt in range(1, self.retry_config.max_attempts + 1):
+            try:
+                # A vaga só é ocupada durante a requisição, não durante o backoff
+                async with vagas:
+                    self.logger.info(f"📤 Enviando produto: {produto['nome_produto']} (tentativa {attempt})")
+                    stats.add_request()
+                    async with session.post(url, json=produto) as response:
+                        status = response.status
+                        if status in [200, 201]:
+                            corpo = await response.json()
+                        else:
+                            texto = await response.text()
+                    # Registrado antes de liberar a vaga: a saída acorda quem espera,
+                    # e eles já comparam com o limite que este sucesso aumentou
+                    self._registrar(status)
+
+                if status in [200, 201]:
+                    self.logger.info(f"✅ Produto enviado com sucesso: {produto['codigo']} (HTTP {status})")
+                    return True, corpo
+
+                if status in self.retry_config.retry_on_status and attempt < self.retry_config.max_attempts:
+                    delay = self._agendar_retry(attempt, delay, stats)
+                    if delay is not None:
+                        self.logger.warning(f"⚠️ Erro HTTP {status}, tentando novamente em {delay:.1f}s...")
+                        await asyncio.sleep(delay)
+                        continue
+
+                self.logger.error(f"❌ Falha definitiva: HTTP {status} - {texto}")
+                return False, {
+                    'error': f'HTTP {status}',
+                    'message': texto,
+                    'attempts': attempt
+                }
+
+            except erros_conexao as e:
+                self._registrar()
+                mensagem = str(e) or type(e).__name__
+                if attempt < self.retry_config.max_attempts:
+                    delay = self._agendar_retry(attempt, delay, stats)
+                    if delay is not None:
+                        self.logger.warning(f"⚠️ Erro de conexão: {mensagem}, tentando novamente em {delay:.1f}s...")
+                        await asyncio.sleep(delay)
+                        continue
+
+                self.logger.error(f"❌ Erro de conexão definitivo: {mensagem}")
+                return False, {
+                    'error': 'ConnectionError',
+                    'message': mensagem,
+                    'attempts': attempt
+                }
+
+            except Exception as e:
+                self.logger.error(f"❌ Erro inesperado: {str(e)}")
+                return False, {
+                    'error': 'UnexpectedError',
+                    'message': str(e),
+                    'attempts': attempt
+                }
+
+        return False, {'error': 'MaxAttemptsExceeded', 'attempts': self.retry_config.max_attempts}
+
+    async def enviar_todos(self, produtos: List[Dict[str, Any]],
+                           stats: APIStats = None) -> List[Tuple[bool, Dict[str, Any]]]:
+        """Envia a lista inteira; os resultados voltam na ordem dos produtos"""
+        stats = stats or APIStats(total_products=len(produtos))
+        resultados: List[Tuple[bool, Dict[str, Any]]] = [None] * len(produtos)
+        if self.controle is not None:
+            vagas = _VagasAdaptativas(self.controle, self.concorrencia)
+        else:
+            vagas = asyncio.Semaphore(self.concorrencia)
+        pendentes = asyncio.Semaphore(self.concorrencia * PENDENTES_POR_VAGA)
+
+        async def enviar(indice: int, produto: Dict[str, Any]):
+            try:
+                resultados[indice] = await self.enviar_produto(session, vagas, produto, stats)
+                if resultados[indice][0]:
+                    stats.add_success()
+                else:
+                    stats.add_failure()
+            finally:
+                pendentes.release()
+
+        conector = self.aiohttp.TCPConnector(limit=self.concorrencia)
+        timeout = self.aiohttp.ClientTimeout(total=TIMEOUT_REQUISICAO)
+        headers = {'Content-Type': 'application/json', 'User-Agent': 'GoParts-Client/1.0'}
+        async with self.aiohttp.ClientSession(connector=conector, timeout=timeout, headers=headers) as session:
+            tarefas = []
+            for indice, produto in enumerate(produtos):
+                await pendentes.acquire()
+                tarefas.append(asyncio.create_task(enviar(indice, produto)))
+            await asyncio.gather(*tarefas)
+        return resultados
+
+def enviar_produtos_async(base_url: str, produtos: List[Dict[str, Any]], retry_config: RetryConfig = None,
+                          concorrencia: int = CONCORRENCIA_PADRAO,
+                          stats: APIStats = None,
+                          controle: ControleAdaptativo = None) -> List[Tuple[bool, Dict[str, Any]]]:
+    """Ponto de entrada síncrono: roda o envio assíncrono em um event loop próprio"""
+    enviador = EnviadorAssincrono(base_url, retry_config, concorrencia, controle)
+    if stats is not None and stats.start_time is None:
+        stats.start_time = datetime.now()
+    return asyncio.run(enviador.enviar_todos(produtos, stats))
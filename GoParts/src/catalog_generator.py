@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+🏭 GoParts Catalog Generator
+Gera catálogos sintéticos de N linhas em Latin-1 com a mesma mistura de
+defeitos de data/input/produtos_bagunçados_latin1.csv:
+prefixo R$, formato 1.250,00, espaços sobrando, estoque -1/None/n/a/vazio
+e colunas extras no final da linha.
+
+Uso:
+    python src/catalog_generator.py --linhas 5000000 -o data/benchmark/catalogo_5M.csv
+"""
+
+import os
+import argparse
+import numpy as np
+
+NOMES = [
+    "Amortecedor Traseiro", "Pivô de Suspensão", "Bomba d'água - edicao especial", "Embreagem",
+    "Lâmpada de Farol", "Filtro de óleo", "Para-choque", "Lanterna Traseira", "Velocímetro",
+    "Freio Dianteiro", "Kit Correia Dentada", "Coxim do Motor", "Junta Homocinética", "Radiador",
+    "Disco de Freio", "Pastilha de Freio", "Sensor de Oxigênio", "Bobina de Ignição",
+    "Válvula Termostática", "Reservatório de Expansão",
+]
+REGIOES = ['LA', 'BR', 'US', 'EU']
+
+# Formatos de preço e sua frequência (proporções do arquivo de exemplo)
+FORMATOS_PRECO = {
+    'inteiro': 0.35,            # 100
+    'rs_colado': 0.10,          # R$100
+    'rs_espaco': 0.15,          # R$ 250
+    'decimal_ponto': 0.15,      # 100.50
+    'milhar_ponto': 0.05,       # 1.250
+    'brasileiro': 0.20,         # R$ 1.050,70 (a vírgula vira coluna extra)
+}
+# Valores de estoque inválidos e a chance de cada linha ter um deles
+ESTOQUES_INVALIDOS = ['-1', 'None', 'n/a', '', ' ']
+CHANCE_ESTOQUE_INVALIDO = 0.30
+# Chance de uma coluna extra no final ("50,10", "5,n/a", "30,")
+CHANCE_COLUNA_EXTRA = 0.45
+# Chance de espaços sobrando em volta do nome
+CHANCE_ESPACOS = 0.05
+
+# Linhas geradas por bloco (limita a memória do gerador)
+LINHAS_POR_BLOCO = 200_000
+
+def _gerar_precos(rng: np.random.Generator, n: int) -> list:
+    formatos = rng.choice(list(FORMATOS_PRECO), size=n, p=list(FORMATOS_PRECO.values()))
+    reais = rng.integers(1, 2000, size=n)
+    centavos = rng.integers(0, 100, size=n)
+
+    precos = []
+    for formato, real, centavo in zip(formatos, reais.tolist(), centavos.tolist()):
+        if formato == 'inteiro':
+            precos.append(str(real))
+        elif formato == 'rs_colado':
+            precos.append(f"R${real}")
+        elif formato == 'rs_espaco':
+            precos.append(f"R$ {real}")
+        elif formato == 'decimal_ponto':
+            precos.append(f"{real}.{centavo:02d}")
+        elif formato == 'milhar_ponto':
+            precos.append(f"{real // 1000 or 1}.{real % 1000:03d}")
+        else:
+            milhar = f"{real // 1000}.{real % 1000:03d}" if real >= 1000 else str(real)
+            precos.append(f"R$ {milhar},{centavo:02d}")
+    return precos
+
+def gerar_linhas(rng: np.random.Generator, inicio: int, n: int) -> list:
+    """Gera n linhas sujas (sem cabeçalho), com codigos únicos a partir de `inicio`"""
+    nomes = rng.choice(NOMES, size=n)
+    regioes = rng.choice(REGIOES, size=n)
+    precos = _gerar_precos(rng, n)
+    estoques = rng.integers(0, 100, size=n).astype(str).astype(object)
+
+    invalidos = rng.random(n) < CHANCE_ESTOQUE_INVALIDO
+    estoques[invalidos] = rng.choice(ESTOQUES_INVALIDOS, size=int(invalidos.sum()))
+    extras = rng.random(n) < CHANCE_COLUNA_EXTRA
+    espacos = rng.random(n) < CHANCE_ESPACOS
+
+    linhas = []
+    for i in range(n):
+        nome = f" {nomes[i]}  " if espacos[i] else nomes[i]
+        linha = f"{nome},K{inicio + i:07d}{regioes[i]},{precos[i]},{estoques[i]}"
+        if extras[i]:
+            linha += ',' + ('' if i % 3 else str(i % 50))
+        linhas.append(linha)
+    return linhas
+
+def gerar_catalogo(caminho_saida, linhas: int, semente: int = 42, encoding: str = 'latin1') -> str:
+    """Grava um catálogo sintético com `linhas` produtos. Mesma semente → mesmo arquivo."""
+    os.makedirs(os.path.dirname(os.path.abspath(caminho_saida)), exist_ok=True)
+    rng = np.random.default_rng(semente)
+
+    with open(caminho_saida, 'w', encoding=encoding, newline='\n') as file:
+        file.write("nome_produto,codigo,preco,estoque\n")
+        for inicio in range(0, linhas, LINHAS_POR_BLOCO):
+            bloco = gerar_linhas(rng, inicio, min(LINHAS_POR_BLOCO, linhas - inicio))
+            file.write('\n'.join(bloco))
+            file.write('\n')
+    return caminho_saida
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Gerador de catálogos sintéticos sujos (Latin-1)')
+    parser.add_argument('--linhas', '-n', type=int, default=1_000_000, help='Quantidade de produtos')
+    parser.add_argument('--output', '-o', required=True, help='Arquivo CSV de saída')
+    parser.add_argument('--semente', type=int, default=42, help='Semente do gerador aleatório')
+    args = parser.parse_args(argv)
+
+    gerar_catalogo(args.output, args.linhas, args.semente)
+    tamanho = os.path.getsize(args.output) / 1024 / 1024
+    print(f"✅ {args.linhas} produtos gerados em {args.output} ({tamanho:.1f} MB)")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
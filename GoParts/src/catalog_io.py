@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+📚 GoParts Catalog I/O
+Leitura e gravação do catálogo limpo em CSV (UTF-8) ou em formato colunar
+(Parquet / Arrow IPC-Feather). O formato é escolhido pela extensão do arquivo.
+Os formatos colunares preservam os dtypes (preco float, estoque int) e são
+lidos com memory-map, sem reparse de texto. CSVs com extensão .gz/.bz2/.zst
+são (des)comprimidos em stream (ver compressed_io).
+"""
+
+import os
+import pandas as pd
+
+from compressed_io import abrir_binario, abrir_texto, caminho_sem_compressao, compressao_do_caminho
+
+# Extensão → formato
+FORMATOS = {
+    '.csv': 'csv',
+    '.parquet': 'parquet',
+    '.feather': 'feather',
+    '.arrow': 'feather',
+}
+
+# Ordem de preferência ao procurar uma versão colunar ao lado do CSV
+EXTENSOES_COLUNARES = ['.parquet', '.feather', '.arrow']
+
+def formato_do_caminho(caminho) -> str:
+    """Retorna 'csv', 'parquet' ou 'feather' conforme a extensão (padrão: csv; produtos.csv.gz é csv)"""
+    return FORMATOS.get(os.path.splitext(caminho_sem_compressao(caminho))[1].lower(), 'csv')
+
+def caminho_com_formato(caminho, formato: str = None) -> str:
+    """Troca a extensão do caminho para a do formato pedido ('csv', 'parquet' ou 'feather')"""
+    if not formato or formato_do_caminho(caminho) == formato:
+        return caminho
+    return os.path.splitext(caminho_sem_compressao(caminho))[0] + '.' + formato
+
+def _importar_pyarrow():
+    """Importa pyarrow sob demanda (dependência opcional)"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        import pyarrow.feather as feather
+        import pyarrow.ipc as ipc
+    except ImportError:
+        raise ImportError("Formato colunar requer pyarrow: pip install pyarrow")
+    return pa, pq, feather, ipc
+
+def pyarrow_disponivel() -> bool:
+    try:
+        _importar_pyarrow()
+        return True
+    except ImportError:
+        return False
+
+class EscritorCatalogo:
+    """
+    Grava o catálogo em blocos (um DataFrame por chamada de escrever()).
+    CSV: o primeiro bloco cria o arquivo com BOM e cabeçalho, os demais são anexados
+    (o arquivo fica aberto entre os blocos, então .gz/.bz2/.zst viram um único stream).
+    Parquet/Feather: cada bloco vira um row group / record batch do mesmo arquivo.
+    Com anexar=True (só CSV sem compressão), os blocos são anexados a um arquivo existente,
+    sem BOM nem cabeçalho (usado ao retomar uma limpeza a partir de um checkpoint).
+    """
+
+    def __init__(self, caminho, incluir_cabecalho: bool = True, anexar: bool = False):
+        self.caminho = caminho
+        self.formato = formato_do_caminho(caminho)
+        if anexar and (self.formato != 'csv' or compressao_do_caminho(caminho)):
+            raise ValueError(f"Só é possível anexar a CSV sem compressão: {caminho}")
+        self.incluir_cabecalho = incluir_cabecalho and not anexar
+        self.anexar = anexar
+        self.blocos_escritos = 0
+        self._writer = None
+        self._schema = None
+        self._arquivo = None
+
+    def _schema_para(self, tabela):
+        """Fixa o schema do primeiro bloco; colunas sem nenhum valor viram string"""
+        pa = _importar_pyarrow()[0]
+        campos = [pa.field(campo.name, pa.string()) if pa.types.is_null(campo.type) else campo
+                  for campo in tabela.schema]
+        return pa.schema(campos)
+
+    def escrever(self, df: pd.DataFrame):
+        if self.formato == 'csv':
+            if self._arquivo is None:
+                encoding = 'utf-8-sig' if self.incluir_cabecalho else 'utf-8'
+                self._arquivo = abrir_texto(self.caminho, 'a' if self.anexar else 'w', encoding=encoding,
+                                            newline='')
+            cabecalho = self.incluir_cabecalho and self.blocos_escritos == 0
+            df.to_csv(self._arquivo, index=False, header=cabecalho)
+        else:
+            pa, pq, _, ipc = _importar_pyarrow()
+            tabela = pa.Table.from_pandas(df, preserve_index=False)
+            if self._writer is None:
+                self._schema = self._schema_para(tabela)
+                if self.formato == 'parquet':
+                    self._writer = pq.ParquetWriter(self.caminho, self._schema)
+                else:
+                    self._writer = ipc.new_file(self.caminho, self._schema)
+            self._writer.write_table(tabela.cast(self._schema))
+
+        self.blocos_escritos += 1
+
+    def escrever_linhas(self, colunas, linhas):
+        """CSV: grava linhas já formatadas por linhas_csv (com o cabeçalho no primeiro bloco)"""
+        if self.formato != 'csv':
+            raise ValueError(f"Linhas formatadas só podem ser gravadas em CSV: {self.caminho}")
+        self.escrever(pd.DataFrame(columns=colunas))
+        if len(linhas):
+            self._arquivo.write(os.linesep.join(linhas))
+            self._arquivo.write(os.linesep)
+
+    def sincronizar(self) -> int:
+        """
+        CSV sem compressão: descarrega o que foi escrito até o disco (fsync).
+        Returns: tamanho do arquivo em bytes
+        """
+        if self._arquivo is None:
+            return os.path.getsize(self.caminho) if os.path.exists(self.caminho) else 0
+        self._arquivo.flush()
+        os.fsync(self._arquivo.fileno())
+        return os.fstat(self._arquivo.fileno()).st_size
+
+    def fechar(self):
+        if self._arquivo is not None:
+            self._arquivo.close()
+            self._arquivo = None
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+def linhas_csv(df: pd.DataFrame) -> list:
+    """Linhas de dados do DataFrame exatamente como EscritorCatalogo as grava em CSV (sem cabeçalho)"""
+    linhas = df.to_csv(index=False, header=False).split(os.linesep)[:-1]
+    if len(linhas) != len(df):
+        raise ValueError("Campos com quebra de linha não podem ser gravados como linhas CSV")
+    return linhas
+
+def salvar_catalogo(df: pd.DataFrame, caminho):
+    """Salva o DataFrame inteiro no formato indicado pela extensão"""
+    with EscritorCatalogo(caminho) as escritor:
+        escritor.escrever(df)
+
+def localizar_catalogo(caminho) -> str:
+    """
+    Dado o caminho do CSV limpo, prefere uma versão colunar irmã
+    (mesmo nome, extensão .parquet/.feather/.arrow) que seja pelo menos tão recente quanto ele.
+    """
+    if formato_do_caminho(caminho) != 'csv' or not pyarrow_disponivel():
+        return caminho
+
+    raiz = os.path.splitext(caminho_sem_compressao(caminho))[0]
+    mtime_csv = os.path.getmtime(caminho) if os.path.exists(caminho) else 0
+    for extensao in EXTENSOES_COLUNARES:
+        candidato = raiz + extensao
+        if os.path.exists(candidato) and os.path.getmtime(candidato) >= mtime_csv:
+            return candidato
+    return caminho
+
+def ler_colunar(caminho, colunas=None, dtype_backend: str = None) -> pd.DataFrame:
+    """
+    Lê um arquivo Parquet/Feather (só `colunas`, se informadas) com memory-map, preservando os dtypes.
+    dtype_backend='pyarrow' mantém as colunas em Arrow (sem converter textos para objetos Python).
+    """
+    _, pq, feather, _ = _importar_pyarrow()
+    if formato_do_caminho(caminho) == 'parquet':
+        tabela = pq.read_table(caminho, columns=colunas, memory_map=True)
+    else:
+        tabela = feather.read_table(caminho, columns=colunas, memory_map=True)
+    return tabela.to_pandas(types_mapper=pd.ArrowDtype if dtype_backend == 'pyarrow' else None)
+
+def ler_catalogo(caminho) -> pd.DataFrame:
+    """Lê exatamente o arquivo indicado, no formato da sua extensão"""
+    if formato_do_caminho(caminho) == 'csv':
+        if compressao_do_caminho(caminho):
+            with abrir_binario(caminho) as file:
+                return pd.read_csv(file, encoding='utf-8-sig')
+        return pd.read_csv(caminho, encoding='utf-8-sig')
+    return ler_colunar(caminho)
+
+def ler_catalogo_em_chunks(caminho, chunk_size: int):
+    """Gera o catálogo em DataFrames de até chunk_size linhas, sem carregá-lo inteiro"""
+    formato = formato_do_caminho(caminho)
+    if formato == 'csv':
+        with abrir_binario(caminho) as file:
+            yield from pd.read_csv(file, encoding='utf-8-sig', chunksize=chunk_size)
+        return
+
+    _, pq, _, ipc = _importar_pyarrow()
+    if formato == 'parquet':
+        for lote in pq.ParquetFile(caminho, memory_map=True).iter_batches(batch_size=chunk_size):
+            yield lote.to_pandas()
+    else:
+        leitor = ipc.open_file(caminho)
+        for i in range(leitor.num_record_batches):
+            yield leitor.get_batch(i).to_pandas()
+
+def carregar_catalogo(caminho, compactar: bool = False) -> pd.DataFrame:
+    """
+    Carrega o catálogo limpo, usando a versão colunar quando disponível.
+    compactar=True converte para dtypes compactos (ver compact_dtypes).
+    """
+    df = ler_catalogo(localizar_catalogo(caminho))
+    if compactar:
+        from compact_dtypes import compactar_dtypes
+        df = compactar_dtypes(df)
+    return df
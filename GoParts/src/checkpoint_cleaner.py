@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+💾 GoParts Checkpoint Cleaner
+Limpeza retomável de arquivos muito grandes. A saída é gravada em um arquivo
+parcial oculto ao lado do destino; a cada chunk gravado, o parcial é sincronizado
+no disco (fsync) e um checkpoint registra o offset do último byte da entrada já
+limpo e o tamanho da saída correspondente. Se o processo cair (erro, kill, queda
+de energia), a próxima execução trunca o parcial no tamanho registrado e continua
+a partir do offset. Ao final, o parcial é renomeado (os.replace) para o destino.
+"""
+
+import os
+import json
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from typing import List, Optional
+
+import data_cleaner
+from encoding_cache import impressao_digital
+from compressed_io import abrir_binario, caminho_irmao, compressao_do_caminho
+from catalog_io import formato_do_caminho
+from mmap_reader import (bytes_por_linha, bytes_por_linha_stream, iterar_blocos_mmap_com_offset,
+                         iterar_blocos_stream, ler_cabecalho_mmap, mmap_disponivel)
+from stage_metrics import MedidorEtapas
+from parse_engine import PARSER_PADRAO
+from mixed_encoding import contar_linhas
+
+VERSAO_CHECKPOINT = 1
+
+@dataclass
+class Checkpoint:
+    """Estado da última posição confirmada (entrada lida até offset_entrada ↔ saída com tamanho_saida bytes)"""
+    entrada: str
+    impressao: str
+    encoding: str
+    colunas: List[str]
+    offset_entrada: int = 0
+    tamanho_saida: int = 0
+    total_linhas: int = 0
+    contadores: dict = field(default_factory=dict)
+    versao: int = VERSAO_CHECKPOINT
+
+    def salvar(self, caminho):
+        """Grava o checkpoint de forma atômica e durável (fsync antes do rename)"""
+        temporario = f"{caminho}.tmp"
+        with open(temporario, 'w', encoding='utf-8') as file:
+            json.dump(asdict(self), file, indent=2, ensure_ascii=False)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporario, caminho)
+
+def caminho_checkpoint(caminho_saida) -> str:
+    """O checkpoint fica ao lado da saída limpa, sem a extensão dela: produtos.csv → produtos.checkpoint.json"""
+    return caminho_irmao(caminho_saida, '.checkpoint.json')
+
+def caminho_parcial(caminho_saida) -> str:
+    """Saída em andamento: arquivo oculto no mesmo diretório (o rename final é atômico)"""
+    diretorio, nome = os.path.split(os.path.abspath(caminho_saida))
+    return os.path.join(diretorio, f".parcial-{nome}")
+
+def carregar_checkpoint(caminho_entrada, caminho_saida) -> Optional[Checkpoint]:
+    """
+    Retorna o checkpoint da execução interrompida, ou None se não houver estado
+    reaproveitável (primeira execução, entrada alterada, parcial ausente ou menor que o registrado).
+    """
+    try:
+        with open(caminho_checkpoint(caminho_saida), 'r', encoding='utf-8') as file:
+            dados = json.load(file)
+        checkpoint = Checkpoint(**dados)
+    except (FileNotFoundError, json.JSONDecodeError, TypeError):
+        return None
+
+    parcial = caminho_parcial(caminho_saida)
+    if (checkpoint.versao != VERSAO_CHECKPOINT
+            or checkpoint.entrada != os.path.abspath(caminho_entrada)
+            or checkpoint.impressao != impressao_digital(caminho_entrada)
+            or not os.path.exists(parcial)
+            or os.path.getsize(parcial) < checkpoint.tamanho_saida):
+        return None
+    return checkpoint
+
+def _ler_cabecalho(caminho_entrada, encoding: str, usar_mmap: bool):
+    """Returns: (colunas, offset do primeiro byte após o cabeçalho)"""
+    if usar_mmap:
+        cabecalho, inicio = ler_cabecalho_mmap(caminho_entrada, encoding)
+    else:
+        with abrir_binario(caminho_entrada) as file:
+            linha = file.readline()
+        cabecalho, inicio = linha.decode(encoding), len(linha)
+    return cabecalho.strip().split(','), inicio
+
+def _limpar_a_partir_do_checkpoint(checkpoint: Checkpoint, caminho_entrada, caminho_saida, chunk_size: int,
+                                   verbose: bool, medidor: MedidorEtapas, usar_mmap: bool, parser: str) -> int:
+    """Limpa a entrada a partir de checkpoint.offset_entrada, anexando ao parcial e atualizando o checkpoint"""
+    parcial = caminho_parcial(caminho_saida)
+    arquivo_checkpoint = caminho_checkpoint(caminho_saida)
+    contadores = Counter(checkpoint.contadores)
+    anexar = checkpoint.tamanho_saida > 0
+    if anexar:
+        # Descarta o que foi gravado depois do último checkpoint (chunk interrompido no meio)
+        os.truncate(parcial, checkpoint.tamanho_saida)
+
+    # Offset da entrada correspondente ao último bloco entregue ao limpador
+    pendente = checkpoint.offset_entrada
+
+    def blocos(fonte):
+        nonlocal pendente
+        for texto, fim in fonte:
+            pendente = fim
+            yield texto
+
+    def registrar(escritor, linhas: int):
+        with medidor.etapa('checkpoint'):
+            checkpoint.tamanho_saida = escritor.sincronizar()
+            checkpoint.offset_entrada = pendente
+            checkpoint.total_linhas += linhas
+            checkpoint.contadores = dict(contadores)
+            checkpoint.salvar(arquivo_checkpoint)
+
+    inicio = checkpoint.offset_entrada
+    # As linhas por encoding (codec misto) entram nos contadores, e portanto no checkpoint
+    with contar_linhas(contadores):
+        if usar_mmap:
+            tamanho_bloco = max(1, int(chunk_size * bytes_por_linha(caminho_entrada, inicio)))
+            fonte = iterar_blocos_mmap_com_offset(caminho_entrada, checkpoint.encoding, inicio,
+                                                  tamanho_bloco=tamanho_bloco)
+            data_cleaner.limpar_blocos_em_chunks(blocos(fonte), checkpoint.colunas, parcial, contadores, verbose,
+                                                 medidor=medidor, anexar=anexar, ao_gravar=registrar,
+                                                 parser=parser)
+        else:
+            with abrir_binario(caminho_entrada) as file:
+                if file.seekable():
+                    file.seek(inicio)
+                else:
+                    file.read(inicio)
+                tamanho_bloco = max(1, int(chunk_size * bytes_por_linha_stream(file)))
+                fonte = iterar_blocos_stream(file, checkpoint.encoding, inicio, tamanho_bloco)
+                data_cleaner.limpar_blocos_em_chunks(blocos(fonte), checkpoint.colunas, parcial, contadores, verbose,
+                                                     medidor=medidor, anexar=anexar, ao_gravar=registrar,
+                                                     parser=parser)
+
+    if verbose:
+        data_cleaner.imprimir_contadores(contadores)
+    return checkpoint.total_linhas
+
+def limpar_com_checkpoint(caminho_entrada, caminho_saida, chunk_size: int = data_cleaner.CHUNK_SIZE_PADRAO,
+                          verbose: bool = False, medidor: MedidorEtapas = None, usar_mmap: bool = True,
+                          parser: str = PARSER_PADRAO) -> int:
+    """
+    Como clean_file_streaming, mas retomável: se houver um checkpoint válido de uma
+    execução interrompida com a mesma entrada, continua de onde ela parou.
+    A saída precisa ser CSV sem compressão (o parcial é truncado/anexado em bytes).
+    Returns: total de produtos gravados
+    """
+    if formato_do_caminho(caminho_saida) != 'csv' or compressao_do_caminho(caminho_saida):
+        raise ValueError("--checkpoint requer saída .csv sem compressão")
+    medidor = medidor or MedidorEtapas(ativo=False)
+    usar_mmap = usar_mmap and not compressao_do_caminho(caminho_entrada) and mmap_disponivel(caminho_entrada)
+
+    checkpoint = carregar_checkpoint(caminho_entrada, caminho_saida)
+    with medidor.etapa('detectar'):
+        candidatos = data_cleaner.encodings_para_testar(caminho_entrada, verbose)
+    if checkpoint is not None:
+        candidatos = [checkpoint.encoding] + [encoding for encoding in candidatos if encoding != checkpoint.encoding]
+        print(f"♻️ Retomando do checkpoint: byte {checkpoint.offset_entrada:,} da entrada "
+              f"({checkpoint.total_linhas} produtos já gravados)")
+
+    for encoding in candidatos:
+        try:
+            if verbose:
+                print(f"🔍 Tentando encoding: {encoding}")
+            if checkpoint is None:
+                colunas, inicio = _ler_cabecalho(caminho_entrada, encoding, usar_mmap)
+                checkpoint = Checkpoint(os.path.abspath(caminho_entrada), impressao_digital(caminho_entrada),
+                                        encoding, colunas, offset_entrada=inicio)
+            total = _limpar_a_partir_do_checkpoint(checkpoint, caminho_entrada, caminho_saida, chunk_size,
+                                                   verbose, medidor, usar_mmap, parser)
+            break
+        except UnicodeDecodeError as e:
+            if verbose:
+                print(f"❌ Erro com {encoding}: {e}")
+            # O parcial desta tentativa não serve para as próximas
+            checkpoint = None
+            if os.path.exists(caminho_checkpoint(caminho_saida)):
+                os.remove(caminho_checkpoint(caminho_saida))
+            continue
+    else:
+        raise ValueError(f"Nenhum encoding funcionou para o arquivo: {caminho_entrada}")
+
+    os.replace(caminho_parcial(caminho_saida), caminho_saida)
+    os.remove(caminho_checkpoint(caminho_saida))
+    return total
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+🔌 GoParts Circuit Breaker
+Disjuntor para o APIClient: quando a API está fora do ar, para de enviar em vez
+de gastar todas as tentativas de cada produto.
+- Fechado: requisições passam; abre após `falhas_consecutivas` 5xx/timeouts
+  seguidos, ou quando a proporção de falhas nas últimas `janela` requisições
+  chega a `limiar_falhas`
+- Aberto: nenhuma requisição sai; quem tenta recebe CircuitoAberto com o tempo
+  restante de `cooldown` e volta para a fila de retries (sem gastar tentativa)
+- Meio-aberto: passado o cooldown, uma única requisição de sonda é liberada; se
+  ela der certo o circuito fecha, senão abre de novo por mais um cooldown
+Após `max_sondas` sondas seguidas com falha, a API é considerada fora do ar e
+os envios falham de vez (CircuitoAberto com desistiu=True).
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass
+
+FECHADO = 'fechado'
+ABERTO = 'aberto'
+MEIO_ABERTO = 'meio-aberto'
+
+@dataclass
+class ConfigDisjuntor:
+    """Limiares e tempos do disjuntor (segundos)"""
+    falhas_consecutivas: int = 10
+    janela: int = 20
+    limiar_falhas: float = 0.8
+    cooldown: float = 10.0
+    # Espera de quem chega enquanto a sonda está em andamento
+    espera_sonda: float = 1.0
+    # Sondas seguidas com falha antes de desistir (0: nunca desiste)
+    max_sondas: int = 5
+
+    def __post_init__(self):
+        if self.falhas_consecutivas < 1 or self.janela < 1:
+            raise ValueError("falhas_consecutivas e janela devem ser >= 1")
+        if not 0 < self.limiar_falhas <= 1:
+            raise ValueError("limiar_falhas deve estar entre 0 e 1")
+        if self.cooldown <= 0:
+            raise ValueError("cooldown deve ser > 0")
+
+class CircuitoAberto(Exception):
+    """Requisição recusada pelo disjuntor sem ser enviada"""
+
+    def __init__(self, espera: float, desistiu: bool = False):
+        self.espera = espera
+        self.desistiu = desistiu
+        motivo = "API considerada fora do ar" if desistiu else f"nova tentativa em {espera:.1f}s"
+        super().__init__(f"Circuito aberto: {motivo}")
+
+class Disjuntor:
+    """Disjuntor fechado/aberto/meio-aberto (seguro entre threads)"""
+
+    def __init__(self, config: ConfigDisjuntor = None, stats=None):
+        self.config = config or ConfigDisjuntor()
+        self.stats = stats
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self.estado = FECHADO
+        # Últimas requisições: True = 5xx/timeout
+        self._recentes = deque(maxlen=self.config.janela)
+        self._consecutivas = 0
+        self._aberto_ate = 0.0
+        self._sondando = False
+        self._sondas_falhas = 0
+        self.aberturas = 0
+        self.recusadas = 0
+        self._publicar()
+
+    @property
+    def desistiu(self) -> bool:
+        return bool(self.config.max_sondas) and self._sondas_falhas >= self.config.max_sondas
+
+    def _publicar(self):
+        if self.stats is not None:
+            self.stats.circuit_state = self.estado
+            self.stats.circuit_opens = self.aberturas
+            self.stats.fast_failures = self.recusadas
+
+    def _recusar(self, espera: float, desistiu: bool = False):
+        self.recusadas += 1
+        self._publicar()
+        raise CircuitoAberto(espera, desistiu)
+
+    def verificar(self):
+        """Antes de cada requisição: retorna se ela pode sair, senão levanta CircuitoAberto"""
+        with self._lock:
+            if self.estado == FECHADO:
+                return
+            if self.desistiu:
+                self._recusar(0.0, desistiu=True)
+            agora = time.monotonic()
+            if self.estado == ABERTO:
+                if agora < self._aberto_ate:
+                    self._recusar(self._aberto_ate - agora)
+                self.estado = MEIO_ABERTO
+                self.logger.info("🔌 Circuito meio-aberto: enviando uma requisição de sonda")
+            if self._sondando:
+                self._recusar(self.config.espera_sonda)
+            # Esta requisição é a sonda
+            self._sondando = True
+            self._publicar()
+
+    def _abrir(self, motivo: str):
+        self.estado = ABERTO
+        self._aberto_ate = time.monotonic() + self.config.cooldown
+        self._sondando = False
+        self._recentes.clear()
+        self._consecutivas = 0
+        self.aberturas += 1
+        self._publicar()
+        self.logger.warning(f"🔌 Circuito aberto ({motivo}): envios suspensos por {self.config.cooldown:g}s")
+
+    def registrar_sucesso(self):
+        """A API respondeu (qualquer status que não seja de sobrecarga)"""
+        with self._lock:
+            self._recentes.append(False)
+            self._consecutivas = 0
+            if self.estado == MEIO_ABERTO and self._sondando:
+                self.estado = FECHADO
+                self._sondando = False
+                self._sondas_falhas = 0
+                self._publicar()
+                self.logger.info("🔌 Circuito fechado: a sonda teve sucesso, envios retomados")
+
+    def registrar_falha(self):
+        """5xx/timeout/erro de conexão"""
+        with self._lock:
+            if self.estado == MEIO_ABERTO:
+                if self._sondando:
+                    self._sondas_falhas += 1
+                    self._abrir(f"sonda falhou, {self._sondas_falhas}ª seguida")
+                    if self.desistiu:
+                        self.logger.error(f"❌ {self._sondas_falhas} sondas seguidas falharam: API considerada fora do ar")
+                return
+            if self.estado == ABERTO:
+                return
+            self._recentes.append(True)
+            self._consecutivas += 1
+            falhas = sum(self._recentes)
+            if self._consecutivas >= self.config.falhas_consecutivas:
+                self._abrir(f"{self._consecutivas} falhas seguidas")
+            elif (len(self._recentes) == self.config.janela
+                  and falhas >= self.config.limiar_falhas * len(self._recentes)):
+                self._abrir(f"{falhas} falhas nas últimas {len(self._recentes)} requisições")
+
+    def liberar(self):
+        """A requisição terminou sem resultado sobre a API (ex: erro local): libera a sonda"""
+        with self._lock:
+            if self.estado == MEIO_ABERTO:
+                self._sondando = False
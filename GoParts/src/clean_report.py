@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+📝 GoParts Clean Report
+Relatório resumido da limpeza: totais calculados a partir dos contadores das regras
+(linhas reparadas, NaN corrigidos, preços reformatados, estoques zerados, linhas por
+encoding em arquivos mistos) e uma pequena amostra aleatória das mesmas linhas antes
+e depois. O custo de exibição não depende do tamanho da entrada (ao contrário de
+imprimir o DataFrame inteiro).
+"""
+
+from collections import Counter
+
+from mixed_encoding import PREFIXO_CONTADOR
+
+import numpy as np
+import pandas as pd
+
+# Linhas da amostra antes/depois
+AMOSTRA_PADRAO = 5
+# Arquivos até este tamanho são exibidos inteiros (ex: o arquivo de exemplo)
+LIMITE_TABELA_COMPLETA = 30
+
+# Contadores que compõem cada total do resumo
+CONTADORES_NAN = ['preco_nulo', 'estoque_vazio']
+CONTADORES_PRECO_REFORMATADO = ['preco_prefixo_rs', 'preco_formato_brasileiro', 'preco_virgula_decimal']
+CONTADORES_ESTOQUE_PADRAO = ['estoque_invalido', 'estoque_vazio', 'estoque_nao_numerico']
+
+def escolher_amostra(total: int, tamanho: int = AMOSTRA_PADRAO, semente: int = None) -> np.ndarray:
+    """Posições (ordenadas) das linhas da amostra; todas se o arquivo for pequeno"""
+    if total <= max(tamanho, LIMITE_TABELA_COMPLETA):
+        return np.arange(total)
+    # Sem reposição e sem pesos, o Generator sorteia em tempo proporcional ao tamanho da amostra
+    return np.sort(np.random.default_rng(semente).choice(total, size=tamanho, replace=False))
+
+def _somar(contadores: Counter, chaves) -> int:
+    return sum(contadores.get(chave, 0) for chave in chaves)
+
+def resumir_contadores(contadores: Counter) -> dict:
+    """Totais do resumo a partir dos contadores das regras de reparo/normalização"""
+    return {
+        'linhas_reparadas': sum(total for chave, total in contadores.items() if chave.startswith('reparo_')),
+        'nan_corrigidos': _somar(contadores, CONTADORES_NAN),
+        'precos_reformatados': _somar(contadores, CONTADORES_PRECO_REFORMATADO),
+        'precos_invalidos': contadores.get('preco_erro_conversao', 0),
+        'estoques_zerados': _somar(contadores, CONTADORES_ESTOQUE_PADRAO),
+        'duplicados_removidos': contadores.get('dedup_removidas', 0),
+        'linhas_por_encoding': {chave[len(PREFIXO_CONTADOR):]: total for chave, total in sorted(contadores.items())
+                                if chave.startswith(PREFIXO_CONTADOR)},
+    }
+
+def imprimir_amostra(titulo: str, amostra: pd.DataFrame, total: int):
+    """Exibe a amostra (o índice é a posição da linha no arquivo)"""
+    if len(amostra) == total:
+        print(f"\n{titulo} ({total} produtos):")
+    else:
+        print(f"\n{titulo} (amostra de {len(amostra)} de {total} produtos):")
+    print(amostra.to_string())
+
+def imprimir_resumo(contadores: Counter, total_entrada: int, total_saida: int):
+    """Exibe os totais da limpeza"""
+    resumo = resumir_contadores(contadores)
+    print("\n📝 Resumo da limpeza:")
+    print(f"  • Produtos lidos: {total_entrada}")
+    if len(resumo['linhas_por_encoding']) > 1:
+        # Arquivo misto: linhas lidas como UTF-8 e pelo encoding legado
+        por_encoding = ', '.join(f"{encoding} {total}" for encoding, total in resumo['linhas_por_encoding'].items())
+        print(f"  • Linhas por encoding: {por_encoding}")
+    print(f"  • Linhas reparadas: {resumo['linhas_reparadas']}")
+    print(f"  • NaN/nulos corrigidos: {resumo['nan_corrigidos']}")
+    print(f"  • Preços reformatados: {resumo['precos_reformatados']}")
+    if resumo['precos_invalidos']:
+        print(f"  • Preços inválidos (→ 0.0): {resumo['precos_invalidos']}")
+    print(f"  • Estoques inválidos (→ 0): {resumo['estoques_zerados']}")
+    if resumo['duplicados_removidos']:
+        print(f"  • Duplicados removidos: {resumo['duplicados_removidos']}")
+    print(f"  • Produtos na saída: {total_saida}")
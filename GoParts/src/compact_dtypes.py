@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+🗜️ GoParts Compact Dtypes
+Reduz a memória do catálogo limpo convertendo as colunas para dtypes compactos:
+- texto com muitos valores repetidos (ex: nome_produto) → category
+- sufixo de região do codigo (K12345BR → BR) → coluna `regiao` category
+  (só em memória: clean_file grava as colunas originais)
+- preco → float32 quando os centavos são preservados; estoque → int32 quando cabe
+"""
+
+import numpy as np
+import pandas as pd
+
+# Colunas de texto viram category quando distintos/total fica abaixo deste limite
+LIMITE_CATEGORIA = 0.5
+
+# Sufixo de região no final do codigo (duas letras)
+PADRAO_REGIAO = r'([A-Za-z]{2})$'
+COLUNA_REGIAO = 'regiao'
+
+def uso_memoria(df: pd.DataFrame) -> pd.Series:
+    """Bytes por coluna (memory_usage deep, incluindo o índice)"""
+    return df.memory_usage(deep=True)
+
+def _compactar_texto(serie: pd.Series, limite_categoria: float) -> pd.Series:
+    if len(serie) and serie.nunique(dropna=False) / len(serie) <= limite_categoria:
+        return serie.astype('category')
+    return serie
+
+def _compactar_preco(serie: pd.Series) -> pd.Series:
+    """float32 só quando todos os valores continuam iguais até o centavo"""
+    reduzida = serie.astype(np.float32)
+    if np.array_equal(np.round(reduzida.to_numpy(np.float64), 2), np.round(serie.to_numpy(np.float64), 2)):
+        return reduzida
+    return serie
+
+def _compactar_inteiro(serie: pd.Series) -> pd.Series:
+    limites = np.iinfo(np.int32)
+    if serie.empty or (serie.min() >= limites.min and serie.max() <= limites.max):
+        return serie.astype(np.int32)
+    return serie
+
+def compactar_dtypes(df: pd.DataFrame, limite_categoria: float = LIMITE_CATEGORIA,
+                     verbose: bool = False, incluir_regiao: bool = True) -> pd.DataFrame:
+    """
+    Retorna uma cópia do catálogo com dtypes compactos.
+    Com incluir_regiao (padrão), adiciona a coluna `regiao` (category) extraída do sufixo do codigo.
+    Com verbose, imprime o uso de memória antes/depois por coluna.
+    """
+    antes = uso_memoria(df) if verbose else None
+    compacto = df.copy()
+
+    if incluir_regiao and 'codigo' in compacto.columns and COLUNA_REGIAO not in compacto.columns:
+        regiao = compacto['codigo'].astype('string').str.extract(PADRAO_REGIAO, expand=False)
+        compacto[COLUNA_REGIAO] = regiao.str.upper().astype('category')
+
+    for coluna in compacto.columns:
+        serie = compacto[coluna]
+        if coluna == 'preco' and pd.api.types.is_float_dtype(serie):
+            compacto[coluna] = _compactar_preco(serie)
+        elif pd.api.types.is_integer_dtype(serie):
+            compacto[coluna] = _compactar_inteiro(serie)
+        elif serie.dtype == object:
+            compacto[coluna] = _compactar_texto(serie, limite_categoria)
+
+    if verbose:
+        imprimir_relatorio_memoria(antes, uso_memoria(compacto), compacto.dtypes)
+    return compacto
+
+def _formatar_bytes(tamanho: float) -> str:
+    for unidade in ['B', 'KB', 'MB']:
+        if tamanho < 1024:
+            return f"{tamanho:,.1f} {unidade}"
+        tamanho /= 1024
+    return f"{tamanho:,.2f} GB"
+
+def imprimir_relatorio_memoria(antes: pd.Series, depois: pd.Series, dtypes: pd.Series = None):
+    """Imprime a memória por coluna antes e depois da compactação"""
+    print("\n🗜️ Uso de memória (memory_usage deep):")
+    for coluna in depois.index:
+        dtype = f" [{dtypes[coluna]}]" if dtypes is not None and coluna in dtypes else ""
+        origem = _formatar_bytes(antes[coluna]) if coluna in antes else "nova"
+        print(f"  • {coluna}{dtype}: {origem} → {_formatar_bytes(depois[coluna])}")
+
+    total_antes, total_depois = antes.sum(), depois.sum()
+    variacao = 100 * (total_depois / total_antes - 1) if total_antes else 0.0
+    print(f"  📦 Total: {_formatar_bytes(total_antes)} → {_formatar_bytes(total_depois)} ({variacao:+.0f}%)")
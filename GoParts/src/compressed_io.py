@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+🗜️ GoParts Compressed I/O
+Leitura e gravação transparentes de arquivos comprimidos (.gz, .bz2, .zst) como
+streams, sem descomprimir para o disco. A compressão é escolhida pela extensão
+(produtos.csv.gz → CSV com gzip). gzip e bz2 vêm da biblioteca padrão; zstd usa
+o pacote opcional `zstandard` (ou compression.zstd, no Python 3.14+).
+"""
+
+import io
+import os
+import bz2
+import gzip
+
+# Extensão → compressão
+COMPRESSOES = {
+    '.gz': 'gzip',
+    '.bz2': 'bz2',
+    '.zst': 'zstd',
+}
+
+# Nível do gzip na gravação (o padrão 9 é várias vezes mais lento e comprime pouco mais)
+NIVEL_GZIP = 6
+
+def compressao_do_caminho(caminho):
+    """Retorna 'gzip', 'bz2', 'zstd' ou None conforme a extensão"""
+    return COMPRESSOES.get(os.path.splitext(str(caminho))[1].lower())
+
+def caminho_sem_compressao(caminho) -> str:
+    """Remove a extensão de compressão: produtos.csv.gz → produtos.csv"""
+    caminho = str(caminho)
+    return os.path.splitext(caminho)[0] if compressao_do_caminho(caminho) else caminho
+
+def caminho_irmao(caminho, extensao: str) -> str:
+    """Arquivo auxiliar ao lado do catálogo, sem a extensão dele: produtos.csv.gz + '.prof' → produtos.prof"""
+    return os.path.splitext(caminho_sem_compressao(caminho))[0] + extensao
+
+def _abrir_zstd(caminho, modo: str):
+    try:
+        import zstandard
+    except ImportError:
+        zstandard = None
+
+    if zstandard is not None:
+        if 'r' in modo:
+            leitor = zstandard.ZstdDecompressor().stream_reader(open(caminho, 'rb'), read_across_frames=True,
+                                                               closefd=True)
+            return io.BufferedReader(leitor)
+        return zstandard.ZstdCompressor().stream_writer(open(caminho, 'wb'), closefd=True)
+
+    try:
+        from compression import zstd  # Python 3.14+
+    except ImportError:
+        raise ImportError("Arquivos .zst requerem zstandard: pip install zstandard")
+    return zstd.open(caminho, modo)
+
+def abrir_binario(caminho, modo: str = 'rb'):
+    """Abre o arquivo em modo binário ('rb' ou 'wb'), (des)comprimindo conforme a extensão"""
+    compressao = compressao_do_caminho(caminho)
+    if compressao == 'gzip':
+        return gzip.open(caminho, modo, compresslevel=NIVEL_GZIP) if 'w' in modo else gzip.open(caminho, modo)
+    if compressao == 'bz2':
+        return bz2.open(caminho, modo)
+    if compressao == 'zstd':
+        return _abrir_zstd(caminho, modo)
+    return open(caminho, modo)
+
+def abrir_texto(caminho, modo: str = 'r', encoding: str = 'utf-8', newline: str = None):
+    """Abre o arquivo em modo texto ('r' ou 'w'), (des)comprimindo conforme a extensão"""
+    if not compressao_do_caminho(caminho):
+        return open(caminho, modo, encoding=encoding, newline=newline)
+    return io.TextIOWrapper(abrir_binario(caminho, modo.replace('t', '') + 'b'), encoding=encoding,
+                            newline=newline)
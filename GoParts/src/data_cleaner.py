@@ -1,141 +1,590 @@
 import pandas as pd
+import numpy as np
 import os
-import chardet  # Importação direta do chardet para detecção automática (não manual)
+import sys
+import time
+import argparse
+import codecs
+from chardet.universaldetector import UniversalDetector  # Detecção automática e incremental (não manual)
 import io
+import itertools
+from collections import Counter
 
-print("✅ Chardet disponível - usando detecção automática de encoding")
+from encoding_cache import EncodingCache, impressao_digital
+from compressed_io import abrir_binario, abrir_texto, compressao_do_caminho
+from mmap_reader import bytes_por_linha, iterar_blocos_mmap, ler_cabecalho_mmap, mmap_disponivel
+from catalog_io import EscritorCatalogo, salvar_catalogo, caminho_com_formato
+from compact_dtypes import compactar_dtypes
+from dedup import POLITICAS, deduplicar, deduplicar_arquivo
+from row_repair import MotorReparo, dividir_texto
+from parse_engine import PARSER_PADRAO, PARSERS, parsear_csv
+from mixed_encoding import amostra_para_deteccao, contar_linhas, encoding_misto_para
+from clean_report import AMOSTRA_PADRAO, escolher_amostra, imprimir_amostra, imprimir_resumo
+from stage_metrics import MedidorEtapas, caminho_metricas, caminho_perfil, perfilar
+
+# Tamanho padrão do chunk (linhas) no modo streaming
+CHUNK_SIZE_PADRAO = 100_000
+
+# Tamanho dos blocos lidos pelo detector incremental de encoding
+TAMANHO_BLOCO_DETECCAO = 64 * 1024
+# Limite de bytes analisados quando o detector não chega a uma conclusão
+LIMITE_BYTES_DETECCAO = 1024 * 1024
+
+_cache_encodings = EncodingCache()
+
+# Motor de reparo usado por reparar_linha()
+_motor_reparo_padrao = MotorReparo()
 
 # Função para detectar encoding do arquivo
-def detectar_encoding(caminho_arquivo):
+def detectar_encoding(caminho_arquivo, verbose: bool = True, usar_cache: bool = True):
     """
     Detecta o encoding de um arquivo usando chardet (detecção automática)
+    Lê blocos até o detector ter confiança suficiente, sem varrer o arquivo todo.
+    Em blocos que misturam UTF-8 e um legado, o detector só vê as linhas do legado.
+    O resultado fica em cache, indexado por tamanho + mtime + hash do início do arquivo.
+    Arquivos .gz/.bz2/.zst são analisados já descomprimidos.
+    """
+    with abrir_binario(caminho_arquivo) as file:
+        cabeca = file.read(TAMANHO_BLOCO_DETECCAO)
+        chave = impressao_digital(caminho_arquivo, cabeca)
+
+        if usar_cache:
+            encoding_em_cache = _cache_encodings.get(chave)
+            if encoding_em_cache:
+                if verbose:
+                    print(f"   📊 Encoding em cache: {encoding_em_cache}")
+                return encoding_em_cache
+
+        if verbose:
+            print("🔍 Usando chardet para detecção automática...")
+        detector = UniversalDetector()
+        bloco, bytes_lidos = cabeca, 0
+        while bloco and not detector.done and bytes_lidos < LIMITE_BYTES_DETECCAO:
+            detector.feed(amostra_para_deteccao(bloco))
+            bytes_lidos += len(bloco)
+            bloco = file.read(TAMANHO_BLOCO_DETECCAO)
+        detector.close()
+
+    encoding_detectado = detector.result['encoding']
+    confianca = detector.result['confidence']
+    if verbose:
+        print(f"   📊 Encoding detectado: {encoding_detectado} (confiança: {confianca:.2%}, {bytes_lidos} bytes analisados)")
+
+    # ASCII é subconjunto de UTF-8: evita falhar em acentos depois do trecho analisado
+    if encoding_detectado == 'ascii':
+        encoding_detectado = 'utf-8'
+    if usar_cache and encoding_detectado:
+        _cache_encodings.set(chave, encoding_detectado)
+    return encoding_detectado
+
+def reparar_linha(linha: str) -> str:
+    """Corrige uma linha malformada com as regras registradas em row_repair"""
+    return _motor_reparo_padrao.reparar(linha)
+
+# Representações textuais de valor ausente no preço
+TOKENS_NULOS_PRECO = ["nan", "none", "null", "n/a", "na"]
+
+# Valores inválidos para o estoque (incluindo todas as representações de NaN)
+VALORES_INVALIDOS_ESTOQUE = ['None', 'n/a', 'N/A', 'nan', 'NaN', 'null', 'NULL', 'na', 'NA', -1, '-1', '', ' ']
+_INVALIDOS_NUMERICOS_ESTOQUE = [v for v in VALORES_INVALIDOS_ESTOQUE if not isinstance(v, str)]
+
+# Contadores das regras de texto do preço (bit i de _normalizar_preco_texto → REGRAS_PRECO[i])
+REGRAS_PRECO = ('preco_nulo', 'preco_prefixo_rs', 'preco_formato_brasileiro', 'preco_virgula_decimal',
+                'preco_erro_conversao')
+_NULO, _PREFIXO_RS, _BRASILEIRO, _VIRGULA, _ERRO = (1 << i for i in range(len(REGRAS_PRECO)))
+
+# Linhas do início da coluna usadas para decidir se vale agrupar os valores distintos
+AMOSTRA_DISTINTOS = 50_000
+# Proporção de valores distintos na amostra acima da qual as regras rodam direto em cada linha
+LIMITE_DISTINTOS = 0.9
+
+def _fatorar(serie: pd.Series):
+    """
+    Retorna (codigos, distintos, pesos): as regras rodam uma vez por valor distinto e o
+    resultado volta para as linhas por codigos (-1 = NaN); pesos conta as linhas de cada valor.
+    Se nem a amostra do início da coluna repete valores, o hash da coluna inteira não se paga:
+    cada linha vira o próprio valor "distinto".
+    """
+    amostra = serie.iloc[:AMOSTRA_DISTINTOS]
+    if len(serie) > AMOSTRA_DISTINTOS and amostra.nunique(dropna=False) > LIMITE_DISTINTOS * len(amostra):
+        codigos = np.arange(len(serie))
+        codigos[serie.isna().to_numpy()] = -1
+        distintos = serie.to_numpy(dtype=object)
+    else:
+        codigos, distintos = pd.factorize(serie)
+    return codigos, distintos, np.bincount(codigos[codigos >= 0], minlength=len(distintos))
+
+def _normalizar_preco_texto(valor):
+    """Regras do preço para um valor de texto. Returns: (preço, bits das REGRAS_PRECO aplicadas)"""
+    s = str(valor).strip()
+    # Caminho rápido: a maioria dos preços já é um número (a exceção do float() custa caro)
+    if 'R$' not in s and ',' not in s:
+        try:
+            preco = float(s)
+            if preco == preco:
+                return preco, 0
+        except ValueError:
+            pass
+
+    if not s or s.lower() in TOKENS_NULOS_PRECO:
+        return 0.0, _NULO
+
+    # Remove R$ e espaços
+    regras = _PREFIXO_RS if 'R$' in s else 0
+    s = s.replace('R$', '').replace(' ', '')
+
+    # Corrige formato brasileiro: 1.250,00 -> 1250.00 e vírgula decimal: 100,50 -> 100.50
+    if ',' in s:
+        regras |= _BRASILEIRO if '.' in s else _VIRGULA
+        s = s.replace('.', '').replace(',', '.') if '.' in s else s.replace(',', '.')
+
+    try:
+        preco = float(s)
+    except ValueError:
+        return 0.0, regras | _ERRO
+    return (preco, regras) if preco == preco else (0.0, regras | _ERRO)
+
+def normalizar_precos(serie: pd.Series, contadores: Counter = None) -> pd.Series:
+    """
+    Normaliza a coluna de preço (as regras de texto rodam uma vez por valor distinto)
+    Aceita: R$ 100, 1.250,00 (formato brasileiro), 100,50 (vírgula decimal), 100.50
+    Valores nulos, vazios ou não numéricos viram 0.0
+    """
+    contadores = contadores if contadores is not None else Counter()
+
+    # Coluna já numérica: só falta tratar os NaN
+    if pd.api.types.is_numeric_dtype(serie):
+        contadores['preco_nulo'] += int(serie.isna().sum())
+        return serie.astype(float).fillna(0.0)
+
+    codigos, distintos, pesos = _fatorar(serie)
+    contadores['preco_nulo'] += int((codigos < 0).sum())
+    precos, regras = np.zeros(len(distintos) + 1), np.zeros(len(distintos), dtype=np.int8)
+    for i, valor in enumerate(distintos):
+        precos[i], regras[i] = _normalizar_preco_texto(valor)
+    for bit, regra in enumerate(REGRAS_PRECO):
+        contadores[regra] += int(pesos[(regras & (1 << bit)) != 0].sum())
+
+    # Código -1 (NaN) aponta para o 0.0 do final
+    return pd.Series(precos[codigos], index=serie.index, name=serie.name)
+
+def normalizar_estoque(serie: pd.Series, contadores: Counter = None) -> pd.Series:
+    """Converte a coluna de estoque para inteiros, usando 0 para valores inválidos"""
+    contadores = contadores if contadores is not None else Counter()
+
+    # Coluna já numérica (o parser C lê None/n/a/vazio como NaN): só -1 e NaN viram 0
+    if pd.api.types.is_numeric_dtype(serie):
+        valores = serie.to_numpy()
+        invalidos = np.isin(valores, _INVALIDOS_NUMERICOS_ESTOQUE)
+        vazios = serie.isna().to_numpy()
+        contadores['estoque_invalido'] += int(invalidos.sum())
+        contadores['estoque_vazio'] += int(vazios.sum())
+        return pd.Series(np.where(invalidos | vazios, 0, valores), index=serie.index, name=serie.name).astype(int)
+
+    # Mesma estratégia do preço: valida cada valor distinto uma única vez
+    codigos, distintos, pesos = _fatorar(serie)
+    distintos = pd.Series(distintos, dtype=object)
+
+    invalidos = distintos.isin(VALORES_INVALIDOS_ESTOQUE)
+    # Converte para numérico, colocando 0 para valores que não conseguir converter
+    estoque = pd.to_numeric(distintos.mask(invalidos), errors='coerce')
+
+    contadores['estoque_invalido'] += int(pesos[invalidos.to_numpy()].sum())
+    contadores['estoque_vazio'] += int((codigos < 0).sum())
+    contadores['estoque_nao_numerico'] += int(pesos[(estoque.isna() & ~invalidos).to_numpy()].sum())
+
+    # Código -1 (NaN) aponta para o 0 acrescentado no final
+    normalizados = np.append(estoque.fillna(0).to_numpy(), 0)
+    return pd.Series(normalizados[codigos], index=serie.index, name=serie.name).astype(int)
+
+def limpar_chunk(df: pd.DataFrame, contadores: Counter = None) -> pd.DataFrame:
+    """Aplica a normalização de preço, estoque e nome em um bloco de linhas"""
+    df['preco'] = normalizar_precos(df['preco'], contadores)
+    df['estoque'] = normalizar_estoque(df['estoque'], contadores)
+    df['nome_produto'] = df['nome_produto'].str.strip()
+    return df
+
+def imprimir_contadores(contadores: Counter):
+    """Exibe quantas vezes cada regra de normalização foi aplicada"""
+    print("\n📋 Regras de normalização aplicadas:")
+    for regra, total in sorted(contadores.items()):
+        if total:
+            print(f"  • {regra}: {total}")
+
+def _agrupar_linhas(linhas, chunk_size: int):
+    """Gera listas de até chunk_size linhas"""
+    bloco = []
+    for linha in linhas:
+        bloco.append(linha)
+        if len(bloco) >= chunk_size:
+            yield bloco
+            bloco = []
+    if bloco:
+        yield bloco
+
+def limpar_linhas_em_chunks(linhas, colunas, caminho_saida, chunk_size=CHUNK_SIZE_PADRAO,
+                            contadores: Counter = None, verbose: bool = True,
+                            incluir_cabecalho: bool = True, medidor: MedidorEtapas = None,
+                            parser: str = PARSER_PADRAO) -> int:
+    """
+    Repara, normaliza e grava um iterável de linhas (sem cabeçalho) em blocos de tamanho fixo.
+    Apenas um chunk fica em memória por vez, então o pico de memória não
+    depende do tamanho da entrada.
+    Returns: total de linhas gravadas
+    """
+    return limpar_blocos_em_chunks(_agrupar_linhas(linhas, chunk_size), colunas, caminho_saida,
+                                   contadores, verbose, incluir_cabecalho, medidor, parser=parser)
+
+def limpar_blocos_em_chunks(blocos, colunas, caminho_saida, contadores: Counter = None, verbose: bool = True,
+                            incluir_cabecalho: bool = True, medidor: MedidorEtapas = None,
+                            anexar: bool = False, ao_gravar=None, parser: str = PARSER_PADRAO) -> int:
+    """
+    Repara, normaliza e grava um chunk por bloco (sem cabeçalho). Cada bloco é uma lista
+    de linhas ou um texto com linhas inteiras (ex: de iterar_blocos_mmap).
+    anexar=True continua um CSV existente; ao_gravar(escritor, linhas) é chamado após
+    cada chunk gravado (ex: para registrar um checkpoint). parser: 'c' ou 'pyarrow' (ver parse_engine).
+    Returns: total de linhas gravadas
     """
-    print("🔍 Usando chardet para detecção automática...")
-    with open(caminho_arquivo, 'rb') as file:
-        raw_data = file.read(10000)  # Lê os primeiros 10KB
-        resultado = chardet.detect(raw_data)
-        encoding_detectado = resultado['encoding']
-        confianca = resultado['confidence']
-        print(f"   📊 Encoding detectado: {encoding_detectado} (confiança: {confianca:.2%})")
-        return encoding_detectado
+    total_linhas = 0
+    numero_chunk = 0
+    motor = MotorReparo(contadores=contadores)
+    medidor = medidor or MedidorEtapas(ativo=False)
+
+    def gravar_chunk(bloco):
+        nonlocal total_linhas, numero_chunk
+        inicio = time.perf_counter()
+        with medidor.etapa('reparar'):
+            if isinstance(bloco, str):
+                texto = motor.reparar_texto(bloco)
+            else:
+                texto = '\n'.join(motor.reparar_lista(bloco))
+        with medidor.etapa('parsear') as etapa:
+            if texto.strip():
+                df_chunk = parsear_csv(texto, colunas, parser)
+            else:
+                df_chunk = pd.DataFrame(columns=colunas)
+            etapa.linhas += len(df_chunk)
+        medidor.adicionar_linhas('reparar', len(df_chunk))
+        with medidor.etapa('normalizar') as etapa:
+            df_chunk = limpar_chunk(df_chunk, contadores)
+            etapa.linhas += len(df_chunk)
+
+        # Primeiro chunk cria o arquivo (com cabeçalho/schema), os demais são anexados
+        with medidor.etapa('gravar') as etapa:
+            escritor.escrever(df_chunk)
+            etapa.linhas += len(df_chunk)
+
+        duracao = time.perf_counter() - inicio
+        numero_chunk += 1
+        total_linhas += len(df_chunk)
+        if ao_gravar is not None:
+            ao_gravar(escritor, len(df_chunk))
+        taxa = len(df_chunk) / duracao if duracao > 0 else 0.0
+        if verbose:
+            print(f"  📦 Chunk {numero_chunk}: {len(df_chunk)} linhas em {duracao:.2f}s ({taxa:,.0f} linhas/s)")
+
+    # O tempo de 'ler' é só o da leitura/decodificação das linhas: as etapas de cada chunk são descontadas
+    with EscritorCatalogo(caminho_saida, incluir_cabecalho, anexar) as escritor, \
+            medidor.etapa('ler') as etapa_leitura:
+        for bloco in blocos:
+            gravar_chunk(bloco)
+
+        # Entrada vazia: ainda cria o arquivo (com cabeçalho/schema)
+        if numero_chunk == 0:
+            gravar_chunk([])
+        etapa_leitura.linhas += total_linhas
+
+    if verbose:
+        motor.imprimir_tempos()
+    return total_linhas
+
+def limpar_em_chunks(caminho_entrada, caminho_saida, encoding, chunk_size=CHUNK_SIZE_PADRAO,
+                     contadores: Counter = None, verbose: bool = True, medidor: MedidorEtapas = None,
+                     usar_mmap: bool = True, parser: str = PARSER_PADRAO) -> int:
+    """
+    Limpa o arquivo em blocos de tamanho fixo, anexando cada bloco à saída.
+    Arquivos locais sem compressão são lidos via mmap, em blocos de ~chunk_size linhas
+    decodificados de uma vez (sem uma str por linha); os demais, linha a linha.
+    Returns: total de linhas gravadas
+    """
+    if usar_mmap and not compressao_do_caminho(caminho_entrada) and mmap_disponivel(caminho_entrada):
+        cabecalho, inicio = ler_cabecalho_mmap(caminho_entrada, encoding)
+        colunas = cabecalho.strip().split(',')
+        tamanho_bloco = max(1, int(chunk_size * bytes_por_linha(caminho_entrada, inicio)))
+        blocos = iterar_blocos_mmap(caminho_entrada, encoding, inicio, tamanho_bloco=tamanho_bloco)
+        return limpar_blocos_em_chunks(blocos, colunas, caminho_saida, contadores, verbose, medidor=medidor,
+                                       parser=parser)
+
+    with abrir_texto(caminho_entrada, 'r', encoding=encoding) as file:
+        colunas = file.readline().strip().split(',')
+        return limpar_linhas_em_chunks(file, colunas, caminho_saida, chunk_size, contadores, verbose,
+                                       medidor=medidor, parser=parser)
 
 # Define o diretório base do projeto
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 INPUT_FILE = os.path.join(BASE_DIR, 'data', 'input', 'produtos_bagunçados_latin1.csv')
 OUTPUT_FILE = os.path.join(BASE_DIR, 'data', 'output', 'produtos_limpos_utf8.csv')
 
-# Detecta o encoding usando chardet (automaticamente)
-encoding_detectado = detectar_encoding(INPUT_FILE)
-# Prioriza o encoding detectado, mas mantém outros como fallback
-encodings_para_testar = [encoding_detectado, 'utf-8', 'latin1', 'iso-8859-1']  
+def encodings_para_testar(caminho_arquivo, verbose: bool) -> list:
+    """
+    Prioriza o encoding detectado, mas mantém outros como fallback.
+    UTF-8 e encodings legados compatíveis com ASCII viram o codec misto (utf-8+<legado>):
+    cada linha é lida como UTF-8 e só as que falham usam o legado, então arquivos que
+    misturam os dois não falham nem corrompem os acentos.
+    A lista para em latin1, que decodifica qualquer sequência de bytes.
+    """
+    encoding_detectado = detectar_encoding(caminho_arquivo, verbose)
+    candidatos, nomes_vistos = [], set()
+    primeiro = encoding_misto_para(encoding_detectado) or encoding_detectado
+    for encoding in [primeiro, 'utf-8', 'latin1']:
+        try:
+            nome_canonico = codecs.lookup(encoding).name if encoding else None
+        except LookupError:
+            continue
+        if nome_canonico and nome_canonico not in nomes_vistos:
+            nomes_vistos.add(nome_canonico)
+            candidatos.append(encoding)
+        if nome_canonico == 'iso8859-1':
+            break
+    return candidatos
+
+def ler_texto(caminho_arquivo, verbose: bool = False, medidor: MedidorEtapas = None):
+    """
+    Lê e decodifica o arquivo inteiro.
+    Returns: (texto, encoding utilizado)
+    """
+    medidor = medidor or MedidorEtapas(ativo=False)
+    # Uma única leitura dos bytes: cada tentativa de encoding é só um decode em C,
+    # que falha logo no primeiro byte inválido, antes de qualquer reparo de linha
+    with medidor.etapa('ler'), abrir_binario(caminho_arquivo) as file:
+        dados = file.read()
+    return decodificar(dados, caminho_arquivo, verbose, medidor)
 
-for encoding in encodings_para_testar:
-    try:
-        print(f"🔍 Tentando encoding: {encoding}")
-        # Lê linha por linha para tratar inconsistências manualmente
-        linhas = []
-        with open(INPUT_FILE, 'r', encoding=encoding) as file:
-            for i, linha in enumerate(file):
-                if i == 0:  # Header
-                    linhas.append(linha.strip())
-                    continue
-                
-                # Divide a linha em campos
-                campos = linha.strip().split(',')
-                
-                # Se há mais de 4 campos, junta os extras no campo 'estoque'
-                if len(campos) > 4:
-                    # Mantém nome_produto, codigo, preco
-                    nome_produto = campos[0]
-                    codigo = campos[1] 
-                    preco = campos[2]
-                    # Junta todos os campos restantes como estoque (pega o último válido)
-                    estoque = campos[3] if campos[3].strip() else (campos[4] if len(campos) > 4 and campos[4].strip() else '')
-                    
-                    linha_corrigida = f"{nome_produto},{codigo},{preco},{estoque}"
-                    linhas.append(linha_corrigida)
-                else:
-                    linhas.append(linha.strip())
-        
-        # Agora cria o DataFrame a partir das linhas corrigidas
-        
-        csv_corrigido = '\n'.join(linhas)
-        df = pd.read_csv(io.StringIO(csv_corrigido))
-        
+def decodificar(dados: bytes, caminho_arquivo, verbose: bool = False, medidor: MedidorEtapas = None):
+    """
+    Decodifica bytes lidos de caminho_arquivo (o todo ou só algumas linhas) com o
+    primeiro encoding de encodings_para_testar que funcionar.
+    Returns: (texto, encoding utilizado)
+    """
+    medidor = medidor or MedidorEtapas(ativo=False)
+    with medidor.etapa('detectar'):
+        candidatos = encodings_para_testar(caminho_arquivo, verbose)
+
+    for encoding in candidatos:
+        try:
+            if verbose:
+                print(f"🔍 Tentando encoding: {encoding}")
+            with medidor.etapa('ler'):
+                return dados.decode(encoding), encoding
+        except UnicodeDecodeError as e:
+            if verbose:
+                print(f"❌ Erro com {encoding}: {e}")
+            continue
+
+    raise ValueError(f"Nenhum encoding funcionou para o arquivo: {caminho_arquivo}")
+
+def carregar_csv(caminho_arquivo, verbose: bool = False, motor: MotorReparo = None,
+                 medidor: MedidorEtapas = None, parser: str = PARSER_PADRAO):
+    """
+    Lê o CSV bagunçado, corrigindo as linhas malformadas com o motor de reparo
+    (parser='pyarrow' parseia o texto reparado com o leitor multi-thread do Arrow)
+    Returns: (DataFrame, encoding utilizado)
+    """
+    medidor = medidor or MedidorEtapas(ativo=False)
+    motor = motor or MotorReparo()
+    with contar_linhas(motor.contadores):
+        texto, encoding = ler_texto(caminho_arquivo, verbose, medidor)
+    if '\r' in texto:
+        with medidor.etapa('ler'):
+            texto = io.StringIO(texto, newline=None).read()
+
+    # O texto reparado vai direto para o parser, bloco a bloco, sem montar o CSV corrigido em memória
+    # (o tempo de reparo é descontado do tempo do parse)
+    fim_cabecalho = texto.find('\n') + 1 or len(texto)
+    cabecalho = texto[:fim_cabecalho].strip() + '\n'
+    blocos = medidor.medir_gerador('reparar', motor.reparar_blocos(dividir_texto(texto, fim_cabecalho)))
+    with medidor.etapa('parsear'):
+        df = parsear_csv(itertools.chain([cabecalho], blocos), parser=parser)
+    for etapa in ('ler', 'reparar', 'parsear'):
+        medidor.adicionar_linhas(etapa, len(df))
+
+    if verbose:
         print(f"✅ Arquivo carregado com encoding: {encoding}")
-        print(f"📊 Exemplo de nome: {df['nome_produto'].iloc[1]}")
-        break
-        
-    except (UnicodeDecodeError, FileNotFoundError) as e:
-        print(f"❌ Erro com {encoding}: {e}")
-        continue
-else:
-    print("❌ Nenhum encoding funcionou!")
-    exit()
-
-print(f"\n📊 Dados ANTES da limpeza ({len(df)} produtos):")
-print("Estrutura das colunas:", list(df.columns))
-print(df.to_string())
-
-def normalizar_preco(valor) -> float:
-    """Normaliza valores de preço em diferentes formatos"""
-    # Verifica se o valor é nulo, NaN ou vazio
-    if valor is None or pd.isna(valor) or valor == '':
-        return 0.0
-    
-    s = str(valor).strip()
-    # Verifica valores inválidos (incluindo representações de NaN)
-    if not s or s.lower() in {"nan", "none", "null", "n/a", "na"}:
-        return 0.0
-    
-    # Remove R$ e espaços
-    s = s.replace("R$", "").replace(" ", "")
-    
-    # Corrige formato brasileiro: 1.250,00 -> 1250.00
-    if "," in s and "." in s:
-        s = s.replace(".", "").replace(",", ".")
-        print(f"  🔄 Formato brasileiro: {valor} → {s}")
-    elif "," in s:
-        s = s.replace(",", ".")
-        print(f"  🔄 Vírgula decimal: {valor} → {s}")
-    
-    try:
-        return float(s)
-    except ValueError:
-        print(f"  ⚠️ Erro ao converter: {valor}")
-        return 0.0
-
-print("\n💰 Normalizando preços...")
-# Conta quantos NaN temos antes
-nan_count_preco = df['preco'].isna().sum()
-if nan_count_preco > 0:
-    print(f"  📊 Encontrados {nan_count_preco} valores NaN em preços - convertendo para 0.0")
-    
-df['preco'] = df['preco'].apply(normalizar_preco)
-
-print("\n📦 Limpando estoque...")
-# Conta quantos NaN temos antes
-nan_count_estoque = df['estoque'].isna().sum()
-if nan_count_estoque > 0:
-    print(f"  📊 Encontrados {nan_count_estoque} valores NaN em estoque - convertendo para 0")
+    return df, encoding
 
-# Valores inválidos para o estoque (incluindo todas as representações de NaN)
-valores_invalidos = ['None', 'n/a', 'N/A', 'nan', 'NaN', 'null', 'NULL', 'na', 'NA', -1, '-1', '', ' ']
-df['estoque'] = df['estoque'].replace(valores_invalidos, 0)
-# Preenche NaN com 0 (valores vazios no CSV)  
-df['estoque'] = df['estoque'].fillna(0)
-# Converte para numérico, colocando 0 para valores que não conseguir converter
-df['estoque'] = pd.to_numeric(df['estoque'], errors='coerce').fillna(0).astype(int)
+def clean_file(input_path=INPUT_FILE, output_path=None, verbose: bool = False,
+               compactar: bool = False, dedup: str = None, medidor: MedidorEtapas = None,
+               amostra: int = AMOSTRA_PADRAO, parser: str = PARSER_PADRAO) -> pd.DataFrame:
+    """
+    Limpa um CSV de produtos e retorna o DataFrame normalizado.
+    Se output_path for informado, também salva o resultado
+    (CSV UTF-8, ou Parquet/Feather pelas extensões .parquet/.feather).
+    Com compactar=True, converte para dtypes compactos, acrescenta a coluna `regiao` (category)
+    e imprime o uso de memória antes/depois; o arquivo gravado mantém as colunas originais.
+    dedup: política para codigos repetidos ('ultimo', 'somar-estoque', 'menor-preco', 'maior-preco').
+    medidor: MedidorEtapas que recebe o tempo/memória de cada etapa.
+    Com verbose, mostra um resumo com os totais de cada correção e `amostra` linhas aleatórias antes/depois.
+    parser: 'c' (padrão) ou 'pyarrow' (multi-thread, com fallback para o C).
+    """
+    contadores = Counter()
+    motor = MotorReparo(contadores=contadores)
+    medidor = medidor or MedidorEtapas(ativo=False)
+    df, encoding = carregar_csv(input_path, verbose, motor, medidor, parser)
+
+    # Resumo em vez do DataFrame inteiro: o custo de exibir não cresce com o arquivo
+    total_entrada = len(df)
+    if verbose:
+        print("Estrutura das colunas:", list(df.columns))
+        posicoes = escolher_amostra(total_entrada, amostra)
+        imprimir_amostra("📊 Dados ANTES da limpeza", df.iloc[posicoes].copy(), total_entrada)
+
+    with medidor.etapa('normalizar') as etapa:
+        df = limpar_chunk(df, contadores)
+        etapa.linhas += len(df)
+    if verbose:
+        amostra_depois = df.iloc[posicoes].copy()
+    if dedup:
+        with medidor.etapa('deduplicar') as etapa:
+            etapa.linhas += len(df)
+            df = deduplicar(df, dedup, contadores).reset_index(drop=True)
+
+    if verbose:
+        imprimir_contadores(contadores)
+        motor.imprimir_tempos()
 
-print("\n🏷️ Limpando nomes dos produtos...")
-df['nome_produto'] = df['nome_produto'].str.strip()
+    colunas_originais = list(df.columns)
+    if compactar:
+        with medidor.etapa('compactar') as etapa:
+            df = compactar_dtypes(df, verbose=True)
+            etapa.linhas += len(df)
 
-# Salva com encoding UTF-8 para preservar acentos
-df.to_csv(OUTPUT_FILE, index=False, encoding='utf-8-sig')
+    if output_path:
+        # Salva em UTF-8 (CSV) ou em formato colunar, conforme a extensão; colunas derivadas
+        # do compactar (regiao) ficam só no DataFrame retornado
+        with medidor.etapa('gravar') as etapa:
+            salvar_catalogo(df[colunas_originais], output_path)
+            etapa.linhas += len(df)
+
+    if verbose:
+        print("\n" + "=" * 60)
+        imprimir_amostra("🔍 Dados DEPOIS da limpeza", amostra_depois, total_entrada)
+        imprimir_resumo(contadores, total_entrada, len(df))
+        if output_path:
+            print(f"\n✅ Arquivo salvo como: {output_path}")
+        print("\n" + "=" * 60)
+
+    return df
+
+def clean_file_streaming(input_path=INPUT_FILE, output_path=OUTPUT_FILE, chunk_size: int = CHUNK_SIZE_PADRAO,
+                         verbose: bool = False, medidor: MedidorEtapas = None, usar_mmap: bool = True,
+                         parser: str = PARSER_PADRAO) -> int:
+    """
+    Limpa um CSV em chunks de tamanho fixo direto para output_path (memória constante).
+    usar_mmap=False força a leitura linha a linha (ex: sistemas de arquivos de rede).
+    Returns: total de produtos gravados
+    """
+    medidor = medidor or MedidorEtapas(ativo=False)
+    with medidor.etapa('detectar'):
+        candidatos = encodings_para_testar(input_path, verbose)
+
+    for encoding in candidatos:
+        try:
+            if verbose:
+                print(f"🔍 Tentando encoding: {encoding}")
+            contadores = Counter()
+            with contar_linhas(contadores):
+                total = limpar_em_chunks(input_path, output_path, encoding, chunk_size, contadores, verbose,
+                                         medidor, usar_mmap, parser)
+            break
+        except UnicodeDecodeError as e:
+            if verbose:
+                print(f"❌ Erro com {encoding}: {e}")
+            continue
+    else:
+        raise ValueError(f"Nenhum encoding funcionou para o arquivo: {input_path}")
+
+    if verbose:
+        imprimir_contadores(contadores)
+    return total
+
+def main(argv=None) -> int:
+    """Interface de linha de comando do limpador"""
+    parser = argparse.ArgumentParser(description='GoParts Data Cleaner')
+    parser.add_argument('--input', '-i', default=INPUT_FILE, help='Arquivo CSV de entrada')
+    parser.add_argument('--output', '-o', default=OUTPUT_FILE, help='Arquivo CSV de saída')
+    parser.add_argument('--quiet', '-q', action='store_true', help='Mostra apenas o resumo final')
+    parser.add_argument('--streaming', action='store_true',
+                        help='Processa o arquivo em chunks de tamanho fixo (memória constante)')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE_PADRAO,
+                        help=f'Linhas por chunk no modo streaming (padrão: {CHUNK_SIZE_PADRAO})')
+    parser.add_argument('--sem-mmap', action='store_true',
+                        help='No modo streaming, lê a entrada linha a linha em vez de via mmap')
+    parser.add_argument('--checkpoint', action='store_true',
+                        help='Modo streaming retomável: grava um checkpoint a cada chunk e retoma do último após uma falha')
+    parser.add_argument('--parser', choices=PARSERS, default=PARSER_PADRAO,
+                        help='Parser do texto reparado: c (padrão) ou pyarrow (multi-thread, requer pyarrow)')
+    parser.add_argument('--formato', choices=['csv', 'parquet', 'feather'],
+                        help='Formato de saída (padrão: pela extensão de --output)')
+    parser.add_argument('--compactar', action='store_true',
+                        help='Usa dtypes compactos (category/float32/int32) e a coluna regiao (category) em memória '
+                             'e mostra o uso de memória (só na limpeza em memória; o arquivo não muda)')
+    parser.add_argument('--dedup', choices=POLITICAS,
+                        help='Remove codigos repetidos com a política escolhida')
+    parser.add_argument('--amostra', type=int, default=AMOSTRA_PADRAO,
+                        help=f'Linhas aleatórias exibidas antes/depois da limpeza (padrão: {AMOSTRA_PADRAO})')
+    parser.add_argument('--metricas', action='store_true',
+                        help='Mede tempo de parede/CPU e linhas/s por etapa e grava <saida sem extensão>.metrics.json')
+    parser.add_argument('--metricas-memoria', action='store_true',
+                        help='Como --metricas, incluindo o pico de memória por etapa (tracemalloc, bem mais lento)')
+    parser.add_argument('--perfil', action='store_true',
+                        help='Grava um dump do cProfile em <saida sem extensão>.prof')
+    args = parser.parse_args(argv)
+    verbose = not args.quiet
+    args.output = caminho_com_formato(args.output, args.formato)
+
+    args.metricas = args.metricas or args.metricas_memoria
+    medidor = MedidorEtapas(ativo=args.metricas, memoria=args.metricas_memoria)
+    try:
+        if args.compactar and (args.streaming or args.checkpoint):
+            raise ValueError("--compactar só se aplica à limpeza em memória (sem --streaming/--checkpoint)")
+        inicio = time.perf_counter()
+        medidor.iniciar()
+        with perfilar(caminho_perfil(args.output), args.perfil):
+            if args.streaming or args.checkpoint:
+                if verbose:
+                    print(f"🌊 Modo streaming: chunks de {args.chunk_size} linhas")
+                if args.checkpoint:
+                    # Importado aqui: checkpoint_cleaner depende deste módulo
+                    from checkpoint_cleaner import limpar_com_checkpoint
+                    total = limpar_com_checkpoint(args.input, args.output, args.chunk_size, verbose, medidor,
+                                                  not args.sem_mmap, args.parser)
+                else:
+                    total = clean_file_streaming(args.input, args.output, args.chunk_size, verbose, medidor,
+                                                 not args.sem_mmap, args.parser)
+                if args.dedup:
+                    with medidor.etapa('deduplicar'):
+                        total = deduplicar_arquivo(args.output, politica=args.dedup, verbose=verbose)
+            else:
+                total = len(clean_file(args.input, args.output, verbose, args.compactar, args.dedup, medidor,
+                                       args.amostra, args.parser))
+        medidor.finalizar()
+        duracao = time.perf_counter() - inicio
+    except (ValueError, FileNotFoundError, ImportError) as e:
+        print(f"❌ {e}")
+        return 1
 
-print("\n" + "=" * 60)
-print(f"\n🔍 Dados DEPOIS da limpeza ({len(df)} produtos):")
-print(df.to_string())
-print(f"\n✅ Arquivo salvo como: {OUTPUT_FILE}")
-print("\n" + "=" * 60)
+    print(f"✅ {total} produtos limpos em {duracao:.2f}s")
+    print(f"✅ Arquivo salvo como: {args.output}")
+    if args.metricas:
+        if verbose:
+            medidor.imprimir()
+        relatorio = medidor.salvar(caminho_metricas(args.output), entrada=os.path.abspath(args.input),
+                                   saida=os.path.abspath(args.output), linhas=total,
+                                   modo='streaming' if args.streaming or args.checkpoint else 'memoria')
+        print(f"📈 Métricas salvas em: {relatorio}")
+    if args.perfil:
+        print(f"🔬 Perfil salvo em: {caminho_perfil(args.output)} (python -m pstats)")
+    return 0
 
+if __name__ == "__main__":
+    sys.exit(main())
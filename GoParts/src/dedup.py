@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+🧬 GoParts Dedup
+Deduplicação do catálogo limpo por `codigo`, com políticas configuráveis:
+- ultimo: mantém a última ocorrência
+- somar-estoque: mantém a última ocorrência com o estoque somado de todas
+- menor-preco / maior-preco: mantém a ocorrência com o menor/maior preço
+Catálogos que cabem em memória usam um groupby vetorizado. Os maiores são
+particionados em disco por hash do codigo, e cada partição é deduplicada
+separadamente (todas as ocorrências de um codigo caem na mesma partição).
+"""
+
+import os
+import math
+import shutil
+import tempfile
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from catalog_io import EscritorCatalogo, ler_catalogo, ler_catalogo_em_chunks
+from compressed_io import compressao_do_caminho
+
+POLITICAS = ['ultimo', 'somar-estoque', 'menor-preco', 'maior-preco']
+
+# Orçamento de memória para deduplicar em memória (acima dele, particiona em disco)
+LIMITE_MEMORIA_DEDUP = 512 * 1024 * 1024  # 512MB
+# Quanto um CSV cresce ao virar DataFrame (strings Python + índices do groupby)
+FATOR_MEMORIA_CSV = 6
+# Taxa de compressão típica de um CSV .gz/.bz2/.zst (para estimar o tamanho descomprimido)
+FATOR_COMPRESSAO = 5
+# Linhas por chunk ao ler/particionar
+CHUNK_SIZE_DEDUP = 200_000
+
+def deduplicar(df: pd.DataFrame, politica: str = 'ultimo', contadores: Counter = None) -> pd.DataFrame:
+    """
+    Remove os codigos repetidos segundo a política (vetorizado, em memória).
+    Cada codigo fica na posição da linha escolhida; a ordem relativa é preservada.
+    """
+    if politica not in POLITICAS:
+        raise ValueError(f"Política de deduplicação inválida: {politica} (use {', '.join(POLITICAS)})")
+
+    if politica in ('ultimo', 'somar-estoque'):
+        resultado = df[~df['codigo'].duplicated(keep='last')].copy()
+        if politica == 'somar-estoque':
+            totais = df.groupby('codigo', sort=False, dropna=False)['estoque'].sum()
+            resultado['estoque'] = totais.reindex(resultado['codigo']).to_numpy()
+    else:
+        grupos = df.reset_index(drop=True).groupby('codigo', sort=False, dropna=False)['preco']
+        escolhidas = grupos.idxmin() if politica == 'menor-preco' else grupos.idxmax()
+        resultado = df.iloc[np.sort(escolhidas.to_numpy())].copy()
+
+    if contadores is not None:
+        contadores['dedup_removidas'] += len(df) - len(resultado)
+    return resultado
+
+def _numero_particoes(caminho, limite_memoria: int) -> int:
+    estimado = os.path.getsize(caminho) * FATOR_MEMORIA_CSV
+    if compressao_do_caminho(caminho):
+        estimado *= FATOR_COMPRESSAO
+    return max(1, math.ceil(estimado / limite_memoria))
+
+def _particionar(caminho_entrada, diretorio, particoes: int, chunk_size: int) -> list:
+    """Distribui as linhas em arquivos de partição por hash do codigo"""
+    caminhos = [os.path.join(diretorio, f"particao{i:04d}.pkl") for i in range(particoes)]
+    escritas = [[] for _ in range(particoes)]
+    inicio = 0
+    for numero_chunk, chunk in enumerate(ler_catalogo_em_chunks(caminho_entrada, chunk_size)):
+        # Índice = número global da linha, para manter a ordem dentro da partição
+        chunk.index = pd.RangeIndex(inicio, inicio + len(chunk))
+        inicio += len(chunk)
+        destinos = pd.util.hash_pandas_object(chunk['codigo'], index=False).to_numpy() % particoes
+        for particao, parte in chunk.groupby(destinos, sort=False):
+            caminho_parte = f"{caminhos[particao]}.{numero_chunk:06d}"
+            parte.to_pickle(caminho_parte)
+            escritas[particao].append(caminho_parte)
+    return escritas
+
+def deduplicar_arquivo(caminho_entrada, caminho_saida=None, politica: str = 'ultimo',
+                       limite_memoria: int = LIMITE_MEMORIA_DEDUP, chunk_size: int = CHUNK_SIZE_DEDUP,
+                       contadores: Counter = None, verbose: bool = False) -> int:
+    """
+    Deduplica um catálogo em disco (CSV/Parquet/Feather) em caminho_saida (padrão: o próprio arquivo).
+    Se o catálogo cabe em limite_memoria, usa deduplicar() direto; senão particiona por hash
+    do codigo em disco e deduplica uma partição por vez. No modo particionado a saída fica
+    agrupada por partição (a ordem original é mantida dentro de cada partição).
+    Returns: total de linhas na saída
+    """
+    if politica not in POLITICAS:
+        raise ValueError(f"Política de deduplicação inválida: {politica} (use {', '.join(POLITICAS)})")
+    caminho_saida = caminho_saida or caminho_entrada
+    contadores = contadores if contadores is not None else Counter()
+    particoes = _numero_particoes(caminho_entrada, limite_memoria)
+
+    diretorio = tempfile.mkdtemp(prefix='.dedup_', dir=os.path.dirname(os.path.abspath(caminho_saida)))
+    temporario = os.path.join(diretorio, 'saida' + os.path.splitext(caminho_saida)[1])
+    total = 0
+    try:
+        with EscritorCatalogo(temporario) as escritor:
+            if particoes == 1:
+                df = deduplicar(ler_catalogo(caminho_entrada), politica, contadores)
+                escritor.escrever(df)
+                total = len(df)
+            else:
+                if verbose:
+                    print(f"💾 Catálogo maior que a memória: deduplicando em {particoes} partições")
+                for partes in _particionar(caminho_entrada, diretorio, particoes, chunk_size):
+                    if not partes:
+                        continue
+                    df = pd.concat([pd.read_pickle(parte) for parte in partes])
+                    df = deduplicar(df, politica, contadores)
+                    escritor.escrever(df)
+                    total += len(df)
+                    for parte in partes:
+                        os.remove(parte)
+        os.replace(temporario, caminho_saida)
+    finally:
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+    if verbose:
+        print(f"🧬 Deduplicação ({politica}): {contadores['dedup_removidas']} linhas removidas, {total} restantes")
+    return total
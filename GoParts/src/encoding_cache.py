@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+🗂️ GoParts Encoding Cache
+Cache em disco dos encodings detectados, para que execuções noturnas
+sobre os mesmos arquivos pulem a detecção por completo.
+A chave é a impressão digital do arquivo: tamanho + mtime + hash do início.
+"""
+
+import os
+import json
+import hashlib
+from typing import Optional
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_FILE = os.path.join(BASE_DIR, 'data', '.cache', 'encodings.json')
+
+# Bytes do início do arquivo usados no hash da impressão digital
+TAMANHO_CABECA_HASH = 64 * 1024
+# Quantidade máxima de entradas mantidas no cache
+MAX_ENTRADAS = 1000
+
+def impressao_digital(caminho_arquivo, cabeca: bytes = None) -> str:
+    """
+    Gera a chave do arquivo: tamanho, mtime e hash dos primeiros bytes.
+    `cabeca` permite reaproveitar bytes já lidos do início do arquivo.
+    """
+    info = os.stat(caminho_arquivo)
+    if cabeca is None:
+        with open(caminho_arquivo, 'rb') as file:
+            cabeca = file.read(TAMANHO_CABECA_HASH)
+    hash_cabeca = hashlib.sha1(cabeca[:TAMANHO_CABECA_HASH]).hexdigest()
+    return f"{info.st_size}:{info.st_mtime_ns}:{hash_cabeca}"
+
+class EncodingCache:
+    """Cache chave → encoding persistido em JSON"""
+
+    def __init__(self, caminho: str = CACHE_FILE):
+        self.caminho = caminho
+        self._entradas = None
+
+    def _carregar(self) -> dict:
+        if self._entradas is None:
+            try:
+                with open(self.caminho, 'r', encoding='utf-8') as file:
+                    self._entradas = json.load(file)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._entradas = {}
+        return self._entradas
+
+    def get(self, chave: str) -> Optional[str]:
+        return self._carregar().get(chave)
+
+    def set(self, chave: str, encoding: str):
+        entradas = self._carregar()
+        entradas.pop(chave, None)
+        entradas[chave] = encoding
+
+        # Descarta as entradas mais antigas (dict mantém ordem de inserção)
+        while len(entradas) > MAX_ENTRADAS:
+            entradas.pop(next(iter(entradas)))
+
+        os.makedirs(os.path.dirname(self.caminho), exist_ok=True)
+        temporario = f"{self.caminho}.tmp"
+        with open(temporario, 'w', encoding='utf-8') as file:
+            json.dump(entradas, file, indent=2)
+        os.replace(temporario, self.caminho)
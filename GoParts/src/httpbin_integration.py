@@ -6,16 +6,19 @@ Script para enviar produtos para httpbin.org simulando uma API REST
 
 import pandas as pd
 import requests
-import time
 import logging
 import json
 import sys
 import os
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 import random
 
+from catalog_io import carregar_catalogo
+from rate_control import ConfigControle, ControleAdaptativo
+from retry_scheduler import OrcamentoRetries, Tentativa, executar_com_retries
+
 # Configuração de logging
 def setup_logging():
     """Configura o sistema de logging"""
@@ -43,6 +46,11 @@ class RetryConfig:
     initial_delay: float = 1.0
     max_delay: float = 32.0
     backoff_factor: float = 2.0
+    # Jitter do backoff: 'full', 'decorrelated' ou 'none'
+    jitter: str = 'full'
+    # Orçamento global: retries <= retry_budget_min + retry_budget x primeiras tentativas
+    retry_budget: float = 0.1
+    retry_budget_min: int = 20
 
 @dataclass
 class APIStats:
@@ -51,6 +59,11 @@ class APIStats:
     successful: int = 0
     failed: int = 0
     retries_used: int = 0
+    retries_denied: int = 0
+    # Estado atual do controle de vazão (atualizado pelo ControleAdaptativo)
+    rate_limit: float = 0.0
+    concurrency_limit: int = 0
+    rate_reductions: int = 0
     start_time: Optional[datetime] = None
     end_time: Optional[datetime] = None
     
@@ -67,8 +80,10 @@ class APIStats:
 class HTTPBinClient:
     """Cliente que simula falhas usando httpbin.org"""
     
-    def __init__(self, retry_config: RetryConfig = None):
+    def __init__(self, retry_config: RetryConfig = None, controle: ControleAdaptativo = None):
         self.retry_config = retry_config or RetryConfig()
+        # Controle de vazão (token bucket + AIMD); None envia sem limite
+        self.controle = controle
         self.session = requests.Session()
         self.session.headers.update({
             'Content-Type': 'application/json',
@@ -76,87 +91,85 @@ class HTTPBinClient:
         })
         self.logger = logging.getLogger(__name__)
         self.failure_rate = 0.3  # 30% de falha simulada
-    
-    def _calculate_delay(self, attempt: int) -> float:
-        """Calcula delay para backoff exponencial"""
-        delay = self.retry_config.initial_delay * (self.retry_config.backoff_factor ** (attempt - 1))
-        return min(delay, self.retry_config.max_delay)
+        # Orçamento de retries compartilhado por todos os envios deste cliente
+        self.orcamento = OrcamentoRetries(self.retry_config.retry_budget, self.retry_config.retry_budget_min)
     
     def _simulate_api_failure(self) -> bool:
         """Simula falha da API baseada na taxa de falha"""
         return random.random() < self.failure_rate
     
+    def _tentar_produto(self, produto: Dict[str, Any], attempt: int) -> Tentativa:
+        """Uma tentativa de envio; o retry, se houver, é agendado pelo executar_com_retries"""
+        try:
+            self.logger.info(f"📤 Enviando produto: {produto['nome_produto']} (tentativa {attempt})")
+            if self.controle:
+                self.controle.aguardar()
+            
+            # Simula falha intermitente
+            if self._simulate_api_failure():
+                if self.controle:
+                    self.controle.registrar_sobrecarga()
+                # Simula diferentes tipos de erro
+                error_codes = [500, 502, 503, 504]
+                simulated_status = random.choice(error_codes)
+                
+                self.logger.warning(f"🔴 Simulando erro HTTP {simulated_status}")
+                return Tentativa('retry', {'error': f'Simulated HTTP {simulated_status}'})
+            
+            # Envia para httpbin.org (sempre retorna 200)
+            response = self.session.post(
+                'https://httpbin.org/post',
+                json={
+                    'produto': produto,
+                    'timestamp': datetime.now().isoformat(),
+                    'attempt': attempt
+                },
+                timeout=10
+            )
+            
+            if response.status_code == 200:
+                if self.controle:
+                    self.controle.registrar_sucesso()
+                self.logger.info(f"✅ Produto enviado com sucesso: {produto['codigo']}")
+                return Tentativa('ok', {
+                    'message': 'Produto enviado com sucesso',
+                    'httpbin_response': response.json(),
+                    'attempts': attempt
+                })
+            return Tentativa('retry', {'error': f'HTTP {response.status_code}', 'message': response.text})
+            
+        except (requests.Timeout, requests.ConnectionError) as e:
+            if self.controle:
+                self.controle.registrar_sobrecarga()
+            return Tentativa('retry', {'error': 'ConnectionError', 'message': str(e)})
+        
+        except Exception as e:
+            self.logger.error(f"❌ Erro inesperado: {str(e)}")
+            return Tentativa('falha', {'error': 'UnexpectedError', 'message': str(e)})
+    
+    def send_many(self, produtos: List[Dict[str, Any]], stats: APIStats = None) -> List[Tuple[bool, Dict[str, Any]]]:
+        """
+        Envia os produtos um por vez; as tentativas que falham esperam o backoff (com jitter)
+        na fila de retries enquanto os próximos produtos são enviados
+        Returns: [(sucesso, resposta)] na ordem dos produtos
+        """
+        def ao_agendar(produto, attempt, atraso, resposta):
+            self.logger.warning(f"⚠️ {resposta.get('error', 'Erro')}: {produto['codigo']} volta em {atraso:.1f}s...")
+            if stats is not None:
+                stats.retries_used += 1
+        
+        resultados = executar_com_retries(produtos, self._tentar_produto, self.retry_config, 1,
+                                          self.retry_config.jitter, self.orcamento, ao_agendar)
+        if stats is not None:
+            stats.retries_denied = self.orcamento.negados
+        return resultados
+    
     def send_produto(self, produto: Dict[str, Any]) -> Tuple[bool, Dict[str, Any]]:
         """
         Envia produto simulando falhas intermitentes
         Uses httpbin.org/post para simular POST requests
         """
-        
-        for attempt in range(1, self.retry_config.max_attempts + 1):
-            try:
-                self.logger.info(f"📤 Enviando produto: {produto['nome_produto']} (tentativa {attempt})")
-                
-                # Simula falha intermitente
-                if self._simulate_api_failure():
-                    # Simula diferentes tipos de erro
-                    error_codes = [500, 502, 503, 504]
-                    simulated_status = random.choice(error_codes)
-                    
-                    self.logger.warning(f"🔴 Simulando erro HTTP {simulated_status}")
-                    
-                    if attempt < self.retry_config.max_attempts:
-                        delay = self._calculate_delay(attempt)
-                        self.logger.warning(f"⚠️ Tentando novamente em {delay:.1f}s...")
-                        time.sleep(delay)
-                        continue
-                    else:
-                        return False, {
-                            'error': f'Simulated HTTP {simulated_status}',
-                            'attempts': attempt
-                        }
-                
-                # Envia para httpbin.org (sempre retorna 200)
-                response = self.session.post(
-                    'https://httpbin.org/post',
-                    json={
-                        'produto': produto,
-                        'timestamp': datetime.now().isoformat(),
-                        'attempt': attempt
-                    },
-                    timeout=10
-                )
-                
-                if response.status_code == 200:
-                    self.logger.info(f"✅ Produto enviado com sucesso: {produto['codigo']}")
-                    return True, {
-                        'message': 'Produto enviado com sucesso',
-                        'httpbin_response': response.json(),
-                        'attempts': attempt
-                    }
-                
-            except (requests.Timeout, requests.ConnectionError) as e:
-                if attempt < self.retry_config.max_attempts:
-                    delay = self._calculate_delay(attempt)
-                    self.logger.warning(f"⚠️ Erro de conexão: {str(e)}, tentando novamente em {delay:.1f}s...")
-                    time.sleep(delay)
-                    continue
-                
-                self.logger.error(f"❌ Erro de conexão definitivo: {str(e)}")
-                return False, {
-                    'error': 'ConnectionError',
-                    'message': str(e),
-                    'attempts': attempt
-                }
-            
-            except Exception as e:
-                self.logger.error(f"❌ Erro inesperado: {str(e)}")
-                return False, {
-                    'error': 'UnexpectedError',
-                    'message': str(e),
-                    'attempts': attempt
-                }
-        
-        return False, {'error': 'MaxAttemptsExceeded', 'attempts': self.retry_config.max_attempts}
+        return self.send_many([produto])[0]
     
     def test_connection(self) -> bool:
         """Testa conexão com httpbin.org"""
@@ -167,9 +180,9 @@ class HTTPBinClient:
             return False
 
 def load_produtos_csv(file_path: str) -> pd.DataFrame:
-    """Carrega produtos do CSV limpo"""
+    """Carrega produtos do CSV limpo (ou da versão Parquet/Feather ao lado dele, se existir)"""
     try:
-        df = pd.read_csv(file_path, encoding='utf-8-sig')
+        df = carregar_catalogo(file_path)
         return df
     except Exception as e:
         raise Exception(f"Erro ao carregar CSV: {e}")
@@ -221,21 +234,29 @@ def main():
         stats.total_products = len(df)
         stats.start_time = datetime.now()
         
+        # Controle de vazão no lugar da pausa fixa de 0.2s: começa em 5 req/s e
+        # se adapta às falhas (teto baixo, o httpbin.org é um serviço público)
+        controle = ControleAdaptativo(ConfigControle(taxa_inicial=5.0, taxa_maxima=20.0,
+                                                     limite_inicial=1, limite_maximo=1), stats)
+        client.controle = controle
+        logger.info(f"🎚️ Controle de vazão: {controle.resumo()}")
+        
         # Processa cada produto
         logger.info(f"🚀 Iniciando envio de {len(df)} produtos...")
         
         failed_products = []
         
-        for index, row in df.iterrows():
-            produto = {
-                'nome_produto': row['nome_produto'],
-                'codigo': row['codigo'],
-                'preco': float(row['preco']),
-                'estoque': int(row['estoque'])
-            }
-            
-            success, response = client.send_produto(produto)
-            
+        produtos = [{
+            'nome_produto': row['nome_produto'],
+            'codigo': row['codigo'],
+            'preco': float(row['preco']),
+            'estoque': int(row['estoque'])
+        } for _, row in df.iterrows()]
+        
+        # Os retries esperam na fila enquanto os próximos produtos seguem
+        resultados = client.send_many(produtos, stats)
+        
+        for produto, (success, response) in zip(produtos, resultados):
             if success:
                 stats.successful += 1
             else:
@@ -249,9 +270,6 @@ def main():
                 error_msg = response.get('message', response.get('error', 'Erro desconhecido'))
                 attempts = response.get('attempts', 'N/A')
                 logger.error(f"❌ Falha ao enviar {produto['codigo']}: {error_msg} (tentativas: {attempts})")
-            
-            # Pequena pausa entre envios
-            time.sleep(0.2)
         
         stats.end_time = datetime.now()
         
@@ -265,6 +283,10 @@ def main():
         print(f"❌ Falhas: {stats.failed}")
         print(f"📈 Taxa de sucesso: {stats.success_rate():.1f}%")
         print(f"💥 Taxa de falha esperada: ~30%")
+        print(f"🔄 Total de retries: {stats.retries_used}")
+        if stats.retries_denied:
+            print(f"🪙 Retries negados pelo orçamento: {stats.retries_denied}")
+        print(f"🎚️  Controle de vazão: {controle.resumo()} ao final ({stats.rate_reductions} reduções)")
         
         logger.info(f"📊 RESUMO: {stats.successful}/{stats.total_products} produtos enviados ({stats.success_rate():.1f}% sucesso)")
         
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+🔁 GoParts Incremental Cleaner
+Limpeza incremental (delta) dos arquivos noturnos de fornecedores.
+Um manifesto compacto guarda o hash de 64 bits de cada linha bruta (bytes, antes
+de decodificar) da última execução. Só as linhas novas ou alteradas são
+decodificadas, reparadas e normalizadas; as demais são reaproveitadas da execução
+anterior. As linhas sem par são classificadas por `codigo` em novas, alteradas e removidas.
+Com saída CSV e pyarrow instalado, as linhas limpas da execução anterior ficam em
+um estado colunar (Feather) ao lado da saída, com o `codigo` e a linha já formatada
+de cada produto: a junção não reparseia nem reformata o CSV anterior.
+"""
+
+import os
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+import data_cleaner
+from catalog_io import (EscritorCatalogo, formato_do_caminho, ler_catalogo, ler_colunar, linhas_csv,
+                        pyarrow_disponivel, salvar_catalogo)
+from row_repair import MotorReparo, FluxoTexto
+from encoding_cache import impressao_digital
+from compressed_io import abrir_binario, caminho_irmao
+
+VERSAO_MANIFESTO = 2
+
+# Colunas do estado colunar: codigo da linha bruta e a linha como foi gravada na saída CSV
+COLUNA_CODIGO = 'codigo'
+COLUNA_LINHA_CSV = 'linha_csv'
+
+@dataclass
+class ResultadoIncremental:
+    """Contagens de uma execução incremental"""
+    total: int = 0
+    adicionadas: int = 0
+    alteradas: int = 0
+    removidas: int = 0
+    inalteradas: int = 0
+    duracao: float = 0.0
+
+def caminho_manifesto(caminho_saida) -> str:
+    """O manifesto fica ao lado da saída limpa, sem a extensão dela: produtos.csv → produtos.manifest.pkl"""
+    return caminho_irmao(caminho_saida, '.manifest.pkl')
+
+def caminho_estado(caminho_saida) -> str:
+    """Linhas limpas da última execução, ao lado da saída CSV: produtos.csv → produtos.incremental.feather"""
+    return caminho_irmao(caminho_saida, '.incremental.feather')
+
+def usa_estado_colunar(caminho_saida) -> bool:
+    """Saídas colunares já são lidas sem reparse; o estado colunar só existe para saídas CSV"""
+    return formato_do_caminho(caminho_saida) == 'csv' and pyarrow_disponivel()
+
+def _codigo_da_linha(linha: str) -> str:
+    """Extrai o codigo (segunda coluna) de uma linha bruta"""
+    campos = linha.strip().split(',', 2)
+    return campos[1].strip() if len(campos) > 1 else ''
+
+def _ler_linhas_brutas(caminho_entrada):
+    """Returns: (cabeçalho, linhas não vazias), em bytes e sem as quebras de linha"""
+    with abrir_binario(caminho_entrada) as file:
+        dados = file.read()
+    if b'\r' in dados:
+        dados = dados.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+    todas = dados.split(b'\n')
+    del dados
+    return todas[0], [linha for linha in todas[1:] if linha.strip()]
+
+def _carregar_manifesto(caminho_saida, cabecalho: bytes, estado: bool) -> Optional[dict]:
+    """
+    Retorna o manifesto da execução anterior, ou None se não houver estado
+    reaproveitável (primeira execução, saída ou estado alterados por outro processo, cabeçalho diferente).
+    """
+    manifesto_path = caminho_manifesto(caminho_saida)
+    if not (os.path.exists(manifesto_path) and os.path.exists(caminho_saida)):
+        return None
+    if estado and not os.path.exists(caminho_estado(caminho_saida)):
+        return None
+
+    manifesto = pd.read_pickle(manifesto_path)
+    if (manifesto.get('versao') != VERSAO_MANIFESTO
+            or manifesto.get('cabecalho') != cabecalho
+            or manifesto.get('saida') != impressao_digital(caminho_saida)
+            or manifesto.get('estado') != (impressao_digital(caminho_estado(caminho_saida)) if estado else None)):
+        return None
+    return manifesto
+
+def _salvar_manifesto(caminho_saida, cabecalho: bytes, encoding: str, hashes: np.ndarray, estado: bool):
+    manifesto = {
+        'versao': VERSAO_MANIFESTO,
+        'cabecalho': cabecalho,
+        'encoding': encoding,
+        'saida': impressao_digital(caminho_saida),
+        'estado': impressao_digital(caminho_estado(caminho_saida)) if estado else None,
+        'hashes': hashes,
+    }
+    temporario = caminho_manifesto(caminho_saida) + '.tmp'
+    pd.to_pickle(manifesto, temporario)
+    os.replace(temporario, caminho_manifesto(caminho_saida))
+
+def _comparar_hashes(hashes: np.ndarray, hashes_anteriores: np.ndarray):
+    """
+    Returns: (posição na execução anterior de cada linha com conteúdo idêntico, -1 se nova ou
+    alterada; posições anteriores cujo conteúdo não aparece mais)
+    """
+    posicao_por_hash = pd.Series(np.arange(len(hashes_anteriores)), index=hashes_anteriores)
+    posicao_por_hash = posicao_por_hash[~posicao_por_hash.index.duplicated()]
+    encontrados = posicao_por_hash.index.get_indexer(hashes)
+    posicoes = np.full(len(hashes), -1)
+    posicoes[encontrados >= 0] = posicao_por_hash.to_numpy()[encontrados[encontrados >= 0]]
+    sem_par_anterior = np.flatnonzero(~pd.Series(hashes_anteriores).isin(hashes).to_numpy())
+    return posicoes, sem_par_anterior
+
+def limpar_incremental(caminho_entrada, caminho_saida, verbose: bool = True) -> ResultadoIncremental:
+    """
+    Limpa caminho_entrada reaproveitando a saída anterior em caminho_saida.
+    Linhas com os mesmos bytes da execução anterior reaproveitam a linha limpa;
+    as demais são decodificadas, reparadas e normalizadas e classificadas por `codigo` em novas/alteradas.
+    Na primeira execução (ou se o estado anterior não for confiável) todas as linhas são processadas.
+    """
+    inicio = time.perf_counter()
+    resultado = ResultadoIncremental()
+    estado = usa_estado_colunar(caminho_saida)
+
+    cabecalho, brutas = _ler_linhas_brutas(caminho_entrada)
+    # Hash de 64 bits por linha bruta (calculado em C, sem decodificar)
+    hashes = pd.util.hash_array(np.array(brutas, dtype=object), categorize=False)
+
+    manifesto = _carregar_manifesto(caminho_saida, cabecalho, estado)
+    hashes_anteriores = manifesto['hashes'] if manifesto else np.empty(0, dtype=hashes.dtype)
+    posicoes, sem_par_anterior = _comparar_hashes(hashes, hashes_anteriores)
+
+    # Caminho rápido: arquivo idêntico ao anterior, na mesma ordem - nada a regravar
+    if len(hashes) == len(hashes_anteriores) and np.array_equal(posicoes, np.arange(len(hashes))):
+        resultado.total = resultado.inalteradas = len(hashes)
+        resultado.duracao = time.perf_counter() - inicio
+        if verbose:
+            print(f"\n🔁 Nenhuma alteração desde a última execução ({resultado.total} linhas, {resultado.duracao:.2f}s)")
+        return resultado
+
+    # Só as linhas novas ou alteradas são decodificadas
+    pendentes = np.flatnonzero(posicoes < 0)
+    texto, encoding = data_cleaner.decodificar(b'\n'.join([cabecalho] + [brutas[i] for i in pendentes]),
+                                               caminho_entrada, verbose)
+    if manifesto and manifesto['encoding'] != encoding:
+        # As linhas reaproveitadas foram decodificadas com outro encoding: processa tudo de novo
+        if verbose:
+            print(f"🆕 Encoding mudou ({manifesto['encoding']} → {encoding}) - processando todas as linhas")
+        manifesto, hashes_anteriores = None, hashes_anteriores[:0]
+        posicoes, sem_par_anterior = _comparar_hashes(hashes, hashes_anteriores)
+        pendentes = np.arange(len(hashes))
+        texto, encoding = data_cleaner.decodificar(b'\n'.join([cabecalho] + brutas), caminho_entrada, verbose)
+    elif manifesto is None and verbose:
+        print("🆕 Sem manifesto reaproveitável - processando todas as linhas")
+    del brutas
+
+    linhas = texto.split('\n')
+    del texto
+    colunas = linhas[0].strip().split(',')
+    linhas_pendentes = linhas[1:]
+    if len(linhas_pendentes) != len(pendentes):
+        raise ValueError("Linhas decodificadas não correspondem às linhas de entrada")
+    inalteradas = posicoes >= 0
+    reaproveitadas = np.flatnonzero(inalteradas)
+    resultado.inalteradas = len(reaproveitadas)
+
+    # Linhas limpas da execução anterior: do estado colunar (codigo + linha CSV) ou da própria saída
+    anterior = None
+    if len(hashes_anteriores):
+        anterior = (ler_colunar(caminho_estado(caminho_saida), [COLUNA_CODIGO, COLUNA_LINHA_CSV], 'pyarrow')
+                    if estado else ler_catalogo(caminho_saida))
+
+    # Só as linhas novas ou alteradas passam pelo reparo e pela normalização
+    contadores = Counter()
+    df_novos = pd.DataFrame(columns=colunas)
+    if len(pendentes):
+        reparadas = MotorReparo(contadores=contadores).reparar_linhas(linhas_pendentes)
+        df_novos = pd.read_csv(FluxoTexto(reparadas), header=None, names=colunas)
+        df_novos = data_cleaner.limpar_chunk(df_novos, contadores)
+        if len(df_novos) != len(pendentes):
+            raise ValueError("Linhas reparadas não correspondem às linhas de entrada (aspas com quebra de linha?)")
+
+    # Classificação por codigo: alterada se o codigo existia entre as linhas anteriores sem par
+    codigos_pendentes = [_codigo_da_linha(linha) for linha in linhas_pendentes]
+    codigos_sem_par = set()
+    if anterior is not None and len(sem_par_anterior):
+        codigos_sem_par = set(anterior['codigo'].iloc[sem_par_anterior].fillna('').astype(str).str.strip())
+    resultado.alteradas = sum(codigo in codigos_sem_par for codigo in codigos_pendentes)
+    resultado.adicionadas = len(pendentes) - resultado.alteradas
+    resultado.removidas = len(codigos_sem_par - set(codigos_pendentes))
+
+    if estado:
+        # Junta as linhas já formatadas (em Arrow): nada do CSV anterior é reparseado ou reformatado
+        novo_estado = pd.DataFrame({COLUNA_CODIGO: codigos_pendentes, COLUNA_LINHA_CSV: linhas_csv(df_novos)},
+                                   index=pendentes, dtype=object)
+        if len(reaproveitadas):
+            novo_estado = pd.concat([anterior.iloc[posicoes[reaproveitadas]].set_axis(reaproveitadas),
+                                     novo_estado.astype(anterior.dtypes.to_dict())]).sort_index()
+        with EscritorCatalogo(caminho_saida) as escritor:
+            escritor.escrever_linhas(colunas, novo_estado[COLUNA_LINHA_CSV].to_numpy(dtype=object))
+        salvar_catalogo(novo_estado.reset_index(drop=True), caminho_estado(caminho_saida))
+    else:
+        partes = [df_novos.set_axis(pendentes)] if len(pendentes) else []
+        if len(reaproveitadas):
+            partes.append(anterior.iloc[posicoes[reaproveitadas]].set_axis(reaproveitadas))
+        df = pd.concat(partes).sort_index().reset_index(drop=True) if partes else df_novos
+        salvar_catalogo(df, caminho_saida)
+    _salvar_manifesto(caminho_saida, cabecalho, encoding, hashes, estado)
+
+    resultado.total = len(hashes)
+    resultado.duracao = time.perf_counter() - inicio
+    if verbose:
+        if contadores:
+            data_cleaner.imprimir_contadores(contadores)
+        print(f"\n🔁 Limpeza incremental em {resultado.duracao:.2f}s: "
+              f"{resultado.adicionadas} novas, {resultado.alteradas} alteradas, "
+              f"{resultado.removidas} removidas, {resultado.inalteradas} inalteradas")
+    return resultado
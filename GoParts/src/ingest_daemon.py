@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+📥 GoParts Ingest Daemon
+Modo de ingestão contínua: monitora data/input e limpa cada arquivo novo assim
+que ele termina de chegar, em um processo que já está com o pandas importado.
+- Debounce: um arquivo só é processado depois de ficar `espera` segundos sem
+  mudar de tamanho/mtime (arquivos ainda sendo copiados são ignorados)
+- Publicação atômica: a limpeza grava em um arquivo temporário oculto no
+  diretório de saída, que é renomeado (os.replace) para o nome final
+- Estado: a impressão digital de cada arquivo processado fica em
+  <saida>/.ingest_estado.json; um arquivo só é reprocessado se mudar
+Usa inotify (pacote opcional inotify_simple) para acordar assim que um arquivo
+é fechado/movido; sem ele, faz polling com os.scandir.
+
+Uso:
+    python src/ingest_daemon.py                       # Monitora data/input → data/output
+    python src/ingest_daemon.py --uma-vez             # Processa o que estiver pronto e sai
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd  # noqa: F401 - importado uma vez, o processo fica "quente" entre os arquivos
+
+import data_cleaner
+from encoding_cache import impressao_digital
+from parallel_cleaner import caminho_saida_por_arquivo
+
+DIRETORIO_ENTRADA = os.path.join(data_cleaner.BASE_DIR, 'data', 'input')
+DIRETORIO_SAIDA = os.path.join(data_cleaner.BASE_DIR, 'data', 'output')
+ARQUIVO_ESTADO = '.ingest_estado.json'
+
+# Segundos entre varreduras do diretório (no modo inotify, é só o tempo máximo de espera)
+INTERVALO_PADRAO = 1.0
+# Segundos sem mudança de tamanho/mtime para considerar o arquivo completo
+ESPERA_PADRAO = 2.0
+
+EXTENSOES_ACEITAS = ('.csv', '.csv.gz', '.csv.bz2', '.csv.zst')
+# Arquivos temporários de cópia/download nunca são processados
+SUFIXOS_TEMPORARIOS = ('.tmp', '.part', '.crdownload', '.filepart')
+
+@dataclass
+class ResultadoIngestao:
+    """Resultado do processamento de um arquivo"""
+    entrada: str
+    saida: Optional[str] = None
+    total: int = 0
+    duracao: float = 0.0
+    erro: Optional[str] = None
+
+def arquivo_aceito(nome: str) -> bool:
+    """CSV (comprimido ou não), sem ser oculto nem temporário"""
+    nome_minusculo = nome.lower()
+    if nome.startswith(('.', '~')) or nome_minusculo.endswith(SUFIXOS_TEMPORARIOS):
+        return False
+    return nome_minusculo.endswith(EXTENSOES_ACEITAS)
+
+def _observador_inotify(diretorio):
+    """Retorna um watcher do inotify_simple, ou None se indisponível (polling)"""
+    try:
+        from inotify_simple import INotify, flags
+    except ImportError:
+        return None
+    observador = INotify()
+    observador.add_watch(diretorio, flags.CLOSE_WRITE | flags.MOVED_TO | flags.CREATE | flags.MODIFY)
+    return observador
+
+class MonitorEntrada:
+    """Monitora um diretório de entrada e publica a versão limpa de cada arquivo pronto"""
+
+    def __init__(self, diretorio_entrada: str = DIRETORIO_ENTRADA, diretorio_saida: str = DIRETORIO_SAIDA,
+                 intervalo: float = INTERVALO_PADRAO, espera: float = ESPERA_PADRAO, formato: str = None,
+                 chunk_size: int = data_cleaner.CHUNK_SIZE_PADRAO, usar_inotify: bool = True,
+                 verbose: bool = True):
+        self.diretorio_entrada = diretorio_entrada
+        self.diretorio_saida = diretorio_saida
+        self.intervalo = intervalo
+        self.espera = espera
+        self.formato = formato
+        self.chunk_size = chunk_size
+        self.verbose = verbose
+        self.caminho_estado = os.path.join(diretorio_saida, ARQUIVO_ESTADO)
+        self.processados: Dict[str, str] = self._carregar_estado()
+        # nome → ((tamanho, mtime), instante em que essa assinatura foi vista pela primeira vez)
+        self._observados: Dict[str, Tuple[Tuple[int, int], float]] = {}
+        os.makedirs(diretorio_saida, exist_ok=True)
+        self._inotify = _observador_inotify(diretorio_entrada) if usar_inotify else None
+
+    def _carregar_estado(self) -> Dict[str, str]:
+        try:
+            with open(self.caminho_estado, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _salvar_estado(self):
+        temporario = f"{self.caminho_estado}.tmp"
+        with open(temporario, 'w', encoding='utf-8') as file:
+            json.dump(self.processados, file, indent=2, ensure_ascii=False)
+        os.replace(temporario, self.caminho_estado)
+
+    def arquivos_prontos(self) -> List[str]:
+        """
+        Uma varredura do diretório: retorna os arquivos estáveis há pelo menos `espera`
+        segundos que ainda não foram processados (ou que mudaram desde então).
+        """
+        agora = time.monotonic()
+        prontos, vistos = [], set()
+        with os.scandir(self.diretorio_entrada) as entradas:
+            for entrada in entradas:
+                if not (arquivo_aceito(entrada.name) and entrada.is_file()):
+                    continue
+                vistos.add(entrada.name)
+                info = entrada.stat()
+                assinatura = (info.st_size, info.st_mtime_ns)
+                anterior = self._observados.get(entrada.name)
+                if anterior is None or anterior[0] != assinatura:
+                    self._observados[entrada.name] = (assinatura, agora)
+                    continue
+                if agora - anterior[1] < self.espera:
+                    continue
+                if self.processados.get(entrada.name) != impressao_digital(entrada.path):
+                    prontos.append(entrada.path)
+
+        for nome in set(self._observados) - vistos:
+            del self._observados[nome]
+        return sorted(prontos)
+
+    def _proximo_pronto(self) -> Optional[float]:
+        """Segundos até o próximo arquivo em debounce ficar estável (None se não há nenhum)"""
+        agora = time.monotonic()
+        restantes = [self.espera - (agora - desde) for _, desde in self._observados.values()
+                     if agora - desde < self.espera]
+        return max(0.0, min(restantes)) if restantes else None
+
+    def processar(self, caminho_entrada: str) -> ResultadoIngestao:
+        """Limpa o arquivo em um temporário oculto e publica com os.replace"""
+        resultado = ResultadoIngestao(caminho_entrada)
+        impressao = impressao_digital(caminho_entrada)
+        destino = caminho_saida_por_arquivo(caminho_entrada, self.diretorio_saida, self.formato)
+        temporario = os.path.join(self.diretorio_saida, '.tmp-' + os.path.basename(destino))
+
+        inicio = time.perf_counter()
+        try:
+            resultado.total = data_cleaner.clean_file_streaming(caminho_entrada, temporario, self.chunk_size,
+                                                                verbose=False)
+            os.replace(temporario, destino)
+            resultado.saida = destino
+        except Exception as e:
+            # Um arquivo malformado não pode derrubar o monitor
+            resultado.erro = f"{type(e).__name__}: {e}"
+            if os.path.exists(temporario):
+                os.remove(temporario)
+        resultado.duracao = time.perf_counter() - inicio
+
+        # Com erro também: só tenta de novo quando o arquivo mudar
+        self.processados[os.path.basename(caminho_entrada)] = impressao
+        self._salvar_estado()
+
+        if self.verbose:
+            nome = os.path.basename(caminho_entrada)
+            if resultado.erro:
+                print(f"❌ {nome}: {resultado.erro}")
+            else:
+                print(f"✅ {nome} → {os.path.basename(destino)} "
+                      f"({resultado.total} produtos em {resultado.duracao:.2f}s)")
+        return resultado
+
+    def ciclo(self) -> List[ResultadoIngestao]:
+        """Uma varredura + processamento dos arquivos prontos"""
+        return [self.processar(caminho) for caminho in self.arquivos_prontos()]
+
+    def _aguardar_evento(self, proximo_pronto: Optional[float]):
+        """
+        Dorme até o próximo evento do inotify ou até `intervalo`, o que vier antes;
+        no inotify, acorda também quando um arquivo em debounce completa a espera.
+        """
+        if self._inotify is None:
+            time.sleep(self.intervalo)
+            return
+        timeout = self.intervalo if proximo_pronto is None else min(self.intervalo, proximo_pronto)
+        self._inotify.read(timeout=int(timeout * 1000) + 1)
+
+    def executar(self, uma_vez: bool = False) -> List[ResultadoIngestao]:
+        """
+        Loop principal. Com uma_vez=True, processa os arquivos presentes
+        (aguardando o debounce) e retorna; senão, roda até Ctrl+C.
+        """
+        if self.verbose:
+            modo = 'inotify' if self._inotify is not None else f'polling a cada {self.intervalo:g}s'
+            print(f"📥 Monitorando {self.diretorio_entrada} → {self.diretorio_saida} ({modo}, espera {self.espera:g}s)")
+
+        resultados = []
+        try:
+            while True:
+                resultados.extend(self.ciclo())
+                proximo_pronto = self._proximo_pronto()
+                if uma_vez and proximo_pronto is None:
+                    return resultados
+                self._aguardar_evento(proximo_pronto)
+        except KeyboardInterrupt:
+            if self.verbose:
+                print("\n⚠️ Monitoramento encerrado")
+        finally:
+            if self._inotify is not None:
+                self._inotify.close()
+        return resultados
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Ingestão contínua: limpa cada arquivo novo de data/input')
+    parser.add_argument('--entrada', default=DIRETORIO_ENTRADA, help='Diretório monitorado')
+    parser.add_argument('--saida', default=DIRETORIO_SAIDA, help='Diretório dos catálogos limpos')
+    parser.add_argument('--intervalo', type=float, default=INTERVALO_PADRAO, help='Segundos entre varreduras')
+    parser.add_argument('--espera', type=float, default=ESPERA_PADRAO,
+                        help='Segundos sem mudanças para considerar um arquivo completo')
+    parser.add_argument('--formato', choices=['csv', 'parquet', 'feather'], help='Formato de saída (padrão: csv)')
+    parser.add_argument('--polling', action='store_true', help='Não usa inotify, mesmo se disponível')
+    parser.add_argument('--uma-vez', action='store_true', help='Processa os arquivos prontos e sai')
+    args = parser.parse_args(argv)
+
+    monitor = MonitorEntrada(args.entrada, args.saida, args.intervalo, args.espera, args.formato,
+                             usar_inotify=not args.polling)
+    resultados = monitor.executar(uma_vez=args.uma_vez)
+    return 1 if any(resultado.erro for resultado in resultados) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
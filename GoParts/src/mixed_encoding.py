@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+🔀 GoParts Mixed Encoding
+Decodificação por linha de arquivos que misturam UTF-8 e um encoding legado
+(Latin-1, Windows-1252...): cada linha é decodificada como UTF-8 e só as que
+falham caem para o encoding legado, em uma única passada sobre os bytes.
+É registrado como um codec ('utf-8+iso8859-1', 'utf-8+cp1252', ...), então vale
+para todos os caminhos de leitura (bytes.decode, mmap, TextIOWrapper, workers).
+Trechos que são UTF-8 válido, ou que não têm nenhuma sequência UTF-8 multibyte
+(ex: um arquivo todo em Latin-1), são decodificados inteiros em C; o laço por
+linha só roda nas janelas realmente misturadas.
+A contagem de linhas por encoding vai para o Counter ativado com contar_linhas().
+O encoding legado de um arquivo misturado é detectado só nas linhas que não são UTF-8
+(amostra_para_deteccao).
+"""
+
+import codecs
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+import numpy as np
+
+PREFIXO_MISTO = 'utf-8+'
+# Chaves dos contadores: encoding_utf-8, encoding_iso8859-1...
+PREFIXO_CONTADOR = 'encoding_'
+# Encoding legado quando o detectado é UTF-8 (mesmo fallback final de encodings_para_testar)
+ENCODING_LEGADO_PADRAO = 'latin1'
+# Bytes por janela nos trechos misturados (cortadas em quebra de linha)
+TAMANHO_JANELA = 4 * 1024
+
+_ASCII = bytes(range(128))
+_contagem = ContextVar('contagem_linhas_encoding', default=None)
+
+def nome_misto(legado: str) -> str:
+    """Nome do codec misto para o encoding legado: latin1 → utf-8+iso8859-1"""
+    return PREFIXO_MISTO + codecs.lookup(legado).name
+
+def legado_compativel(encoding: str) -> bool:
+    """Encodings que coincidem com o ASCII (vírgulas e quebras de linha nos mesmos bytes), exceto UTF-8/16/32"""
+    try:
+        nome = codecs.lookup(encoding).name
+        return not nome.startswith('utf') and codecs.decode(_ASCII, nome) == _ASCII.decode('ascii')
+    except (LookupError, UnicodeDecodeError):
+        return False
+
+def encoding_misto_para(encoding_detectado: Optional[str]) -> Optional[str]:
+    """
+    Codec misto para o encoding detectado: UTF-8 (ou nada detectado) → utf-8+latin1,
+    legado compatível com ASCII → utf-8+<legado>; outros (UTF-16...) → None.
+    """
+    if not encoding_detectado:
+        return nome_misto(ENCODING_LEGADO_PADRAO)
+    if legado_compativel(encoding_detectado):
+        return nome_misto(encoding_detectado)
+    try:
+        if codecs.lookup(encoding_detectado).name in ('utf-8', 'utf-8-sig'):
+            return nome_misto(ENCODING_LEGADO_PADRAO)
+    except LookupError:
+        pass
+    return None
+
+@contextmanager
+def contar_linhas(contadores: Counter):
+    """Enquanto ativo, os codecs mistos somam as linhas decodificadas em contadores['encoding_<nome>']"""
+    token = _contagem.set(contadores)
+    try:
+        yield contadores
+    finally:
+        _contagem.reset(token)
+
+def _tem_utf8_multibyte(dados: bytes) -> bool:
+    """
+    Há alguma sequência UTF-8 multibyte válida (ex: é = C3 A9)? Decodificando com 'ignore',
+    sobram os bytes ASCII mais um caractere por sequência válida: se sobrar mais que os ASCII, há.
+    """
+    altos = int(np.count_nonzero(np.frombuffer(dados, dtype=np.uint8) >= 0x80))
+    return len(dados.decode('utf-8', 'ignore')) > len(dados) - altos
+
+def amostra_para_deteccao(dados: bytes) -> bytes:
+    """
+    Bytes para o detector de encoding: em um trecho misturado, só as linhas que não
+    são UTF-8 válido (as sequências UTF-8 das outras linhas levam o chardet a chutar
+    MacRoman e afins para o legado). Trechos só UTF-8 ou só legado voltam inteiros.
+    """
+    try:
+        dados.decode('utf-8')
+        return dados
+    except UnicodeDecodeError:
+        pass
+    if not _tem_utf8_multibyte(dados):
+        return dados
+
+    legado = []
+    for linha in dados.splitlines(keepends=True):
+        try:
+            linha.decode('utf-8')
+        except UnicodeDecodeError:
+            legado.append(linha)
+    return b''.join(legado)
+
+def _decodificar_legado(dados: bytes, legado: str) -> str:
+    try:
+        return dados.decode(legado)
+    except UnicodeDecodeError:
+        # Bytes sem caractere no legado (ex: 0x81 no cp1252)
+        return dados.decode('latin1')
+
+def _contar(linhas: int, encoding: str):
+    contadores = _contagem.get()
+    if contadores is not None and linhas:
+        contadores[PREFIXO_CONTADOR + encoding] += linhas
+
+def _linhas(dados: bytes) -> int:
+    return dados.count(b'\n') + (not dados.endswith(b'\n') and len(dados) > 0)
+
+def decodificar_misto(dados: bytes, legado: str, inicio_arquivo: bool = True) -> str:
+    """
+    Decodifica bytes com linhas inteiras: UTF-8 por linha, com fallback para `legado`.
+    inicio_arquivo: os bytes começam no início do arquivo (remove um BOM UTF-8).
+    """
+    if inicio_arquivo and dados.startswith(codecs.BOM_UTF8):
+        dados = dados[len(codecs.BOM_UTF8):]
+    try:
+        texto = dados.decode('utf-8')
+        _contar(_linhas(dados), 'utf-8')
+        return texto
+    except UnicodeDecodeError:
+        pass
+    if len(dados) > TAMANHO_JANELA and not _tem_utf8_multibyte(dados):
+        _contar(_linhas(dados), legado)
+        return _decodificar_legado(dados, legado)
+
+    partes, linhas_utf8, linhas_legado = [], 0, 0
+    inicio, tamanho = 0, len(dados)
+    while inicio < tamanho:
+        fim = dados.find(b'\n', min(inicio + TAMANHO_JANELA, tamanho) - 1)
+        fim = tamanho if fim < 0 else fim + 1
+        janela = dados[inicio:fim]
+        inicio = fim
+        if len(janela) < len(dados):
+            try:
+                partes.append(janela.decode('utf-8'))
+                linhas_utf8 += _linhas(janela)
+                continue
+            except UnicodeDecodeError:
+                pass
+            if not _tem_utf8_multibyte(janela):
+                partes.append(_decodificar_legado(janela, legado))
+                linhas_legado += _linhas(janela)
+                continue
+        for linha in janela.splitlines(keepends=True):
+            try:
+                partes.append(linha.decode('utf-8'))
+                linhas_utf8 += 1
+            except UnicodeDecodeError:
+                partes.append(_decodificar_legado(linha, legado))
+                linhas_legado += 1
+
+    _contar(linhas_utf8, 'utf-8')
+    _contar(linhas_legado, legado)
+    return ''.join(partes)
+
+def _criar_codec(nome: str, legado: str) -> codecs.CodecInfo:
+    class DecodificadorIncremental(codecs.BufferedIncrementalDecoder):
+        """Decodifica até a última quebra de linha recebida; o resto espera o próximo pedaço"""
+
+        def __init__(self, errors='strict'):
+            super().__init__(errors)
+            self._inicio = True
+
+        def _buffer_decode(self, entrada, errors, final):
+            corte = len(entrada) if final else entrada.rfind(b'\n') + 1
+            if corte == 0:
+                return '', 0
+            texto = decodificar_misto(bytes(entrada[:corte]), legado, self._inicio)
+            self._inicio = False
+            return texto, corte
+
+        def reset(self):
+            super().reset()
+            self._inicio = True
+
+    def decodificar(entrada, errors='strict'):
+        dados = bytes(entrada)
+        return decodificar_misto(dados, legado), len(dados)
+
+    return codecs.CodecInfo(
+        name=nome,
+        encode=codecs.utf_8_encode,
+        decode=decodificar,
+        incrementalencoder=codecs.getincrementalencoder('utf-8'),
+        incrementaldecoder=DecodificadorIncremental,
+    )
+
+def _buscar_codec(nome: str):
+    """Função de busca do registro de codecs: 'utf-8+<legado>' → codec misto"""
+    # O registro normaliza o nome (minúsculas, pontuação → '_'): 'utf-8+cp1252' chega como 'utf_8_cp1252'
+    # (utf_8_sig e afins são resolvidos antes, pela busca da biblioteca padrão)
+    prefixo = 'utf_8_'
+    legado = nome[len(prefixo):]
+    if not nome.startswith(prefixo) or not legado_compativel(legado):
+        return None
+    return _criar_codec(nome_misto(legado), codecs.lookup(legado).name)
+
+codecs.register(_buscar_codec)
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+🗺️ GoParts Mmap Reader
+Leitura de arquivos grandes via mmap: as quebras de linha são localizadas nos
+bytes (mm.rfind, em C) e cada bloco de linhas inteiras é decodificado de uma vez
+por um decodificador incremental. Nenhuma str é criada por linha antes do reparo,
+e o sistema operacional faz a leitura antecipada das páginas.
+"""
+
+import os
+import mmap
+import codecs
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+# Bytes por bloco quando não há chunk_size em linhas
+TAMANHO_BLOCO_MMAP = 16 * 1024 * 1024  # 16MB
+# Bytes do início do arquivo usados para estimar o tamanho médio das linhas
+AMOSTRA_TAMANHO_LINHA = 64 * 1024
+
+def mmap_disponivel(caminho) -> bool:
+    """mmap só se aplica a arquivos regulares não vazios"""
+    return os.path.isfile(caminho) and os.path.getsize(caminho) > 0
+
+def ler_cabecalho_mmap(caminho, encoding: str):
+    """
+    Returns: (primeira linha decodificada, offset do primeiro byte após ela).
+    Um BOM é removido quando o encoding é utf-8-sig.
+    """
+    with open(caminho, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        fim = mm.find(b'\n')
+        fim = len(mm) if fim < 0 else fim + 1
+        return codecs.decode(mm[:fim], encoding), fim
+
+def bytes_por_linha(caminho, inicio: int = 0) -> float:
+    """Tamanho médio das linhas, estimado pelos primeiros bytes após `inicio`"""
+    with open(caminho, 'rb') as file:
+        file.seek(inicio)
+        amostra = file.read(AMOSTRA_TAMANHO_LINHA)
+    return len(amostra) / max(1, amostra.count(b'\n'))
+
+def _normalizar_quebras(texto: str) -> str:
+    """Quebras \\r\\n e \\r viram \\n, como na leitura em modo texto"""
+    if '\r' in texto:
+        texto = texto.replace('\r\n', '\n').replace('\r', '\n')
+    return texto
+
+def iterar_blocos_mmap(caminho, encoding: str, inicio: int = 0, fim: Optional[int] = None,
+                       tamanho_bloco: int = TAMANHO_BLOCO_MMAP) -> Iterator[str]:
+    """
+    Gera o texto do intervalo de bytes [inicio, fim) em blocos de ~tamanho_bloco bytes,
+    cada um terminando em quebra de linha (exceto, talvez, o último).
+    Quebras \\r\\n e \\r viram \\n, como na leitura em modo texto.
+    """
+    for texto, _ in iterar_blocos_mmap_com_offset(caminho, encoding, inicio, fim, tamanho_bloco):
+        yield texto
+
+def iterar_blocos_mmap_com_offset(caminho, encoding: str, inicio: int = 0, fim: Optional[int] = None,
+                                  tamanho_bloco: int = TAMANHO_BLOCO_MMAP) -> Iterator[Tuple[str, int]]:
+    """Como iterar_blocos_mmap, gerando (texto, offset do primeiro byte após o bloco)"""
+    with open(caminho, 'rb') as file:
+        tamanho = os.fstat(file.fileno()).st_size
+        fim = tamanho if fim is None else min(fim, tamanho)
+        if inicio >= fim:
+            return
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mm, 'madvise'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            decodificador = codecs.getincrementaldecoder(encoding)()
+            visao = memoryview(mm)
+            try:
+                posicao = inicio
+                while posicao < fim:
+                    limite = posicao + tamanho_bloco
+                    if limite >= fim:
+                        corte = fim
+                    else:
+                        # Última quebra de linha do bloco (ou a próxima, se a linha for maior que o bloco)
+                        quebra = mm.rfind(b'\n', posicao, limite)
+                        if quebra < 0:
+                            quebra = mm.find(b'\n', limite, fim)
+                        corte = fim if quebra < 0 else quebra + 1
+
+                    texto = decodificador.decode(visao[posicao:corte], final=corte >= fim)
+                    posicao = corte
+                    yield _normalizar_quebras(texto), corte
+            finally:
+                visao.release()
+
+def bytes_por_linha_stream(arquivo: BinaryIO) -> float:
+    """Como bytes_por_linha, para um stream já posicionado (usa só o que o buffer já leu: peek)"""
+    amostra = arquivo.peek(AMOSTRA_TAMANHO_LINHA)[:AMOSTRA_TAMANHO_LINHA] if hasattr(arquivo, 'peek') else b''
+    return len(amostra) / max(1, amostra.count(b'\n'))
+
+def iterar_blocos_stream(arquivo: BinaryIO, encoding: str, inicio: int = 0,
+                         tamanho_bloco: int = TAMANHO_BLOCO_MMAP) -> Iterator[Tuple[str, int]]:
+    """
+    Mesmo contrato de iterar_blocos_mmap_com_offset para um stream binário já
+    posicionado em `inicio` (ex: arquivos comprimidos, onde não há mmap).
+    Os offsets são contados nos bytes lidos do stream (descomprimidos).
+    """
+    decodificador = codecs.getincrementaldecoder(encoding)()
+    posicao = inicio
+    resto = b''
+    while True:
+        dados = arquivo.read(tamanho_bloco)
+        if not dados:
+            break
+        dados = resto + dados
+        quebra = dados.rfind(b'\n')
+        if quebra < 0:
+            resto = dados
+            continue
+        bloco, resto = dados[:quebra + 1], dados[quebra + 1:]
+        posicao += len(bloco)
+        yield _normalizar_quebras(decodificador.decode(bloco)), posicao
+    texto = decodificador.decode(resto, final=True)
+    if texto:
+        yield _normalizar_quebras(texto), posicao + len(resto)
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+⚡ GoParts Parallel Cleaner
+Limpeza de vários arquivos de fornecedores em paralelo (pool de processos).
+Arquivos grandes são divididos em shards por intervalo de bytes, alinhados
+em quebras de linha, para que a limpeza use todos os núcleos. Arquivos comprimidos
+não permitem acesso aleatório e viram um único shard cada.
+"""
+
+import os
+import glob
+import codecs
+import shutil
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import data_cleaner
+from catalog_io import EscritorCatalogo, formato_do_caminho, ler_colunar
+from compressed_io import abrir_binario, caminho_sem_compressao, compressao_do_caminho
+from mmap_reader import bytes_por_linha, bytes_por_linha_stream, iterar_blocos_mmap, iterar_blocos_stream
+from mixed_encoding import contar_linhas
+
+# Arquivos acima deste tamanho são divididos em shards
+TAMANHO_MINIMO_SHARD = 32 * 1024 * 1024  # 32MB
+
+@dataclass
+class TarefaShard:
+    """Intervalo de bytes [inicio, fim) de um arquivo de entrada (fim=None: até o final) a ser limpo por um worker"""
+    caminho_entrada: str
+    inicio: int
+    fim: Optional[int]
+    colunas: List[str]
+    encodings: List[str]
+    caminho_parte: str
+
+def expandir_entradas(padroes) -> List[str]:
+    """Expande padrões glob (ex: 'data/input/*.csv') em uma lista ordenada de arquivos"""
+    if isinstance(padroes, str):
+        padroes = [padroes]
+
+    arquivos = []
+    for padrao in padroes:
+        encontrados = sorted(glob.glob(padrao)) if glob.has_magic(padrao) else [padrao]
+        arquivos.extend(encontrados)
+    return list(dict.fromkeys(arquivos))
+
+def ler_cabecalho(caminho_arquivo, encoding: str) -> Tuple[List[str], int]:
+    """Retorna (colunas, offset do primeiro byte após o cabeçalho)"""
+    with abrir_binario(caminho_arquivo) as file:
+        cabecalho = file.readline()
+    texto = cabecalho[len(codecs.BOM_UTF8):] if cabecalho.startswith(codecs.BOM_UTF8) else cabecalho
+    colunas = texto.decode(encoding).strip().split(',')
+    return colunas, len(cabecalho)
+
+def dividir_em_shards(caminho_arquivo, inicio: int, n_shards: int) -> List[Tuple[int, int]]:
+    """
+    Divide o arquivo em até n_shards intervalos de bytes a partir de `inicio`.
+    Cada fronteira é movida para logo após a próxima quebra de linha,
+    então nenhuma linha é cortada entre dois shards.
+    """
+    tamanho = os.path.getsize(caminho_arquivo)
+    if n_shards <= 1 or tamanho <= inicio:
+        return [(inicio, tamanho)]
+
+    fronteiras = [inicio]
+    passo = (tamanho - inicio) // n_shards
+    with open(caminho_arquivo, 'rb') as file:
+        for i in range(1, n_shards):
+            file.seek(inicio + i * passo)
+            file.readline()  # Avança até o fim da linha atual
+            posicao = file.tell()
+            if fronteiras[-1] < posicao < tamanho:
+                fronteiras.append(posicao)
+    fronteiras.append(tamanho)
+
+    return list(zip(fronteiras[:-1], fronteiras[1:]))
+
+def _limpar_shard(tarefa: TarefaShard) -> Tuple[int, Counter]:
+    """
+    Worker: limpa um shard e grava o resultado (sem cabeçalho) em caminho_parte.
+    Arquivos sem compressão são lidos via mmap em blocos de ~CHUNK_SIZE_PADRAO linhas.
+    """
+    comprimido = compressao_do_caminho(tarefa.caminho_entrada) is not None
+    for encoding in tarefa.encodings:
+        try:
+            contadores = Counter()
+            with contar_linhas(contadores):
+                if comprimido:
+                    # Arquivo comprimido = um shard só: descomprime em stream, em blocos de linhas inteiras
+                    with abrir_binario(tarefa.caminho_entrada) as file:
+                        file.read(tarefa.inicio)
+                        tamanho_bloco = int(data_cleaner.CHUNK_SIZE_PADRAO * bytes_por_linha_stream(file))
+                        blocos = (texto for texto, _ in iterar_blocos_stream(file, encoding, tarefa.inicio,
+                                                                             max(1, tamanho_bloco)))
+                        total = data_cleaner.limpar_blocos_em_chunks(
+                            blocos, tarefa.colunas, tarefa.caminho_parte,
+                            contadores=contadores, verbose=False, incluir_cabecalho=False
+                        )
+                else:
+                    tamanho_bloco = int(data_cleaner.CHUNK_SIZE_PADRAO * bytes_por_linha(tarefa.caminho_entrada,
+                                                                                          tarefa.inicio))
+                    blocos = iterar_blocos_mmap(tarefa.caminho_entrada, encoding, tarefa.inicio, tarefa.fim,
+                                                tamanho_bloco)
+                    total = data_cleaner.limpar_blocos_em_chunks(
+                        blocos, tarefa.colunas, tarefa.caminho_parte,
+                        contadores=contadores, verbose=False, incluir_cabecalho=False
+                    )
+            return total, contadores
+        except UnicodeDecodeError:
+            continue
+
+    raise ValueError(f"Nenhum encoding funcionou para o arquivo: {tarefa.caminho_entrada}")
+
+def _juntar_partes(partes: List[str], colunas: List[str], caminho_saida):
+    """
+    Junta as partes na ordem original.
+    CSV: concatena os bytes, escrevendo o cabeçalho (com BOM) uma única vez.
+    Parquet/Feather: copia as tabelas de cada parte para um único arquivo.
+    """
+    if formato_do_caminho(caminho_saida) == 'csv':
+        # As partes são CSV sem compressão; a saída .gz/.bz2/.zst é comprimida aqui, em um único stream
+        with abrir_binario(caminho_saida, 'wb') as saida:
+            saida.write((','.join(colunas) + '\n').encode('utf-8-sig'))
+            for parte in partes:
+                with open(parte, 'rb') as entrada:
+                    shutil.copyfileobj(entrada, saida, 1024 * 1024)
+                os.remove(parte)
+        return
+
+    with EscritorCatalogo(caminho_saida) as escritor:
+        for parte in partes:
+            escritor.escrever(ler_colunar(parte))
+            os.remove(parte)
+
+def caminho_saida_por_arquivo(caminho_entrada, diretorio_saida, formato: str = None) -> str:
+    """<diretorio_saida>/<nome>_limpo.<formato> (fornecedor.csv.gz → fornecedor_limpo.csv)"""
+    nome = os.path.splitext(os.path.basename(caminho_sem_compressao(caminho_entrada)))[0]
+    extensao = formato or 'csv'
+    return os.path.join(diretorio_saida, f"{nome}_limpo.{extensao}")
+
+def limpar_em_paralelo(entradas: List[str], saida, workers: int = None, por_arquivo: bool = False,
+                       tamanho_minimo_shard: int = TAMANHO_MINIMO_SHARD, verbose: bool = True,
+                       formato: str = None) -> dict:
+    """
+    Limpa vários arquivos em um pool de processos.
+    - por_arquivo=False: `saida` é um único arquivo com todos os produtos (formato pela extensão)
+    - por_arquivo=True: `saida` é um diretório com um <nome>_limpo.<formato> por entrada
+    Returns: dict com total de produtos, arquivos gerados e contadores de normalização
+    """
+    workers = workers or os.cpu_count() or 1
+    if por_arquivo:
+        os.makedirs(saida, exist_ok=True)
+
+    # Monta as tarefas: arquivos grandes viram vários shards
+    tarefas: List[TarefaShard] = []
+    destinos = {}  # caminho de saída -> (colunas, partes em ordem)
+    for caminho_entrada in entradas:
+        encodings = data_cleaner.encodings_para_testar(caminho_entrada, verbose=False)
+        colunas, inicio_dados = ler_cabecalho(caminho_entrada, encodings[0])
+        tamanho = os.path.getsize(caminho_entrada)
+        n_shards = min(workers, max(1, tamanho // tamanho_minimo_shard))
+        if compressao_do_caminho(caminho_entrada):
+            shards = [(inicio_dados, None)]
+        else:
+            shards = dividir_em_shards(caminho_entrada, inicio_dados, n_shards)
+
+        destino = caminho_saida_por_arquivo(caminho_entrada, saida, formato) if por_arquivo else saida
+        colunas_destino, partes = destinos.setdefault(destino, (colunas, []))
+        if colunas_destino != colunas:
+            raise ValueError(f"Colunas de {caminho_entrada} diferem das demais entradas: {colunas}")
+
+        for inicio, fim in shards:
+            raiz, extensao = os.path.splitext(caminho_sem_compressao(destino))
+            caminho_parte = f"{raiz}.part{len(tarefas):05d}{extensao}"
+            tarefas.append(TarefaShard(caminho_entrada, inicio, fim, colunas, encodings, caminho_parte))
+            partes.append(caminho_parte)
+
+    if verbose:
+        print(f"⚡ {len(entradas)} arquivo(s) em {len(tarefas)} shard(s) com {workers} worker(s)")
+
+    total = 0
+    contadores = Counter()
+    inicio = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futuros = {executor.submit(_limpar_shard, tarefa): tarefa for tarefa in tarefas}
+        for futuro in as_completed(futuros):
+            tarefa = futuros[futuro]
+            linhas, contadores_shard = futuro.result()
+            total += linhas
+            contadores.update(contadores_shard)
+            if verbose:
+                nome = os.path.basename(tarefa.caminho_entrada)
+                print(f"  ✅ {nome} [{tarefa.inicio}:{tarefa.fim}] → {linhas} linhas")
+
+    for destino, (colunas, partes) in destinos.items():
+        _juntar_partes(partes, colunas, destino)
+
+    duracao = time.perf_counter() - inicio
+    if verbose:
+        taxa = total / duracao if duracao > 0 else 0.0
+        print(f"⏱️  {total} produtos em {duracao:.2f}s ({taxa:,.0f} linhas/s)")
+
+    return {'total': total, 'arquivos': list(destinos), 'contadores': contadores}
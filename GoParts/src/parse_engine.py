@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+🧮 GoParts Parse Engine
+Parse do texto já reparado. O parser padrão é o C do pandas (uma thread, consome
+o texto em stream); com parser='pyarrow', o texto é parseado pelo leitor CSV do
+Arrow via pd.read_csv(engine='pyarrow'), que divide o buffer em blocos e usa todos
+os núcleos, mantendo os mesmos valores nulos e dtypes do pandas.
+Sem pyarrow, ou se o Arrow recusar o texto (ex: uma linha com menos campos, que o
+parser C completa com NaN), o parse cai para o parser C.
+"""
+
+import io
+from typing import Iterable, List, Union
+
+import pandas as pd
+
+from row_repair import FluxoTexto
+
+PARSERS = ('c', 'pyarrow')
+PARSER_PADRAO = 'c'
+
+_aviso_exibido = False
+
+def pyarrow_csv_disponivel() -> bool:
+    try:
+        import pyarrow.csv  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def _avisar_fallback(motivo: str):
+    """Avisa só na primeira vez (o fallback se repete a cada chunk no modo streaming)"""
+    global _aviso_exibido
+    if not _aviso_exibido:
+        print(f"⚠️ Parser pyarrow indisponível ({motivo}): usando o parser C do pandas")
+        _aviso_exibido = True
+
+def _ler_c(texto: Union[str, Iterable[str]], colunas: List[str] = None) -> pd.DataFrame:
+    fluxo = io.StringIO(texto) if isinstance(texto, str) else FluxoTexto(texto)
+    if colunas is None:
+        return pd.read_csv(fluxo)
+    return pd.read_csv(fluxo, header=None, names=colunas)
+
+def parsear_csv(texto: Union[str, Iterable[str]], colunas: List[str] = None,
+                parser: str = PARSER_PADRAO) -> pd.DataFrame:
+    """
+    Parseia o CSV reparado (um texto ou pedaços de texto, consumidos em ordem).
+    colunas=None: a primeira linha é o cabeçalho; senão, o texto não tem cabeçalho.
+    """
+    if parser not in PARSERS:
+        raise ValueError(f"Parser desconhecido: {parser} (opções: {', '.join(PARSERS)})")
+    if parser == 'c':
+        return _ler_c(texto, colunas)
+
+    if not pyarrow_csv_disponivel():
+        _avisar_fallback("pip install pyarrow")
+        return _ler_c(texto, colunas)
+
+    # O Arrow paraleliza sobre um buffer em memória: os pedaços são juntados uma vez
+    if not isinstance(texto, str):
+        texto = ''.join(texto)
+    try:
+        if colunas is None:
+            return pd.read_csv(io.BytesIO(texto.encode('utf-8')), engine='pyarrow')
+        return pd.read_csv(io.BytesIO(texto.encode('utf-8')), engine='pyarrow', header=None, names=colunas)
+    except pd.errors.ParserError:
+        return _ler_c(texto, colunas)
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+🎚️ GoParts Rate Control
+Controle adaptativo de vazão para os clientes de API (substitui as pausas fixas
+entre envios):
+- Token bucket: as requisições saem no máximo a `taxa` req/s
+- Limite de concorrência: no máximo `limite` requisições em voo
+- AIMD: até a primeira sobrecarga, a taxa dobra a cada segundo de sucessos
+  (partida lenta, como no TCP); depois, cada sucesso aumenta taxa e limite
+  aditivamente (~+aumento_taxa req/s e ~+1 de limite por segundo de envios
+  saudáveis). Taxa e limite são reduzidos
+  multiplicativamente quando a proporção de 5xx/timeouts nas últimas `janela`
+  respostas passa de `limiar_erros` (um 5xx isolado não é sobrecarga) ou
+  imediatamente em um 429, no máximo uma vez por intervalo_reducao
+A taxa e o limite atuais aparecem no log e nos campos rate_limit,
+concurrency_limit e rate_reductions do APIStats informado.
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+@dataclass
+class ConfigControle:
+    """Parâmetros do controle AIMD (taxas em requisições por segundo)"""
+    taxa_inicial: float = 10.0
+    taxa_minima: float = 0.5
+    taxa_maxima: float = 500.0
+    # Aumento da taxa por segundo de envios sem sobrecarga
+    aumento_taxa: float = 10.0
+    limite_inicial: int = 4
+    limite_minimo: int = 1
+    limite_maximo: int = 64
+    fator_reducao: float = 0.5
+    # Respostas recentes consideradas e proporção de 5xx/timeouts entre elas que indica sobrecarga
+    janela: int = 30
+    limiar_erros: float = 0.6
+    # Segundos mínimos entre duas reduções
+    intervalo_reducao: float = 1.0
+    # Requisições que podem sair de uma vez quando o bucket está cheio
+    rajada: int = 1
+    # Segundos entre logs do estado durante o aumento
+    intervalo_log: float = 5.0
+
+    def __post_init__(self):
+        if not 0 < self.fator_reducao < 1:
+            raise ValueError("fator_reducao deve estar entre 0 e 1")
+        if not 0 < self.limiar_erros <= 1 or self.janela < 1:
+            raise ValueError("limiar_erros deve estar entre 0 e 1 e janela deve ser >= 1")
+        if self.taxa_minima <= 0 or self.taxa_minima > self.taxa_maxima:
+            raise ValueError("taxa_minima deve ser > 0 e <= taxa_maxima")
+        if self.limite_minimo < 1 or self.limite_minimo > self.limite_maximo:
+            raise ValueError("limite_minimo deve ser >= 1 e <= limite_maximo")
+
+class ControleAdaptativo:
+    """Token bucket + limite de concorrência com ajuste AIMD (seguro entre threads)"""
+
+    def __init__(self, config: ConfigControle = None, stats=None):
+        self.config = config or ConfigControle()
+        self.stats = stats
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._vagas = threading.Condition(self._lock)
+        self._taxa = min(max(self.config.taxa_inicial, self.config.taxa_minima), self.config.taxa_maxima)
+        self._limite = float(min(max(self.config.limite_inicial, self.config.limite_minimo),
+                                 self.config.limite_maximo))
+        self._tokens = float(self.config.rajada)
+        self._ultimo_abastecimento = time.monotonic()
+        self._ultima_reducao = float('-inf')
+        self._ultimo_log = time.monotonic()
+        # Últimas respostas: True = 5xx/timeout
+        self._recentes = deque(maxlen=self.config.janela)
+        self.em_voo = 0
+        self.reducoes = 0
+        self._partida_lenta = True
+        self._publicar()
+
+    @property
+    def taxa(self) -> float:
+        return self._taxa
+
+    @property
+    def limite(self) -> int:
+        return int(self._limite)
+
+    def resumo(self) -> str:
+        return f"taxa {self._taxa:.1f} req/s, limite {self.limite} em voo"
+
+    def _publicar(self):
+        if self.stats is not None:
+            self.stats.rate_limit = round(self._taxa, 2)
+            self.stats.concurrency_limit = self.limite
+            self.stats.rate_reductions = self.reducoes
+
+    def reservar(self) -> float:
+        """Reserva a vez da próxima requisição; retorna quantos segundos esperar por ela"""
+        with self._lock:
+            agora = time.monotonic()
+            self._tokens = min(self.config.rajada,
+                               self._tokens + (agora - self._ultimo_abastecimento) * self._taxa)
+            self._ultimo_abastecimento = agora
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self._taxa
+
+    def aguardar(self):
+        """Bloqueia até a vez da próxima requisição (clientes síncronos)"""
+        espera = self.reservar()
+        if espera > 0:
+            time.sleep(espera)
+
+    @contextmanager
+    def vaga(self):
+        """Ocupa uma das `limite` vagas de requisição em voo (clientes com threads)"""
+        with self._vagas:
+            self._vagas.wait_for(lambda: self.em_voo < self.limite)
+            self.em_voo += 1
+        try:
+            yield
+        finally:
+            with self._vagas:
+                self.em_voo -= 1
+                self._vagas.notify_all()
+
+    def registrar_sucesso(self):
+        """Aumento: +1 req/s por sucesso na partida lenta; depois, ~+aumento_taxa req/s por segundo"""
+        with self._lock:
+            self._recentes.append(False)
+            aumento = 1.0 if self._partida_lenta else self.config.aumento_taxa / self._taxa
+            self._taxa = min(self.config.taxa_maxima, self._taxa + aumento)
+            self._limite = min(float(self.config.limite_maximo), self._limite + 1 / max(self._limite, self._taxa))
+            self._publicar()
+            agora = time.monotonic()
+            if agora - self._ultimo_log >= self.config.intervalo_log:
+                self._ultimo_log = agora
+                self.logger.info(f"🎚️ Controle de vazão: {self.resumo()}")
+            self._vagas.notify_all()
+
+    def registrar_sobrecarga(self, imediata: bool = False):
+        """
+        Registra um 5xx/timeout; reduz taxa e limite se a proporção de erros na janela
+        passou do limiar (ou se imediata, ex: 429), no máximo uma vez por intervalo_reducao
+        """
+        with self._lock:
+            self._recentes.append(True)
+            agora = time.monotonic()
+            if agora - self._ultima_reducao < self.config.intervalo_reducao:
+                return
+            erros = sum(self._recentes)
+            if not imediata and (len(self._recentes) < self.config.janela
+                                 or erros <= self.config.limiar_erros * len(self._recentes)):
+                return
+            self._ultima_reducao = agora
+            anterior = self.resumo()
+            self._taxa = max(self.config.taxa_minima, self._taxa * self.config.fator_reducao)
+            self._limite = max(float(self.config.limite_minimo), self._limite * self.config.fator_reducao)
+            # Descarta a rajada acumulada: a nova taxa vale a partir de agora
+            self._tokens = min(self._tokens, 0.0)
+            # A próxima redução depende de novas respostas, já na taxa reduzida
+            self._recentes.clear()
+            self._partida_lenta = False
+            self.reducoes += 1
+            self._publicar()
+            self.logger.warning(f"🐢 Sobrecarga na API ({erros} erros nas últimas respostas): "
+                                f"{anterior} → {self.resumo()}")
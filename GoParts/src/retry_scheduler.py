@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+⏳ GoParts Retry Scheduler
+Retries sem bloquear os outros envios: cada tentativa que falha com erro
+temporário vai para uma fila de espera (heap por prazo) e o coordenador segue
+enviando os próximos produtos; a tentativa volta quando o prazo vence.
+- Backoff com jitter sobre a RetryConfig: 'full' (uniforme entre 0 e o backoff
+  exponencial) ou 'decorrelated' (uniforme entre initial_delay e 3x o atraso
+  anterior), para os clientes não tentarem de novo todos no mesmo instante
+- Orçamento global de retries: no máximo minimo + proporcao x (primeiras
+  tentativas) retries no total, para os retries não multiplicarem a carga
+  sobre uma API que já está com problemas
+"""
+
+import time
+import heapq
+import random
+import itertools
+import threading
+from dataclasses import dataclass
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, List, Optional
+
+JITTERS = ('none', 'full', 'decorrelated')
+
+@dataclass
+class Tentativa:
+    """
+    Resultado de uma tentativa: status 'ok', 'falha' (definitiva) ou 'retry'.
+    Em um retry, `item` pode substituir o item original (ex: só os itens que
+    falharam de um lote) e `atraso` fixa a espera; com consome_tentativa=False
+    (nada foi enviado, ex: circuito aberto), o retry não gasta tentativa nem orçamento.
+    """
+    status: str
+    resposta: Any = None
+    item: Any = None
+    atraso: Optional[float] = None
+    consome_tentativa: bool = True
+
+def calcular_backoff(retry_config, attempt: int, anterior: Optional[float] = None,
+                     jitter: str = 'full') -> float:
+    """Espera antes da tentativa attempt + 1, com o jitter escolhido"""
+    if jitter not in JITTERS:
+        raise ValueError(f"Jitter desconhecido: {jitter} (opções: {', '.join(JITTERS)})")
+    exponencial = min(retry_config.initial_delay * (retry_config.backoff_factor ** (attempt - 1)),
+                      retry_config.max_delay)
+    if jitter == 'none':
+        return exponencial
+    if jitter == 'full':
+        return random.uniform(0, exponencial)
+    anterior = anterior or retry_config.initial_delay
+    return min(retry_config.max_delay, random.uniform(retry_config.initial_delay, anterior * 3))
+
+class OrcamentoRetries:
+    """Limite global de retries proporcional às primeiras tentativas (seguro entre threads)"""
+
+    def __init__(self, proporcao: float = 0.1, minimo: int = 20):
+        if proporcao < 0 or minimo < 0:
+            raise ValueError("proporcao e minimo do orçamento de retries devem ser >= 0")
+        self.proporcao = proporcao
+        self.minimo = minimo
+        self.primeiras = 0
+        self.retries = 0
+        self.negados = 0
+        self._lock = threading.Lock()
+
+    def registrar_primeira(self, quantidade: int = 1):
+        with self._lock:
+            self.primeiras += quantidade
+
+    def consumir(self) -> bool:
+        """Reserva um retry; False se o orçamento acabou"""
+        with self._lock:
+            if self.retries < self.minimo + self.proporcao * self.primeiras:
+                self.retries += 1
+                return True
+            self.negados += 1
+            return False
+
+class FilaRetries:
+    """Fila de espera: itens saem em ordem de prazo (time.monotonic)"""
+
+    def __init__(self):
+        self._heap = []
+        self._sequencia = itertools.count()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def agendar(self, atraso: float, entrada):
+        heapq.heappush(self._heap, (time.monotonic() + atraso, next(self._sequencia), entrada))
+
+    def espera(self) -> Optional[float]:
+        """Segundos até o próximo prazo (0 se já venceu; None se vazia)"""
+        if not self._heap:
+            return None
+        return max(0.0, self._heap[0][0] - time.monotonic())
+
+    def retirar(self):
+        return heapq.heappop(self._heap)[2]
+
+def executar_com_retries(itens: List[Any], tentar: Callable[[Any, int], Tentativa], retry_config,
+                         workers: int = 1, jitter: str = 'full', orcamento: OrcamentoRetries = None,
+                         ao_agendar: Callable = None) -> List[Any]:
+    """
+    Executa tentar(item, attempt) para cada item, com até `workers` tentativas
+    simultâneas (1: no próprio thread). Retries entram na FilaRetries e são
+    intercalados com os itens novos; ninguém dorme enquanto há trabalho pronto.
+    ao_agendar(item, attempt, atraso, resposta): chamado a cada retry agendado (log/estatísticas).
+    Returns: (sucesso, resposta final) de cada item, na ordem dos itens; a resposta
+    de uma falha ganha 'attempts' (e 'budget_exhausted', se o orçamento acabou).
+    """
+    orcamento = orcamento or OrcamentoRetries(proporcao=float('inf'))
+    resultados: List[Any] = [None] * len(itens)
+    fila = FilaRetries()
+    novos = iter(enumerate(itens))
+    restantes = len(itens)
+
+    def concluir(entrada, tentativa: Tentativa):
+        nonlocal restantes
+        indice, item, attempt, atraso_anterior = entrada
+        item = item if tentativa.item is None else tentativa.item
+        if tentativa.status == 'retry' and not tentativa.consome_tentativa:
+            fila.agendar(tentativa.atraso or 0.0, (indice, item, attempt, atraso_anterior))
+            return
+        if tentativa.status == 'retry' and attempt < retry_config.max_attempts:
+            if orcamento.consumir():
+                atraso = tentativa.atraso
+                if atraso is None:
+                    atraso = calcular_backoff(retry_config, attempt, atraso_anterior, jitter)
+                if ao_agendar:
+                    ao_agendar(item, attempt, atraso, tentativa.resposta)
+                fila.agendar(atraso, (indice, item, attempt + 1, atraso))
+                return
+            resposta = dict(tentativa.resposta or {}, attempts=attempt, budget_exhausted=True)
+        elif tentativa.status != 'ok':
+            resposta = dict(tentativa.resposta or {}, attempts=attempt)
+        else:
+            resposta = tentativa.resposta
+        resultados[indice] = (tentativa.status == 'ok', resposta)
+        restantes -= 1
+
+    def proxima_entrada():
+        """Retry vencido tem prioridade; senão, o próximo item novo"""
+        if fila.espera() == 0:
+            return fila.retirar()
+        for indice, item in novos:
+            orcamento.registrar_primeira()
+            return (indice, item, 1, None)
+        return None
+
+    if workers <= 1:
+        while restantes:
+            entrada = proxima_entrada()
+            if entrada is None:
+                time.sleep(fila.espera())
+                continue
+            concluir(entrada, tentar(entrada[1], entrada[2]))
+        return resultados
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='envio') as executor:
+        em_andamento = {}
+        while restantes:
+            while len(em_andamento) < workers:
+                entrada = proxima_entrada()
+                if entrada is None:
+                    break
+                em_andamento[executor.submit(tentar, entrada[1], entrada[2])] = entrada
+            if not em_andamento:
+                time.sleep(fila.espera())
+                continue
+            # Acorda quando uma tentativa termina ou quando vence o próximo retry
+            prontos, _ = wait(em_andamento, timeout=fila.espera(), return_when=FIRST_COMPLETED)
+            for futuro in prontos:
+                concluir(em_andamento.pop(futuro), futuro.result())
+    return resultados
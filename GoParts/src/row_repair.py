@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+🔧 GoParts Row Repair
+Motor de reparo das linhas malformadas dos CSVs de fornecedores.
+As regras ficam em um registro (REGRAS) e são aplicadas em ordem, cada uma
+com um único map() sobre o bloco de linhas. Uma regra recebe a linha e
+devolve a própria linha (mesmo objeto) quando não se aplica, então as
+contagens por regra saem de uma comparação de identidade em C.
+Regras simples podem ser só uma regex pré-compilada (registrar_regra_regex).
+Campos entre aspas ("R$1.250,00") são respeitados via csv.
+"""
+
+import io
+import re
+import csv
+import time
+import operator
+from collections import Counter
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable, Iterable, Iterator, List
+
+# Linhas por bloco ao reparar um iterável de linhas
+LINHAS_POR_BLOCO = 50_000
+# Caracteres por bloco ao reparar um texto já em memória
+TAMANHO_BLOCO_TEXTO = 4 * 1024 * 1024
+
+@dataclass
+class RegraReparo:
+    """Uma regra de reparo: linha → linha corrigida (ou a mesma linha, se não se aplica)"""
+    nome: str
+    corrigir: Callable[[str], str]
+
+# Registro de regras, na ordem de aplicação
+REGRAS: List[RegraReparo] = []
+
+def registrar_regra(nome: str):
+    """Decorator: registra uma função linha → linha no motor padrão"""
+    def decorator(funcao):
+        REGRAS.append(RegraReparo(nome, funcao))
+        return funcao
+    return decorator
+
+def registrar_regra_regex(nome: str, padrao: str, substituicao: str) -> RegraReparo:
+    """Registra uma regra feita só de uma regex pré-compilada (executada inteira em C)"""
+    regra = RegraReparo(nome, partial(re.compile(padrao).sub, substituicao))
+    REGRAS.append(regra)
+    return regra
+
+def dividir_campos(linha: str) -> List[str]:
+    """Divide a linha em campos; campos entre aspas ("R$1.250,00") são respeitados via csv"""
+    if '"' in linha:
+        return next(csv.reader([linha]), [])
+    return linha.split(',')
+
+def juntar_campos(campos: List[str]) -> str:
+    """Junta os campos em uma linha CSV, colocando aspas só onde for necessário"""
+    linha = ','.join(campos)
+    if '"' not in linha and linha.count(',') == len(campos) - 1:
+        return linha
+    return ','.join('"' + campo.replace('"', '""') + '"' if ',' in campo or '"' in campo else campo
+                    for campo in campos)
+
+@registrar_regra('campos_extras')
+def corrigir_campos_extras(linha: str) -> str:
+    """Mais de 4 campos: mantém nome, codigo e preco; o estoque é o primeiro valor não vazio"""
+    if linha.count(',') < 4:
+        return linha
+    if '"' in linha:
+        campos = dividir_campos(linha)
+        if len(campos) <= 4:
+            return linha
+    else:
+        campos = linha.split(',')
+
+    estoque = campos[3] if campos[3].strip() else (campos[4] if campos[4].strip() else '')
+    return juntar_campos([campos[0], campos[1], campos[2], estoque]) if '"' in linha \
+        else f"{campos[0]},{campos[1]},{campos[2]},{estoque}"
+
+def dividir_texto(texto: str, inicio: int = 0, tamanho: int = TAMANHO_BLOCO_TEXTO) -> Iterator[str]:
+    """Gera pedaços de ~tamanho caracteres do texto (a partir de `inicio`), sempre terminando em quebra de linha"""
+    while inicio < len(texto):
+        fim = texto.find('\n', inicio + tamanho)
+        fim = len(texto) if fim < 0 else fim + 1
+        yield texto[inicio:fim]
+        inicio = fim
+
+class MotorReparo:
+    """
+    Aplica as regras registradas sobre blocos de linhas.
+    Conta quantas linhas cada regra corrigiu (em `contadores`, chave reparo_<regra>)
+    e o tempo gasto em cada uma (em `tempos`, segundos).
+    """
+
+    def __init__(self, regras: Iterable[RegraReparo] = None, contadores: Counter = None):
+        self.regras = list(REGRAS if regras is None else regras)
+        self.contadores = contadores if contadores is not None else Counter()
+        self.tempos = Counter()
+
+    def reparar_lista(self, linhas: List[str]) -> List[str]:
+        """Repara uma lista de linhas (com ou sem o '\\n' final), retornando uma nova lista"""
+        linhas = list(map(str.strip, linhas))
+        for regra in self.regras:
+            inicio = time.perf_counter()
+            corrigidas = list(map(regra.corrigir, linhas))
+            self.tempos[regra.nome] += time.perf_counter() - inicio
+            self.contadores[f'reparo_{regra.nome}'] += sum(map(operator.is_not, corrigidas, linhas))
+            linhas = corrigidas
+        return linhas
+
+    def reparar_texto(self, texto: str) -> str:
+        """Repara todas as linhas de um bloco de texto"""
+        linhas = texto.split('\n')
+        if texto.endswith('\n'):
+            return '\n'.join(self.reparar_lista(linhas[:-1])) + '\n'
+        return '\n'.join(self.reparar_lista(linhas))
+
+    def reparar(self, linha: str) -> str:
+        """Repara uma única linha"""
+        return self.reparar_lista([linha])[0]
+
+    def reparar_linhas(self, linhas: Iterable[str], linhas_por_bloco: int = LINHAS_POR_BLOCO) -> Iterator[str]:
+        """
+        Gerador: agrupa as linhas em blocos e produz o texto reparado de cada bloco
+        (terminado em quebra de linha).
+        """
+        bloco = []
+        for linha in linhas:
+            bloco.append(linha)
+            if len(bloco) >= linhas_por_bloco:
+                yield '\n'.join(self.reparar_lista(bloco)) + '\n'
+                bloco = []
+        if bloco:
+            yield '\n'.join(self.reparar_lista(bloco)) + '\n'
+
+    def reparar_blocos(self, blocos: Iterable[str]) -> Iterator[str]:
+        """Gerador: repara blocos de texto (ex: de dividir_texto)"""
+        for bloco in blocos:
+            yield self.reparar_texto(bloco)
+
+    def imprimir_tempos(self):
+        """Exibe o tempo gasto em cada regra"""
+        if not self.tempos:
+            return
+        print("\n⏱️  Tempo por regra de reparo:")
+        for nome, segundos in sorted(self.tempos.items()):
+            print(f"  • {nome}: {segundos * 1000:.1f} ms")
+
+class FluxoTexto(io.TextIOBase):
+    """
+    Arquivo somente-leitura sobre um gerador de pedaços de texto, para que o
+    pd.read_csv consuma o texto reparado direto, sem montar o CSV corrigido inteiro.
+    """
+
+    def __init__(self, pedacos: Iterable[str]):
+        self._pedacos = iter(pedacos)
+        self._buffer = ''
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, tamanho: int = -1) -> str:
+        tamanho = -1 if tamanho is None else tamanho
+        partes = [self._buffer]
+        acumulado = len(self._buffer)
+        if tamanho < 0 or acumulado < tamanho:
+            for pedaco in self._pedacos:
+                partes.append(pedaco)
+                acumulado += len(pedaco)
+                if 0 <= tamanho <= acumulado:
+                    break
+
+        texto = ''.join(partes)
+        if tamanho < 0:
+            self._buffer = ''
+            return texto
+        self._buffer = texto[tamanho:]
+        return texto[:tamanho]
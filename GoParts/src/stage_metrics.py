@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+📈 GoParts Stage Metrics
+Instrumentação por etapa da limpeza: tempo de parede, tempo de CPU, linhas/s e
+pico de memória (tracemalloc) de detectar, ler, reparar, parsear, normalizar,
+deduplicar, compactar e gravar. Os tempos são exclusivos: uma etapa executada
+dentro de outra (ex: o reparo puxado pelo read_csv) é descontada da etapa externa.
+O relatório é um JSON ao lado da saída, com o nome dela sem a extensão
+(-o produtos.csv → produtos.metrics.json); opcionalmente, um dump do cProfile
+(produtos.prof) para `python -m pstats`.
+"""
+
+import os
+import sys
+import json
+import time
+import cProfile
+import datetime
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+from compressed_io import caminho_irmao
+
+VERSAO_RELATORIO = 1
+
+@dataclass
+class EtapaMedida:
+    """Totais acumulados de uma etapa (somados entre chunks/blocos)"""
+    nome: str
+    chamadas: int = 0
+    wall: float = 0.0
+    cpu: float = 0.0
+    linhas: int = 0
+    pico_memoria: int = 0
+
+    def como_dict(self) -> dict:
+        return {
+            'chamadas': self.chamadas,
+            'wall_s': round(self.wall, 4),
+            'cpu_s': round(self.cpu, 4),
+            'linhas': self.linhas,
+            'linhas_por_s': round(self.linhas / self.wall) if self.linhas and self.wall > 0 else None,
+            'pico_memoria_bytes': self.pico_memoria or None,
+        }
+
+def pico_rss():
+    """Pico de memória residente do processo (bytes), ou None onde o módulo resource não existe (Windows)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB, macOS em bytes
+    return pico if sys.platform == 'darwin' else pico * 1024
+
+def caminho_metricas(caminho_saida) -> str:
+    """O relatório fica ao lado da saída limpa, sem a extensão dela: produtos.csv → produtos.metrics.json"""
+    return caminho_irmao(caminho_saida, '.metrics.json')
+
+def caminho_perfil(caminho_saida) -> str:
+    """Dump do cProfile ao lado da saída limpa, sem a extensão dela: produtos.csv → produtos.prof"""
+    return caminho_irmao(caminho_saida, '.prof')
+
+class MedidorEtapas:
+    """
+    Mede as etapas da limpeza. Com ativo=False é um medidor nulo (não mede nada),
+    para que o código instrumentado não precise testar se há medidor.
+    Com memoria=True liga o tracemalloc entre iniciar() e finalizar(); isso deixa as etapas
+    em Python puro (reparo, gravação do CSV) várias vezes mais lentas, então os tempos
+    de uma execução com memória não são comparáveis aos de uma sem.
+    """
+
+    def __init__(self, ativo: bool = True, memoria: bool = False):
+        self.ativo = ativo
+        self.memoria = ativo and memoria
+        self.etapas = {}
+        self._pilha = []
+        self._inicio = None
+        self._wall = 0.0
+        self._cpu = 0.0
+        self._pico_total = 0
+        self._iniciou_tracemalloc = False
+
+    def iniciar(self):
+        if not self.ativo:
+            return
+        if self.memoria and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._iniciou_tracemalloc = True
+        self._inicio = (time.perf_counter(), time.process_time())
+
+    def finalizar(self):
+        if not self.ativo or self._inicio is None:
+            return
+        self._wall = time.perf_counter() - self._inicio[0]
+        self._cpu = time.process_time() - self._inicio[1]
+        if tracemalloc.is_tracing():
+            self._pico_total = max(self._pico_total, tracemalloc.get_traced_memory()[1])
+            if self._iniciou_tracemalloc:
+                tracemalloc.stop()
+                self._iniciou_tracemalloc = False
+        self._inicio = None
+
+    def _registrar_pico(self, etapa: EtapaMedida):
+        pico = tracemalloc.get_traced_memory()[1]
+        etapa.pico_memoria = max(etapa.pico_memoria, pico)
+        self._pico_total = max(self._pico_total, pico)
+
+    @contextmanager
+    def etapa(self, nome: str):
+        """Mede um trecho como parte da etapa `nome` (chamadas repetidas são somadas)"""
+        if not self.ativo:
+            yield EtapaMedida(nome)
+            return
+
+        etapa = self.etapas.setdefault(nome, EtapaMedida(nome))
+        medindo_memoria = tracemalloc.is_tracing()
+        if medindo_memoria:
+            # O pico até aqui pertence à etapa externa; a partir daqui, a esta
+            if self._pilha:
+                self._registrar_pico(self._pilha[-1][0])
+            tracemalloc.reset_peak()
+
+        self._pilha.append([etapa, 0.0, 0.0])
+        inicio_wall, inicio_cpu = time.perf_counter(), time.process_time()
+        try:
+            yield etapa
+        finally:
+            wall = time.perf_counter() - inicio_wall
+            cpu = time.process_time() - inicio_cpu
+            _, wall_internas, cpu_internas = self._pilha.pop()
+            etapa.chamadas += 1
+            etapa.wall += wall - wall_internas
+            etapa.cpu += cpu - cpu_internas
+            if self._pilha:
+                self._pilha[-1][1] += wall
+                self._pilha[-1][2] += cpu
+            if medindo_memoria:
+                self._registrar_pico(etapa)
+
+    def medir_gerador(self, nome: str, gerador: Iterable) -> Iterator:
+        """Envolve um gerador: o tempo de produzir cada item conta para a etapa `nome`"""
+        if not self.ativo:
+            yield from gerador
+            return
+        iterador = iter(gerador)
+        fim = object()
+        while True:
+            with self.etapa(nome):
+                item = next(iterador, fim)
+            if item is fim:
+                return
+            yield item
+
+    def adicionar_linhas(self, nome: str, linhas: int):
+        """Soma linhas a uma etapa já medida (quando a contagem só é conhecida depois)"""
+        if nome in self.etapas:
+            self.etapas[nome].linhas += linhas
+
+    def relatorio(self, **extras) -> dict:
+        """Relatório serializável em JSON; `extras` entram no topo (entrada, saída, modo...)"""
+        total_linhas = extras.get('linhas') or 0
+        return {
+            'versao': VERSAO_RELATORIO,
+            'gerado_em': datetime.datetime.now().isoformat(timespec='seconds'),
+            **extras,
+            'wall_s': round(self._wall, 4),
+            'cpu_s': round(self._cpu, 4),
+            'linhas_por_s': round(total_linhas / self._wall) if total_linhas and self._wall > 0 else None,
+            'pico_memoria_bytes': self._pico_total or None,
+            'pico_rss_bytes': pico_rss(),
+            'etapas': {nome: etapa.como_dict() for nome, etapa in self.etapas.items()},
+        }
+
+    def salvar(self, caminho, **extras) -> str:
+        """Grava o relatório JSON (de forma atômica)"""
+        temporario = f"{caminho}.tmp"
+        with open(temporario, 'w', encoding='utf-8') as file:
+            json.dump(self.relatorio(**extras), file, indent=2, ensure_ascii=False)
+        os.replace(temporario, caminho)
+        return caminho
+
+    def imprimir(self):
+        """Exibe o tempo, a vazão e o pico de memória de cada etapa"""
+        if not self.etapas:
+            return
+        print("\n📈 Métricas por etapa:")
+        for nome, etapa in self.etapas.items():
+            vazao = f", {etapa.linhas / etapa.wall:,.0f} linhas/s" if etapa.linhas and etapa.wall > 0 else ""
+            pico = f", pico {etapa.pico_memoria / 1024 / 1024:.1f} MB" if etapa.pico_memoria else ""
+            print(f"  • {nome}: {etapa.wall:.3f}s (CPU {etapa.cpu:.3f}s){vazao}{pico}")
+
+@contextmanager
+def perfilar(caminho, ativo: bool = True):
+    """Executa o bloco sob o cProfile e grava o dump em `caminho` (inspecione com python -m pstats)"""
+    if not ativo:
+        yield None
+        return
+    perfil = cProfile.Profile()
+    perfil.enable()
+    try:
+        yield perfil
+    finally:
+        perfil.disable()
+        perfil.dump_stats(caminho)
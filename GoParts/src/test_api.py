@@ -15,6 +15,18 @@ app = Flask(__name__)
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Máximo de produtos por requisição em POST /produtos/batch
+MAX_LOTE = 1000
+
+ERROR_MESSAGES = {
+    500: "Erro interno do servidor",
+    502: "Bad Gateway",
+    503: "Serviço indisponível",
+    504: "Gateway Timeout"
+}
+
+REQUIRED_FIELDS = ['nome_produto', 'codigo', 'preco', 'estoque']
+
 # Estatísticas da API
 stats = {
     'total_requests': 0,
@@ -50,15 +62,8 @@ def create_produto():
         
         logger.warning(f"🔴 Simulando erro {error_type} - Request #{stats['total_requests']}")
         
-        error_messages = {
-            500: "Erro interno do servidor",
-            502: "Bad Gateway",
-            503: "Serviço indisponível",
-            504: "Gateway Timeout"
-        }
-        
         return jsonify({
-            'error': error_messages.get(error_type, 'Erro desconhecido'),
+            'error': ERROR_MESSAGES.get(error_type, 'Erro desconhecido'),
             'code': error_type,
             'timestamp': time.time(),
             'request_id': stats['total_requests']
@@ -72,8 +77,7 @@ def create_produto():
         return jsonify({'error': 'Dados do produto são obrigatórios'}), 400
     
     # Simula validação
-    required_fields = ['nome_produto', 'codigo', 'preco', 'estoque']
-    for field in required_fields:
+    for field in REQUIRED_FIELDS:
         if field not in produto_data:
             return jsonify({'error': f'Campo obrigatório: {field}'}), 400
     
@@ -91,10 +95,60 @@ def create_produto():
         'request_id': stats['total_requests']
     }), 201
 
+@app.route('/produtos/batch', methods=['POST'])
+def create_produtos_batch():
+    """
+    Cadastro em lote: recebe uma lista de produtos e retorna um resultado por item
+    (na mesma ordem). Cada item falha com ~30% de chance, como em POST /produtos;
+    a resposta é 200 se todos foram cadastrados e 207 se algum falhou.
+    """
+    stats['total_requests'] += 1
+    produtos = request.get_json(silent=True)
+    
+    if not isinstance(produtos, list) or not produtos:
+        return jsonify({'error': 'Envie uma lista não vazia de produtos'}), 400
+    if len(produtos) > MAX_LOTE:
+        return jsonify({'error': f'Lote maior que o máximo ({MAX_LOTE} produtos)'}), 413
+    
+    # Um único delay de processamento para o lote inteiro
+    time.sleep(random.uniform(0.1, 0.5))
+    
+    resultados = []
+    for indice, produto_data in enumerate(produtos):
+        faltando = [field for field in REQUIRED_FIELDS if not isinstance(produto_data, dict) or field not in produto_data]
+        if faltando:
+            resultados.append({'indice': indice, 'status': 400, 'error': f'Campo obrigatório: {faltando[0]}'})
+            continue
+        
+        if random.random() < 0.3:
+            stats['failed'] += 1
+            error_type = random.choice([500, 502, 503, 504])
+            resultados.append({'indice': indice, 'status': error_type,
+                               'error': ERROR_MESSAGES.get(error_type, 'Erro desconhecido')})
+            continue
+        
+        stats['successful'] += 1
+        produto_data['id'] = len(stats['products_received']) + 1
+        produto_data['created_at'] = time.time()
+        stats['products_received'].append(produto_data)
+        resultados.append({'indice': indice, 'status': 201, 'produto': produto_data})
+    
+    cadastrados = sum(1 for resultado in resultados if resultado['status'] == 201)
+    logger.info(f"📦 Lote: {cadastrados}/{len(produtos)} produtos cadastrados - Request #{stats['total_requests']}")
+    
+    return jsonify({
+        'resultados': resultados,
+        'cadastrados': cadastrados,
+        'falhas': len(produtos) - cadastrados,
+        'request_id': stats['total_requests']
+    }), 200 if cadastrados == len(produtos) else 207
+
 @app.route('/stats', methods=['GET'])
 def get_stats():
     """Retorna estatísticas da API"""
-    success_rate = (stats['successful'] / stats['total_requests']) * 100 if stats['total_requests'] > 0 else 0
+    # successful/failed contam produtos (um lote conta cada item), não requisições
+    processados = stats['successful'] + stats['failed']
+    success_rate = (stats['successful'] / processados) * 100 if processados > 0 else 0
     
     return jsonify({
         'total_requests': stats['total_requests'],
@@ -124,6 +178,7 @@ if __name__ == '__main__':
     print("   - Endpoints:")
     print("     GET  /health     - Status da API")
     print("     POST /produtos   - Cadastrar produto")
+    print("     POST /produtos/batch - Cadastrar lote de produtos")
     print("     GET  /stats      - Estatísticas")
     print("     POST /reset      - Reset estatísticas")
     print("=" * 50)
@@ -0,0 +1,39 @@
+"""
+🧪 Fixtures comuns dos testes: src/ no sys.path, o arquivo de exemplo de data/input
+e catálogos pequenos do gerador sintético.
+"""
+
+import os
+import sys
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, 'src'))
+
+import data_cleaner  # noqa: E402
+from catalog_generator import gerar_catalogo  # noqa: E402
+from encoding_cache import EncodingCache  # noqa: E402
+
+# Produtos dos catálogos sintéticos (pequeno o bastante para a suíte rodar em segundos)
+LINHAS_GERADAS = 3000
+
+@pytest.fixture(autouse=True)
+def cache_isolado(tmp_path, monkeypatch):
+    """O cache de encodings dos testes não toca em data/.cache"""
+    monkeypatch.setattr(data_cleaner, '_cache_encodings', EncodingCache(str(tmp_path / 'encodings.json')))
+
+@pytest.fixture
+def entrada_exemplo():
+    """O CSV bagunçado de data/input"""
+    return data_cleaner.INPUT_FILE
+
+@pytest.fixture
+def catalogo_gerado(tmp_path):
+    """Catálogo sintético em Latin-1 com a mesma mistura de defeitos do exemplo"""
+    return gerar_catalogo(str(tmp_path / 'catalogo.csv'), LINHAS_GERADAS)
+
+@pytest.fixture(params=['entrada_exemplo', 'catalogo_gerado'])
+def entrada(request):
+    """Roda o teste com data/input e com a saída do gerador"""
+    return request.getfixturevalue(request.param)
@@ -0,0 +1,79 @@
+"""💾 Limpeza retomável (checkpoint_cleaner): queda no meio e retomada"""
+
+import filecmp
+import os
+
+import pytest
+
+import data_cleaner
+from checkpoint_cleaner import (Checkpoint, caminho_checkpoint, caminho_parcial, carregar_checkpoint,
+                                limpar_com_checkpoint)
+
+# Chunks por arquivo de teste (cada chunk gravado vira um checkpoint)
+CHUNKS_POR_ENTRADA = 5
+
+class QuedaSimulada(Exception):
+    """Simula o processo morrendo no meio da limpeza"""
+
+def _cair_apos(monkeypatch, checkpoints: int):
+    """O salvar do checkpoint funciona `checkpoints` vezes e depois derruba a limpeza"""
+    salvar_original = Checkpoint.salvar
+    salvos = []
+
+    def salvar(self, caminho):
+        if len(salvos) >= checkpoints:
+            raise QuedaSimulada()
+        salvar_original(self, caminho)
+        salvos.append(self.offset_entrada)
+
+    monkeypatch.setattr(Checkpoint, 'salvar', salvar)
+
+def _chunk_size(caminho_entrada) -> int:
+    with open(caminho_entrada, 'rb') as file:
+        return max(1, sum(1 for _ in file) // CHUNKS_POR_ENTRADA)
+
+@pytest.mark.parametrize('usar_mmap', [True, False])
+def test_retomada_gera_saida_identica(entrada, tmp_path, monkeypatch, usar_mmap):
+    chunk_size = _chunk_size(entrada)
+    referencia = str(tmp_path / 'referencia.csv')
+    total_referencia = limpar_com_checkpoint(entrada, referencia, chunk_size, usar_mmap=usar_mmap)
+    data_cleaner.clean_file(entrada, str(tmp_path / 'completo.csv'))
+    assert filecmp.cmp(referencia, str(tmp_path / 'completo.csv'), shallow=False)
+
+    saida = str(tmp_path / 'saida.csv')
+    with monkeypatch.context() as patch:
+        _cair_apos(patch, 2)
+        with pytest.raises(QuedaSimulada):
+            limpar_com_checkpoint(entrada, saida, chunk_size, usar_mmap=usar_mmap)
+    assert not os.path.exists(saida)
+    checkpoint = carregar_checkpoint(entrada, saida)
+    assert checkpoint is not None and checkpoint.total_linhas > 0
+
+    # Lixo de um chunk gravado pela metade depois do último checkpoint
+    with open(caminho_parcial(saida), 'ab') as file:
+        file.write(b'Chunk,interrompido,no')
+
+    assert limpar_com_checkpoint(entrada, saida, chunk_size, usar_mmap=usar_mmap) == total_referencia
+    assert filecmp.cmp(saida, referencia, shallow=False)
+    assert not os.path.exists(caminho_checkpoint(saida))
+    assert not os.path.exists(caminho_parcial(saida))
+
+def test_checkpoint_de_outra_entrada_e_ignorado(catalogo_gerado, tmp_path, monkeypatch):
+    saida = str(tmp_path / 'saida.csv')
+    with monkeypatch.context() as patch:
+        _cair_apos(patch, 2)
+        with pytest.raises(QuedaSimulada):
+            limpar_com_checkpoint(catalogo_gerado, saida, _chunk_size(catalogo_gerado))
+
+    # A entrada mudou depois da queda: o checkpoint não vale mais
+    with open(catalogo_gerado, 'a', encoding='latin1') as file:
+        file.write("Radiador,K9999999BR,99,1\n")
+    assert carregar_checkpoint(catalogo_gerado, saida) is None
+
+    limpar_com_checkpoint(catalogo_gerado, saida, _chunk_size(catalogo_gerado))
+    data_cleaner.clean_file(catalogo_gerado, str(tmp_path / 'completo.csv'))
+    assert filecmp.cmp(saida, str(tmp_path / 'completo.csv'), shallow=False)
+
+def test_checkpoint_requer_csv_sem_compressao(entrada_exemplo, tmp_path):
+    with pytest.raises(ValueError):
+        limpar_com_checkpoint(entrada_exemplo, str(tmp_path / 'saida.csv.gz'))
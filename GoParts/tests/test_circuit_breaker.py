@@ -0,0 +1,112 @@
+"""🔌 Transições do disjuntor (circuit_breaker) com um relógio simulado"""
+
+from types import SimpleNamespace
+
+import pytest
+
+import circuit_breaker
+from circuit_breaker import ABERTO, FECHADO, MEIO_ABERTO, CircuitoAberto, ConfigDisjuntor, Disjuntor
+
+class Relogio:
+    """Substitui time.monotonic: o tempo só anda com avancar()"""
+
+    def __init__(self):
+        self.agora = 1000.0
+
+    def __call__(self) -> float:
+        return self.agora
+
+    def avancar(self, segundos: float):
+        self.agora += segundos
+
+@pytest.fixture
+def relogio(monkeypatch):
+    relogio = Relogio()
+    monkeypatch.setattr(circuit_breaker.time, 'monotonic', relogio)
+    return relogio
+
+def _disjuntor(**config) -> Disjuntor:
+    padrao = dict(falhas_consecutivas=3, janela=10, limiar_falhas=0.5, cooldown=5.0, espera_sonda=1.0, max_sondas=2)
+    return Disjuntor(ConfigDisjuntor(**{**padrao, **config}), stats=SimpleNamespace())
+
+def _falhar(disjuntor: Disjuntor, vezes: int):
+    for _ in range(vezes):
+        disjuntor.verificar()
+        disjuntor.registrar_falha()
+
+def test_abre_apos_falhas_seguidas(relogio):
+    disjuntor = _disjuntor()
+    _falhar(disjuntor, 2)
+    disjuntor.registrar_sucesso()
+    _falhar(disjuntor, 2)
+    assert disjuntor.estado == FECHADO
+
+    _falhar(disjuntor, 1)
+    assert disjuntor.estado == ABERTO
+    relogio.avancar(2.0)
+    with pytest.raises(CircuitoAberto) as erro:
+        disjuntor.verificar()
+    assert erro.value.espera == pytest.approx(3.0)
+    assert not erro.value.desistiu
+    assert (disjuntor.stats.circuit_state, disjuntor.stats.circuit_opens, disjuntor.stats.fast_failures) == \
+        (ABERTO, 1, 1)
+
+def test_abre_pela_proporcao_na_janela(relogio):
+    disjuntor = _disjuntor(falhas_consecutivas=100)
+    # 9 requisições, 4 falhas intercaladas: a janela de 10 ainda não encheu
+    for _ in range(4):
+        _falhar(disjuntor, 1)
+        disjuntor.registrar_sucesso()
+    disjuntor.registrar_sucesso()
+    assert disjuntor.estado == FECHADO
+    # 10ª requisição: 5 falhas em 10 = limiar de 50%
+    _falhar(disjuntor, 1)
+    assert disjuntor.estado == ABERTO
+
+def test_sonda_com_sucesso_fecha(relogio):
+    disjuntor = _disjuntor()
+    _falhar(disjuntor, 3)
+    relogio.avancar(5.0)
+
+    disjuntor.verificar()
+    assert disjuntor.estado == MEIO_ABERTO
+    # Só uma sonda por vez
+    with pytest.raises(CircuitoAberto) as erro:
+        disjuntor.verificar()
+    assert erro.value.espera == 1.0
+
+    disjuntor.registrar_sucesso()
+    assert disjuntor.estado == FECHADO
+    disjuntor.verificar()
+
+def test_sonda_liberada_sem_resultado(relogio):
+    disjuntor = _disjuntor()
+    _falhar(disjuntor, 3)
+    relogio.avancar(5.0)
+    disjuntor.verificar()
+    disjuntor.liberar()
+    # Outra requisição pode ser a sonda
+    disjuntor.verificar()
+    assert disjuntor.estado == MEIO_ABERTO
+
+def test_sondas_com_falha_desistem(relogio):
+    disjuntor = _disjuntor()
+    _falhar(disjuntor, 3)
+    for aberturas in (2, 3):
+        relogio.avancar(5.0)
+        _falhar(disjuntor, 1)
+        assert disjuntor.estado == ABERTO
+        assert disjuntor.aberturas == aberturas
+
+    assert disjuntor.desistiu
+    relogio.avancar(60.0)
+    with pytest.raises(CircuitoAberto) as erro:
+        disjuntor.verificar()
+    assert erro.value.desistiu
+
+@pytest.mark.parametrize('config', [
+    dict(falhas_consecutivas=0), dict(janela=0), dict(limiar_falhas=0), dict(limiar_falhas=1.5), dict(cooldown=0),
+])
+def test_config_invalida(config):
+    with pytest.raises(ValueError):
+        ConfigDisjuntor(**config)
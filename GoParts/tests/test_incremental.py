@@ -0,0 +1,80 @@
+"""🔁 Limpeza incremental (incremental_cleaner): contagens e saída igual à limpeza completa"""
+
+import filecmp
+
+import pandas as pd
+import pytest
+
+import data_cleaner
+import incremental_cleaner
+from incremental_cleaner import limpar_incremental
+
+ADICIONADAS, ALTERADAS, REMOVIDAS = 5, 20, 10
+
+def _nova_versao(caminho_anterior, caminho_novo):
+    """Próxima versão do arquivo do fornecedor: REMOVIDAS linhas saem, ALTERADAS mudam de preço, ADICIONADAS entram"""
+    with open(caminho_anterior, 'rb') as file:
+        cabecalho, *linhas = file.read().splitlines()
+    linhas = linhas[REMOVIDAS:]
+    for i in range(ALTERADAS):
+        nome, codigo, _ = linhas[100 + i].split(b',', 2)
+        linhas[100 + i] = b','.join([nome, codigo, b'R$ 1.999,99', b'3'])
+    linhas += [f"Radiador,N{i:07d}BR,{i + 10},{i}".encode() for i in range(ADICIONADAS)]
+    with open(caminho_novo, 'wb') as file:
+        file.write(b'\n'.join([cabecalho] + linhas) + b'\n')
+    return len(linhas)
+
+def _limpeza_completa(caminho_entrada, tmp_path, extensao='.csv') -> str:
+    caminho = str(tmp_path / f'completa{extensao}')
+    data_cleaner.clean_file(caminho_entrada, caminho)
+    return caminho
+
+def test_primeira_execucao_e_sem_mudancas(entrada, tmp_path):
+    saida = str(tmp_path / 'saida.csv')
+    primeira = limpar_incremental(entrada, saida, verbose=False)
+    assert primeira.adicionadas == primeira.total > 0
+    assert primeira.alteradas == primeira.removidas == primeira.inalteradas == 0
+    assert filecmp.cmp(saida, _limpeza_completa(entrada, tmp_path), shallow=False)
+
+    segunda = limpar_incremental(entrada, saida, verbose=False)
+    assert segunda.inalteradas == segunda.total == primeira.total
+    assert segunda.adicionadas == segunda.alteradas == segunda.removidas == 0
+
+def _verificar_delta(catalogo_gerado, tmp_path, saida):
+    nova = str(tmp_path / 'nova.csv')
+    total = _nova_versao(catalogo_gerado, nova)
+    limpar_incremental(catalogo_gerado, saida, verbose=False)
+    resultado = limpar_incremental(nova, saida, verbose=False)
+
+    assert (resultado.adicionadas, resultado.alteradas, resultado.removidas) == (ADICIONADAS, ALTERADAS, REMOVIDAS)
+    assert resultado.inalteradas == total - ADICIONADAS - ALTERADAS
+    assert resultado.total == total
+    return nova
+
+def test_novas_alteradas_removidas(catalogo_gerado, tmp_path):
+    saida = str(tmp_path / 'saida.csv')
+    nova = _verificar_delta(catalogo_gerado, tmp_path, saida)
+    assert filecmp.cmp(saida, _limpeza_completa(nova, tmp_path), shallow=False)
+
+def test_sem_estado_colunar(catalogo_gerado, tmp_path, monkeypatch):
+    # Sem pyarrow a junção relê a saída anterior: mesmas contagens, mesma saída
+    monkeypatch.setattr(incremental_cleaner, 'pyarrow_disponivel', lambda: False)
+    saida = str(tmp_path / 'saida.csv')
+    nova = _verificar_delta(catalogo_gerado, tmp_path, saida)
+    assert filecmp.cmp(saida, _limpeza_completa(nova, tmp_path), shallow=False)
+
+def test_saida_parquet(catalogo_gerado, tmp_path):
+    pytest.importorskip('pyarrow')
+    saida = str(tmp_path / 'saida.parquet')
+    nova = _verificar_delta(catalogo_gerado, tmp_path, saida)
+    pd.testing.assert_frame_equal(pd.read_parquet(saida), pd.read_parquet(_limpeza_completa(nova, tmp_path, '.parquet')))
+
+def test_saida_alterada_por_fora_reprocessa(catalogo_gerado, tmp_path):
+    saida = str(tmp_path / 'saida.csv')
+    limpar_incremental(catalogo_gerado, saida, verbose=False)
+    with open(saida, 'a', encoding='utf-8') as file:
+        file.write("Editado,K0000000BR,1.0,1\n")
+
+    resultado = limpar_incremental(catalogo_gerado, saida, verbose=False)
+    assert resultado.adicionadas == resultado.total
+    assert filecmp.cmp(saida, _limpeza_completa(catalogo_gerado, tmp_path), shallow=False)
@@ -0,0 +1,50 @@
+"""🔀 Arquivos que misturam linhas UTF-8 e Latin-1 (mixed_encoding)"""
+
+import filecmp
+from collections import Counter
+
+import data_cleaner
+from mixed_encoding import TAMANHO_JANELA, contar_linhas, decodificar_misto, encoding_misto_para, nome_misto
+
+def _misturar(caminho_entrada, caminho_misto) -> str:
+    """Regrava a entrada com as linhas pares em UTF-8 e as ímpares em Latin-1. Returns: o texto original"""
+    texto, _ = data_cleaner.ler_texto(caminho_entrada)
+    linhas = texto.split('\n')
+    with open(caminho_misto, 'wb') as file:
+        file.write(b'\n'.join(linha.encode('utf-8' if i % 2 == 0 else 'latin1') for i, linha in enumerate(linhas)))
+    return texto
+
+def test_decodifica_cada_linha_no_seu_encoding():
+    dados = 'nome,codigo\n'.encode() + 'Pivô,K1\n'.encode('utf-8') + 'Lâmpada,K2\n'.encode('latin1')
+    contadores = Counter()
+    with contar_linhas(contadores):
+        assert decodificar_misto(dados, 'latin1') == 'nome,codigo\nPivô,K1\nLâmpada,K2\n'
+    assert contadores == Counter({'encoding_utf-8': 2, 'encoding_latin1': 1})
+
+def test_janelas_grandes():
+    # Acima de TAMANHO_JANELA os trechos são decodificados por janela; só as misturadas vão linha a linha
+    utf8 = 'Válvula Termostática,K1,10,1\n' * (TAMANHO_JANELA // 10)
+    latin1 = 'Reservatório de Expansão,K2,20,2\n' * (TAMANHO_JANELA // 10)
+    contadores = Counter()
+    with contar_linhas(contadores):
+        texto = decodificar_misto(utf8.encode() + latin1.encode('latin1') + 'Pivô,K3,1,1\n'.encode(), 'latin1')
+    assert texto == utf8 + latin1 + 'Pivô,K3,1,1\n'
+    assert sum(contadores.values()) == texto.count('\n')
+
+def test_bom_e_codec_registrado():
+    assert encoding_misto_para('utf-8') == encoding_misto_para(None) == nome_misto('latin1') == 'utf-8+iso8859-1'
+    dados = '﻿nome\nPivô\n'.encode('utf-8') + 'Lâmpada\n'.encode('latin1')
+    assert dados.decode('utf-8+latin1') == 'nome\nPivô\nLâmpada\n'
+
+def test_arquivo_misto_limpa_igual_ao_original(entrada, tmp_path):
+    misto = str(tmp_path / 'misto.csv')
+    texto_original = _misturar(entrada, misto)
+    texto, encoding = data_cleaner.ler_texto(misto)
+    assert texto == texto_original
+    assert encoding.startswith('utf-8+')
+
+    data_cleaner.clean_file(entrada, str(tmp_path / 'original.csv'))
+    data_cleaner.clean_file(misto, str(tmp_path / 'limpo.csv'))
+    data_cleaner.clean_file_streaming(misto, str(tmp_path / 'streaming.csv'), chunk_size=500)
+    assert filecmp.cmp(str(tmp_path / 'limpo.csv'), str(tmp_path / 'original.csv'), shallow=False)
+    assert filecmp.cmp(str(tmp_path / 'streaming.csv'), str(tmp_path / 'original.csv'), shallow=False)
@@ -0,0 +1,82 @@
+"""
+💰 Normalização vetorizada de preço e estoque (data_cleaner) comparada com a
+versão original, que usava Series.apply linha a linha.
+"""
+
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import data_cleaner
+
+# O replace/fillna da versão original dispara o aviso de downcast do pandas 2.x
+pytestmark = pytest.mark.filterwarnings('ignore:Downcasting:FutureWarning')
+
+def normalizar_preco_original(valor) -> float:
+    """normalizar_preco da versão original (sem os prints), aplicada com Series.apply"""
+    if valor is None or pd.isna(valor) or valor == '':
+        return 0.0
+    s = str(valor).strip()
+    if not s or s.lower() in {"nan", "none", "null", "n/a", "na"}:
+        return 0.0
+    s = s.replace("R$", "").replace(" ", "")
+    if "," in s and "." in s:
+        s = s.replace(".", "").replace(",", ".")
+    elif "," in s:
+        s = s.replace(",", ".")
+    try:
+        return float(s)
+    except ValueError:
+        return 0.0
+
+def normalizar_estoque_original(serie: pd.Series) -> pd.Series:
+    """Limpeza do estoque da versão original"""
+    valores_invalidos = ['None', 'n/a', 'N/A', 'nan', 'NaN', 'null', 'NULL', 'na', 'NA', -1, '-1', '', ' ']
+    serie = serie.replace(valores_invalidos, 0).fillna(0)
+    return pd.to_numeric(serie, errors='coerce').fillna(0).astype(int)
+
+VALORES_PRECO = ['R$', 'R$ 100', 'R$1.250,00', '1.250,00', '100,50', None, 'n/a', 'N/A', '-1', '', ' ',
+                 'abc', 'nan', 'null', '100.50', '1.250', ' 75 ', 'R$ 1.050,70', np.nan]
+VALORES_ESTOQUE = ['-1', 'None', 'n/a', 'NA', '', ' ', None, '7', ' 8', 'abc', '3.0', np.nan]
+
+@pytest.mark.parametrize('valor', VALORES_PRECO)
+def test_preco_igual_ao_apply(valor):
+    serie = pd.Series([valor], dtype=object)
+    assert data_cleaner.normalizar_precos(serie).iloc[0] == normalizar_preco_original(valor)
+
+@pytest.mark.parametrize('valor', VALORES_ESTOQUE)
+def test_estoque_igual_ao_original(valor):
+    serie = pd.Series([valor], dtype=object)
+    assert data_cleaner.normalizar_estoque(serie).iloc[0] == normalizar_estoque_original(serie).iloc[0]
+
+def test_estoque_numerico_igual_ao_original():
+    # O parser C já entrega o estoque como float64 quando só há números, vazios e None/n/a
+    serie = pd.Series([5.0, -1.0, np.nan, 0.0, 12.0])
+    pd.testing.assert_series_equal(data_cleaner.normalizar_estoque(serie), normalizar_estoque_original(serie))
+
+def test_contadores_das_regras_de_preco():
+    contadores = Counter()
+    serie = pd.Series(['R$ 100', 'R$ 100', '1.250,00', '100,50', None, 'n/a', 'abc', '10'], dtype=object)
+    data_cleaner.normalizar_precos(serie, contadores)
+    assert contadores['preco_prefixo_rs'] == 2
+    assert contadores['preco_formato_brasileiro'] == 1
+    assert contadores['preco_virgula_decimal'] == 1
+    assert contadores['preco_nulo'] == 2
+    assert contadores['preco_erro_conversao'] == 1
+
+def test_muitos_valores_distintos_igual_ao_apply():
+    # Acima de LIMITE_DISTINTOS na amostra, as regras rodam por linha em vez de por valor distinto
+    n = data_cleaner.AMOSTRA_DISTINTOS + 1000
+    valores = [f"R$ {i // 100}.{i % 100:03d},{i % 100:02d}" if i % 3 else f"{i}.{i % 100:02d}" for i in range(n)]
+    valores[::997] = [None] * len(valores[::997])
+    serie = pd.Series(valores, dtype=object)
+    pd.testing.assert_series_equal(data_cleaner.normalizar_precos(serie), serie.apply(normalizar_preco_original))
+
+def test_catalogo_igual_ao_apply(entrada):
+    df, _ = data_cleaner.carregar_csv(entrada)
+    pd.testing.assert_series_equal(data_cleaner.normalizar_precos(df['preco']),
+                                   df['preco'].apply(normalizar_preco_original))
+    pd.testing.assert_series_equal(data_cleaner.normalizar_estoque(df['estoque']),
+                                   normalizar_estoque_original(df['estoque']))
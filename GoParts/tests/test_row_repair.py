@@ -0,0 +1,52 @@
+"""🔧 Regras de reparo de linhas (row_repair)"""
+
+import csv
+from collections import Counter
+
+import pytest
+
+import data_cleaner
+from row_repair import MotorReparo, corrigir_campos_extras, dividir_campos
+
+@pytest.mark.parametrize('linha, esperada', [
+    # Coluna extra no final: o estoque é o 4º campo
+    ('Amortecedor Traseiro,K12345LA,100,50,10', 'Amortecedor Traseiro,K12345LA,100,50'),
+    # 4º campo vazio: o estoque é o 5º
+    ('Embreagem,K11223EU,250,,30', 'Embreagem,K11223EU,250,30'),
+    # Os dois em branco: estoque vazio
+    ('Velocímetro,K11111BR,89, , ', 'Velocímetro,K11111BR,89,'),
+    # Campo entre aspas com vírgula é respeitado e continua entre aspas
+    ('Radiador,K66666LA,"R$1.250,00",5,3', 'Radiador,K66666LA,"R$1.250,00",5'),
+])
+def test_campos_extras_corrige(linha, esperada):
+    assert corrigir_campos_extras(linha) == esperada
+
+@pytest.mark.parametrize('linha', [
+    'Coxim do Motor,K44444EU,55,3',
+    'Disco de Freio,K77777US,199.5,',
+    'Radiador,K66666LA,"R$1.250,00",5',
+])
+def test_campos_extras_nao_se_aplica(linha):
+    # A regra devolve o próprio objeto quando não se aplica (é assim que o motor conta as correções)
+    assert corrigir_campos_extras(linha) is linha
+
+def test_motor_conta_linhas_corrigidas():
+    contadores = Counter()
+    linhas = ['A,K1,10,5\n', 'B,K2,10,5,1\n', 'C,K3,10,,7\n']
+    assert MotorReparo(contadores=contadores).reparar_lista(linhas) == ['A,K1,10,5', 'B,K2,10,5', 'C,K3,10,7']
+    assert contadores['reparo_campos_extras'] == 2
+
+def test_reparar_texto_preserva_quebra_final():
+    motor = MotorReparo()
+    assert motor.reparar_texto('A,K1,10,5,1\nB,K2,10,5\n') == 'A,K1,10,5\nB,K2,10,5\n'
+    assert motor.reparar_texto('A,K1,10,5,1') == 'A,K1,10,5'
+
+def test_reparo_deixa_quatro_campos(entrada):
+    texto, _ = data_cleaner.ler_texto(entrada)
+    linhas = [linha for linha in texto.splitlines()[1:] if linha.strip()]
+    contadores = Counter()
+    reparadas = MotorReparo(contadores=contadores).reparar_lista(linhas)
+
+    assert len(reparadas) == len(linhas)
+    assert all(len(campos) == 4 for campos in csv.reader(reparadas))
+    assert contadores['reparo_campos_extras'] == sum(len(dividir_campos(linha.strip())) > 4 for linha in linhas)
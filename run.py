@@ -6,7 +6,7 @@ Script de entrada que redireciona para o projeto principal
 
 import os
 import sys
-import subprocess
+import importlib.util
 
 def main():
     # Caminho para o projeto principal
@@ -22,11 +22,12 @@ def main():
     print(f"📁 Projeto: {projeto_path}")
     print("-" * 50)
     
-    # Executa o run.py do projeto principal
+    # Executa o run.py do projeto principal no mesmo processo
     try:
-        os.chdir(projeto_path)
-        result = subprocess.run([sys.executable, 'run.py'] + sys.argv[1:])
-        return result.returncode
+        spec = importlib.util.spec_from_file_location('goparts_run', run_py_path)
+        goparts_run = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(goparts_run)
+        return goparts_run.main(sys.argv[1:])
     except Exception as e:
         print(f"❌ Erro ao executar: {e}")
         return 1